@@ -0,0 +1,485 @@
+import argparse
+import json
+import shelve
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+
+
+class ArticleStore(ABC):
+    """
+    Interface commune des bases de données d'articles.
+
+    Une base s'utilise comme un dictionnaire {identifiant: article} (comme le shelve d'origine), avec en plus des
+    lectures filtrées par langue et des comptages par catégorie que chaque implémentation peut accélérer.
+    """
+
+    @abstractmethod
+    def __contains__(self, article_id):
+        pass
+
+    @abstractmethod
+    def __getitem__(self, article_id):
+        pass
+
+    @abstractmethod
+    def __setitem__(self, article_id, article):
+        pass
+
+    @abstractmethod
+    def __delitem__(self, article_id):
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    @abstractmethod
+    def items(self):
+        pass
+
+    def keys(self):
+        return (article_id for article_id, article in self.items())
+
+    def values(self):
+        return (article for article_id, article in self.items())
+
+    def get(self, article_id, default=None):
+        return self[article_id] if article_id in self else default
+
+    def add_many(self, articles):
+        """
+        Ajoute un lot d'articles.
+
+        Args:
+            articles (dict): Les articles à ajouter, indexés par identifiant.
+        """
+        for article_id, article in articles.items():
+            self[article_id] = article
+
+    def items_by_language(self, language):
+        """
+        Retourne les articles d'une langue donnée.
+
+        Args:
+            language (str): Le code de langue ('fr' ou 'en').
+
+        Returns:
+            iterable: Les couples (identifiant, article) des articles de cette langue.
+        """
+        return ((article_id, article) for article_id, article in self.items()
+                if article.get('Langue', '').lower() == language)
+
+    def new_items(self, state):
+        """
+        Retourne les articles ajoutés depuis le dernier passage d'un consommateur (indexation, apprentissage en ligne),
+        en mettant à jour son état au fil de la lecture.
+
+        Pour une base sans ordre d'insertion, l'état est l'ensemble des identifiants déjà lus : seules les clés sont
+        parcourues, et seuls les nouveaux articles sont désérialisés.
+
+        Args:
+            state (dict): L'état du consommateur ({'seq': int, 'ids': set ou SeenIds}).
+
+        Yields:
+            tuple: (identifiant, article) pour chaque nouvel article.
+        """
+        for article_id in list(self.keys()):
+            if article_id not in state['ids']:
+                state['ids'].add(article_id)
+                yield article_id, self[article_id]
+
+    def claim_many(self, article_ids, owner=None, lease=3600):
+        """
+        Réserve des articles avant leur traitement, pour qu'un même article ne soit traité que par un seul collecteur.
+
+        Une base sans réservation partagée ne sert qu'un seul collecteur : un article est disponible tant qu'il n'est
+        pas en base.
+
+        Args:
+            article_ids (iterable): Les identifiants des articles à réserver.
+            owner (str): Le nom du collecteur qui réserve les articles.
+            lease (float): Durée de la réservation (secondes), après laquelle un article réservé mais jamais stocké
+                (collecteur arrêté) redevient disponible pour les autres collecteurs. Le collecteur qui l'a réservé
+                peut le reprendre à tout moment, par exemple à sa relance.
+
+        Returns:
+            set: Les identifiants réservés, c'est-à-dire ni en base ni réservés par un autre collecteur.
+        """
+        return {article_id for article_id in article_ids if article_id not in self}
+
+    def release(self, article_id):
+        """
+        Libère la réservation d'un article qui ne sera pas stocké (langue refusée...).
+
+        Args:
+            article_id (str): L'identifiant de l'article.
+        """
+
+    def flush(self):
+        """
+        Écrit les articles en attente. Les bases sans tampon d'écriture écrivent chaque article directement.
+        """
+
+    def count_by_category_language(self):
+        """
+        Compte les articles par catégorie et par langue.
+
+        Returns:
+            dict: {catégorie: {langue: nombre d'articles}}.
+        """
+        counts = {}
+        for article_id, article in self.items():
+            categorie = article.get('Catégorie', 'Catégorie inconnue')
+            langue = article.get('Langue', 'Langue inconnue')
+            counts.setdefault(categorie, {}).setdefault(langue, 0)
+            counts[categorie][langue] += 1
+        return counts
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class ShelveArticleStore(ArticleStore):
+    """
+    Base d'articles stockée dans un fichier shelve (format historique de ./items/article_db).
+    """
+
+    def __init__(self, path, flag='c'):
+        """
+        Initialise la classe ShelveArticleStore.
+
+        Args:
+            path (str): Chemin vers la base de données shelve.
+            flag (str): Mode d'ouverture du shelve ('r' pour la lecture seule, 'c' pour la lecture/écriture).
+        """
+        self.db = shelve.open(path, flag)
+
+    def __contains__(self, article_id):
+        return article_id in self.db
+
+    def __getitem__(self, article_id):
+        return self.db[article_id]
+
+    def __setitem__(self, article_id, article):
+        self.db[article_id] = article
+
+    def __delitem__(self, article_id):
+        del self.db[article_id]
+
+    def __len__(self):
+        return len(self.db)
+
+    def items(self):
+        return self.db.items()
+
+    def keys(self):
+        return self.db.keys()
+
+    def close(self):
+        self.db.close()
+
+
+class SQLiteArticleStore(ArticleStore):
+    """
+    Base d'articles stockée dans SQLite en mode WAL.
+
+    Les écritures sont regroupées par lots dans une seule transaction. La langue, la catégorie, l'URL du flux et la
+    date sont des colonnes indexées, ce qui transforme les lectures filtrées et les comptages en recherches d'index.
+    Le reste de l'article est conservé en JSON.
+
+    Plusieurs collecteurs (processus) peuvent écrire dans la même base : la table des réservations (`claims`) garantit,
+    par une insertion atomique si absent, qu'un article n'est traité que par un seul d'entre eux.
+    """
+
+    def __init__(self, path, flag='c', batch_size=500):
+        """
+        Initialise la classe SQLiteArticleStore.
+
+        Args:
+            path (str): Chemin vers le fichier SQLite.
+            flag (str): 'r' pour ouvrir la base en lecture seule, 'c' pour la lecture/écriture.
+            batch_size (int): Nombre d'articles accumulés avant d'être écrits en une transaction.
+        """
+        if flag == 'r':
+            self.connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        else:
+            # Les autres collecteurs peuvent tenir le verrou d'écriture le temps d'un lot : attente plus longue
+            self.connection = sqlite3.connect(path, timeout=30)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS articles (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    article_id TEXT NOT NULL UNIQUE,
+                    langue TEXT,
+                    categorie TEXT,
+                    feed_url TEXT,
+                    date TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_articles_langue ON articles (langue);
+                CREATE INDEX IF NOT EXISTS idx_articles_categorie_langue ON articles (categorie, langue);
+                CREATE INDEX IF NOT EXISTS idx_articles_feed_url ON articles (feed_url);
+                CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date);
+                CREATE TABLE IF NOT EXISTS claims (
+                    article_id TEXT PRIMARY KEY,
+                    owner TEXT,
+                    expires REAL NOT NULL
+                );
+            ''')
+        self.batch_size = batch_size
+        self.pending = {}
+
+    @staticmethod
+    def normalize_date(date):
+        """
+        Convertit la date RSS d'un article (RFC 822) au format ISO 8601 pour qu'elle soit triable dans l'index.
+
+        Args:
+            date (str): La date telle que fournie par le flux.
+
+        Returns:
+            str: La date au format ISO 8601, ou la date d'origine si elle n'a pas pu être analysée.
+        """
+        try:
+            return parsedate_to_datetime(date).isoformat()
+        except (TypeError, ValueError, IndexError):
+            return date or None
+
+    def _row(self, article_id, article):
+        return (
+            article_id,
+            article.get('Langue'),
+            article.get('Catégorie'),
+            article.get('URL du flux source'),
+            self.normalize_date(article.get('Date')),
+            json.dumps(article, ensure_ascii=False)
+        )
+
+    def flush(self):
+        """
+        Écrit en une seule transaction les articles en attente.
+
+        Un article déjà en base est mis à jour sur place et garde son numéro de séquence : les consommateurs de
+        `new_items` (indexation, apprentissage en ligne) ne le relisent pas comme un nouvel article.
+        """
+        if not self.pending:
+            return
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO articles (article_id, langue, categorie, feed_url, date, data) VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (article_id) DO UPDATE SET langue = excluded.langue, categorie = excluded.categorie, '
+                'feed_url = excluded.feed_url, date = excluded.date, data = excluded.data',
+                [self._row(article_id, article) for article_id, article in self.pending.items()]
+            )
+            # Les articles stockés n'ont plus besoin de réservation
+            self.connection.executemany('DELETE FROM claims WHERE article_id = ?',
+                                        [(article_id,) for article_id in self.pending])
+        self.pending = {}
+
+    def claim_many(self, article_ids, owner=None, lease=3600):
+        # Une seule transaction par lot. Chaque insertion n'a lieu que si l'article n'est pas en base et n'est pas
+        # réservé, si sa réservation a expiré, ou s'il était réservé par ce même collecteur (relancé après un arrêt)
+        now = time.time()
+        claimed = set()
+        with self.connection:
+            for article_id in article_ids:
+                if article_id in self.pending:
+                    continue
+                cursor = self.connection.execute(
+                    'INSERT INTO claims (article_id, owner, expires) SELECT ?, ?, ? '
+                    'WHERE NOT EXISTS (SELECT 1 FROM articles WHERE article_id = ?) '
+                    'ON CONFLICT (article_id) DO UPDATE SET owner = excluded.owner, expires = excluded.expires '
+                    'WHERE claims.expires < ? OR claims.owner = excluded.owner',
+                    (article_id, owner, now + lease, article_id, now)
+                )
+                if cursor.rowcount == 1:
+                    claimed.add(article_id)
+        return claimed
+
+    def release(self, article_id):
+        with self.connection:
+            self.connection.execute('DELETE FROM claims WHERE article_id = ?', (article_id,))
+
+    def add_many(self, articles):
+        self.pending.update(articles)
+        self.flush()
+
+    def __contains__(self, article_id):
+        if article_id in self.pending:
+            return True
+        cursor = self.connection.execute('SELECT 1 FROM articles WHERE article_id = ?', (article_id,))
+        return cursor.fetchone() is not None
+
+    def __getitem__(self, article_id):
+        if article_id in self.pending:
+            return self.pending[article_id]
+        row = self.connection.execute('SELECT data FROM articles WHERE article_id = ?', (article_id,)).fetchone()
+        if row is None:
+            raise KeyError(article_id)
+        return json.loads(row[0])
+
+    def __setitem__(self, article_id, article):
+        self.pending[article_id] = article
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def __delitem__(self, article_id):
+        self.flush()
+        with self.connection:
+            cursor = self.connection.execute('DELETE FROM articles WHERE article_id = ?', (article_id,))
+        if cursor.rowcount == 0:
+            raise KeyError(article_id)
+
+    def __len__(self):
+        self.flush()
+        return self.connection.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def items(self):
+        self.flush()
+        for article_id, data in self.connection.execute('SELECT article_id, data FROM articles ORDER BY seq'):
+            yield article_id, json.loads(data)
+
+    def keys(self):
+        self.flush()
+        return [row[0] for row in self.connection.execute('SELECT article_id FROM articles ORDER BY seq')]
+
+    def items_since(self, seq):
+        """
+        Retourne les articles ajoutés après un numéro de séquence donné. Un article modifié garde son numéro.
+
+        Args:
+            seq (int): Le dernier numéro de séquence déjà traité (0 pour tout relire).
+
+        Returns:
+            iterable: Les triplets (numéro de séquence, identifiant, article) par ordre croissant de séquence.
+        """
+        self.flush()
+        cursor = self.connection.execute('SELECT seq, article_id, data FROM articles WHERE seq > ? ORDER BY seq',
+                                         (seq,))
+        for row_seq, article_id, data in cursor:
+            yield row_seq, article_id, json.loads(data)
+
+    def new_items(self, state):
+        # L'état est le numéro de séquence du dernier article lu (high-water mark)
+        for seq, article_id, article in self.items_since(state['seq']):
+            state['seq'] = seq
+            yield article_id, article
+
+    def items_by_language(self, language):
+        self.flush()
+        cursor = self.connection.execute('SELECT article_id, data FROM articles WHERE langue = ? ORDER BY seq',
+                                         (language,))
+        for article_id, data in cursor:
+            yield article_id, json.loads(data)
+
+    def count_by_category_language(self):
+        self.flush()
+        counts = {}
+        cursor = self.connection.execute('SELECT categorie, langue, COUNT(*) FROM articles GROUP BY categorie, langue')
+        for categorie, langue, count in cursor:
+            categorie = 'Catégorie inconnue' if categorie is None else categorie
+            langue = 'Langue inconnue' if langue is None else langue
+            counts.setdefault(categorie, {})[langue] = count
+        return counts
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+
+class SeenIds:
+    """
+    Ensemble persistant des identifiants déjà lus par un consommateur de `new_items`, stocké dans un shelve indexé par
+    identifiant : seuls les identifiants lus depuis le dernier enregistrement sont gardés en mémoire, et l'ensemble
+    n'est jamais désérialisé en entier.
+
+    Les identifiants ajoutés ne sont écrits qu'à l'appel de `commit`, en même temps que le point de reprise du
+    consommateur : après un arrêt, les articles lus mais pas encore enregistrés sont relus.
+    """
+
+    def __init__(self, path, flag='c'):
+        """
+        Initialise la classe SeenIds.
+
+        Args:
+            path (str): Chemin vers la base shelve des identifiants.
+            flag (str): Mode d'ouverture du shelve ('c' pour reprendre l'ensemble, 'n' pour le vider).
+        """
+        self.db = shelve.open(path, flag)
+        self.added = set()
+
+    def __contains__(self, article_id):
+        return article_id in self.added or article_id in self.db
+
+    def add(self, article_id):
+        self.added.add(article_id)
+
+    def commit(self):
+        """
+        Écrit les identifiants ajoutés depuis le dernier enregistrement.
+        """
+        for article_id in self.added:
+            self.db[article_id] = True
+        self.db.sync()
+        self.added = set()
+
+    def close(self):
+        self.db.close()
+
+
+def open_article_store(path, flag='c'):
+    """
+    Ouvre une base d'articles en choisissant l'implémentation d'après l'extension du chemin.
+
+    Args:
+        path (str): Chemin vers la base. Les chemins se terminant par .sqlite ou .sqlite3 ouvrent une base SQLite, les
+            autres un shelve.
+        flag (str): 'r' pour la lecture seule, 'c' pour la lecture/écriture.
+
+    Returns:
+        ArticleStore: La base d'articles ouverte.
+    """
+    if path.endswith(('.sqlite', '.sqlite3')):
+        return SQLiteArticleStore(path, flag)
+    return ShelveArticleStore(path, flag)
+
+
+def migrate_shelve_to_sqlite(shelve_path, sqlite_path, batch_size=1000):
+    """
+    Copie tous les articles d'une base shelve vers une base SQLite.
+
+    Args:
+        shelve_path (str): Chemin vers la base shelve source.
+        sqlite_path (str): Chemin vers la base SQLite de destination (créée si besoin).
+        batch_size (int): Nombre d'articles écrits par transaction.
+
+    Returns:
+        int: Le nombre d'articles migrés.
+    """
+    source = ShelveArticleStore(shelve_path, 'r')
+    destination = SQLiteArticleStore(sqlite_path, 'c', batch_size=batch_size)
+    count = 0
+    try:
+        for article_id, article in source.items():
+            destination[article_id] = article
+            count += 1
+    finally:
+        destination.close()
+        source.close()
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migre une base d'articles shelve vers SQLite.")
+    parser.add_argument('shelve_path', nargs='?', default='./items/article_db', help="Base shelve source")
+    parser.add_argument('sqlite_path', nargs='?', default='./items/article_db.sqlite',
+                        help="Base SQLite de destination")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Nombre d'articles écrits par transaction")
+    args = parser.parse_args()
+
+    migrated = migrate_shelve_to_sqlite(args.shelve_path, args.sqlite_path, args.batch_size)
+    print(f"{migrated} articles migrés vers {args.sqlite_path}")
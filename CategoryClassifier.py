@@ -0,0 +1,205 @@
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from ArticleStore import open_article_store
+from DuplicateDetector import is_duplicate
+from dictionaryCreator import separate_articles_by_language, process_articles
+from dictionaryCreator import stemmer_french, stopwords_french, stemmer_english, stopwords_english
+from TokenCache import TokenCache
+from training_pipeline import make_vectorizer
+
+# Version du format des modèles sauvegardés : un modèle d'un autre format doit être réentraîné
+MODEL_FORMAT_VERSION = 1
+
+PIPELINES = {
+    'fr': (stopwords_french, stemmer_french),
+    'en': (stopwords_english, stemmer_english)
+}
+
+
+class CategoryClassifier:
+    """
+    Classifieur de catégorie d'articles prêt pour la production.
+
+    Le vectoriseur et l'estimateur sont entraînés une seule fois puis sauvegardés ensemble dans un modèle versionné.
+    Classer un nouveau lot d'articles ne demande alors qu'un chargement du modèle et une transformation, sans
+    réentraînement comme dans Classifiers_defi.ipynb.
+    """
+
+    def __init__(self, language, vectorizer, estimator, version=None):
+        """
+        Initialise la classe CategoryClassifier.
+
+        Args:
+            language (str): La langue des articles traités ('fr' ou 'en').
+            vectorizer (sklearn transformer): Le vectoriseur entraîné.
+            estimator (sklearn estimator): L'estimateur entraîné, qui doit fournir `predict_proba`.
+            version (str): L'identifiant de version du modèle (date d'entraînement par défaut).
+        """
+        self.language = language
+        self.vectorizer = vectorizer
+        self.estimator = estimator
+        self.version = version or time.strftime('%Y%m%d-%H%M%S')
+
+    @classmethod
+    def train(cls, article_db, language, estimator=None, mode='count', token_cache=None):
+        """
+        Entraîne un classifieur sur les articles étiquetés d'une langue.
+
+        Args:
+            article_db (dict): Les articles d'entraînement, indexés par identifiant, avec leur champ 'Catégorie'.
+            language (str): La langue des articles ('fr' ou 'en').
+            estimator (sklearn estimator): L'estimateur à entraîner. Par défaut, la forêt aléatoire retenue dans les
+                notebooks.
+            mode (str): Le mode de caractéristiques ('count', 'tfidf' ou 'hashing'), voir training_pipeline.
+            token_cache (TokenCache): Cache des racines des articles déjà normalisés, ou None.
+
+        Returns:
+            CategoryClassifier: Le classifieur entraîné.
+        """
+        stopwords, stemmer = PIPELINES[language]
+        vectorizer = make_vectorizer(mode, stopwords)
+        features = vectorizer.fit_transform(process_articles(article_db, stopwords, stemmer, token_cache=token_cache))
+        labels = [article.get('Catégorie', '') for article in article_db.values()]
+        if estimator is None:
+            estimator = RandomForestClassifier(n_estimators=100, random_state=42)
+        estimator.fit(features, labels)
+        return cls(language, vectorizer, estimator)
+
+    def save(self, path):
+        """
+        Sauvegarde le vectoriseur et l'estimateur dans un seul fichier.
+
+        Args:
+            path (str): Chemin du fichier du modèle.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump({
+            'format_version': MODEL_FORMAT_VERSION,
+            'version': self.version,
+            'language': self.language,
+            'vectorizer': self.vectorizer,
+            'estimator': self.estimator
+        }, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Charge un modèle sauvegardé par `save`.
+
+        Args:
+            path (str): Chemin du fichier du modèle.
+
+        Returns:
+            CategoryClassifier: Le classifieur chargé.
+
+        Raises:
+            ValueError: Si le modèle a été sauvegardé dans un autre format.
+        """
+        model = joblib.load(path)
+        if model.get('format_version') != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Format de modèle {model.get('format_version')} non pris en charge, réentraînez le modèle")
+        return cls(model['language'], model['vectorizer'], model['estimator'], model['version'])
+
+    def predict(self, article_db, token_cache=None):
+        """
+        Prédit la catégorie d'un lot d'articles.
+
+        Args:
+            article_db (dict): Les articles à classer, indexés par identifiant.
+            token_cache (TokenCache): Cache des racines des articles déjà normalisés, ou None.
+
+        Returns:
+            dict: {identifiant: (catégorie prédite, [[catégorie, probabilité], ...])}.
+        """
+        if not article_db:
+            return {}
+        stopwords, stemmer = PIPELINES[self.language]
+        features = self.vectorizer.transform(process_articles(article_db, stopwords, stemmer, token_cache=token_cache))
+        probabilities = self.estimator.predict_proba(features)
+        classes = self.estimator.classes_
+        predictions = {}
+        for article_id, article_probabilities in zip(article_db, probabilities):
+            predictions[article_id] = (
+                str(classes[np.argmax(article_probabilities)]),
+                [[str(category), float(probability)] for category, probability in zip(classes, article_probabilities)]
+            )
+        return predictions
+
+
+def classify_database(db_path, classifiers, token_cache=None, reclassify=False):
+    """
+    Classe les articles d'une base qui n'ont pas encore de catégorie prédite, et écrit leurs champs
+    'Catégorie prédite' et 'Probabilités'.
+
+    Les doublons ne sont pas classés : ils reprennent la prédiction de leur article original.
+
+    Args:
+        db_path (str): Chemin vers la base d'articles (par exemple ./items/defi_db).
+        classifiers (dict): {langue: CategoryClassifier} pour chaque langue à traiter.
+        token_cache (TokenCache): Cache des racines des articles déjà normalisés, ou None.
+        reclassify (bool): Si True, tous les articles sont classés à nouveau (après un nouvel entraînement).
+
+    Returns:
+        int: Le nombre d'articles classés.
+    """
+    article_db = open_article_store(db_path, 'c')
+    predictions = {}
+    try:
+        articles_by_language = dict(zip(('fr', 'en'), separate_articles_by_language(article_db)))
+        for language, classifier in classifiers.items():
+            articles = {article_id: article for article_id, article in articles_by_language.get(language, {}).items()
+                        if reclassify or not article.get('Catégorie prédite')}
+            predictions.update(classifier.predict(articles, token_cache))
+        for article_id, article in article_db.items():
+            if not is_duplicate(article) or (article.get('Catégorie prédite') and not reclassify):
+                continue
+            # L'original a été classé lors de ce passage, ou l'était déjà
+            original_id = article['Doublon de']
+            if original_id in predictions:
+                predictions[article_id] = predictions[original_id]
+            elif original_id in article_db and article_db[original_id].get('Catégorie prédite'):
+                original = article_db[original_id]
+                predictions[article_id] = (original['Catégorie prédite'], original.get('Probabilités', []))
+        for article_id, (category, probabilities) in predictions.items():
+            article = article_db[article_id]
+            article['Catégorie prédite'] = category
+            article['Probabilités'] = probabilities
+            article_db[article_id] = article
+    finally:
+        article_db.close()
+    return len(predictions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entraîne les modèles de catégorie ou classe une base d'articles.")
+    parser.add_argument('action', choices=['train', 'classify'], help="Entraîner les modèles ou classer une base")
+    parser.add_argument('--db', help="Base d'articles (./items/article_db pour train, ./items/defi_db pour classify)")
+    parser.add_argument('--models', default='./models', help="Répertoire des modèles")
+    parser.add_argument('--token-cache', default='./items/token_cache',
+                        help="Cache des racines de chaque article (voir TokenCache)")
+    parser.add_argument('--reclassify', action='store_true',
+                        help="Classe à nouveau les articles qui ont déjà une catégorie prédite")
+    args = parser.parse_args()
+
+    model_paths = {language: os.path.join(args.models, f'category_{language}.joblib') for language in PIPELINES}
+    token_cache = TokenCache(args.token_cache)
+    if args.action == 'train':
+        article_db = open_article_store(args.db or './items/article_db', 'r')
+        articles_by_language = dict(zip(('fr', 'en'), separate_articles_by_language(article_db)))
+        article_db.close()
+        for language, articles in articles_by_language.items():
+            classifier = CategoryClassifier.train(articles, language, token_cache=token_cache)
+            classifier.save(model_paths[language])
+            print(f"Modèle {language} version {classifier.version} entraîné sur {len(articles)} articles")
+    else:
+        classifiers = {language: CategoryClassifier.load(path) for language, path in model_paths.items()}
+        start = time.perf_counter()
+        count = classify_database(args.db or './items/defi_db', classifiers, token_cache, args.reclassify)
+        print(f"{count} articles classés en {time.perf_counter() - start:.3f}s")
+    token_cache.close()
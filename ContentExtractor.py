@@ -0,0 +1,285 @@
+import codecs
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import requests
+
+# Règles d'extraction des sites de nos flux RSS : (balise, attribut, fragment de la valeur) du conteneur du corps de
+# l'article. Seuls les paragraphes de ce conteneur sont gardés, et la lecture de la page s'arrête à sa fermeture.
+SITE_RULES = {
+    'lemonde.fr': ('article', 'class', 'article__content'),
+    'cnn.com': ('div', 'class', 'article__content'),
+    'nytimes.com': ('section', 'name', 'articleBody'),
+    'latimes.com': ('div', 'class', 'rich-text-article-body'),
+    'washingtonpost.com': ('div', 'class', 'article-body'),
+    'lefigaro.fr': ('div', 'class', 'fig-body'),
+    'ledevoir.com': ('article', None, None),
+    'lapresse.ca': ('div', 'class', 'articleBody'),
+    'santepubliquefrance.fr': ('main', None, None)
+}
+
+# Balises dont le texte n'est jamais du contenu
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'iframe'}
+
+
+def site_rule(url):
+    """
+    Retourne la règle d'extraction du site d'une URL.
+
+    Args:
+        url (str): L'URL de la page.
+
+    Returns:
+        tuple: (balise, attribut, fragment de la valeur) du conteneur de l'article, ou None si le site n'a pas de règle.
+    """
+    host = urlsplit(url).hostname or ''
+    for domain, rule in SITE_RULES.items():
+        if host == domain or host.endswith('.' + domain):
+            return rule
+    return None
+
+
+def content_charset(content_type, default='utf-8'):
+    """
+    Retourne l'encodage déclaré dans un en-tête Content-Type.
+
+    Args:
+        content_type (str): La valeur de l'en-tête (par exemple 'text/html; charset=ISO-8859-1').
+        default (str): L'encodage utilisé si aucun encodage connu n'est déclaré. Les pages de nos flux sont en UTF-8
+            (requests supposerait ISO-8859-1).
+
+    Returns:
+        str: Le nom de l'encodage.
+    """
+    for parameter in content_type.split(';')[1:]:
+        name, _, value = parameter.partition('=')
+        charset = value.strip().strip('"\'')
+        if name.strip().lower() == 'charset' and charset:
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                break
+    return default
+
+
+class ParagraphParser(HTMLParser):
+    """
+    Analyseur HTML événementiel qui ne garde que le texte des paragraphes, sans construire d'arbre.
+
+    Le texte des balises script, style... est ignoré. Avec une règle de site, seuls les paragraphes du conteneur de
+    l'article sont gardés et l'analyse est terminée (`done`) dès la fermeture du conteneur. Si le conteneur n'est pas
+    trouvé, les paragraphes de toute la page sont utilisés, comme sans règle.
+    """
+
+    def __init__(self, rule=None):
+        super().__init__(convert_charrefs=True)
+        self.rule = rule
+        self.skip_depth = 0
+        self.container_depth = 0
+        self.container_found = False
+        self.done = False
+        self.paragraph = None
+        self.paragraphs = []
+        self.container_paragraphs = []
+
+    def matches_rule(self, tag, attrs):
+        container_tag, attribute, fragment = self.rule
+        if tag != container_tag:
+            return False
+        if attribute is None:
+            return True
+        return any(name == attribute and value and fragment in value for name, value in attrs)
+
+    def close_paragraph(self):
+        if self.paragraph is not None:
+            text = ''.join(self.paragraph).replace('\n', ' ').replace('\t', ' ')
+            (self.container_paragraphs if self.container_depth else self.paragraphs).append(text)
+            self.paragraph = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+            return
+        if self.rule is not None:
+            if self.container_depth:
+                if tag == self.rule[0]:
+                    self.container_depth += 1
+            elif not self.container_found and self.matches_rule(tag, attrs):
+                self.close_paragraph()
+                self.container_found = True
+                self.container_depth = 1
+        if tag == 'p':
+            self.close_paragraph()
+            self.paragraph = []
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+            return
+        if tag == 'p':
+            self.close_paragraph()
+        if self.container_depth and tag == self.rule[0]:
+            self.container_depth -= 1
+            if not self.container_depth:
+                self.close_paragraph()
+                self.done = True
+
+    def handle_data(self, data):
+        if self.paragraph is not None and not self.skip_depth and not self.done:
+            self.paragraph.append(data)
+
+    def text(self):
+        """
+        Retourne le texte extrait.
+
+        Returns:
+            str: Les paragraphes de l'article (ou de la page) séparés par des espaces.
+        """
+        self.close_paragraph()
+        return " ".join(self.container_paragraphs if self.container_found else self.paragraphs)
+
+
+class ContentExtractor:
+    """
+    Classe pour extraire le contenu textuel des pages d'articles.
+
+    Toutes les requêtes passent par une même session HTTP (pool de connexions avec keep-alive) et sont bornées par un
+    délai maximal. Les extractions d'un lot d'URL sont réparties sur un pool de threads.
+
+    Les pages sont lues en flux et analysées au fur et à mesure par un ParagraphParser : la lecture s'arrête à la fin du
+    corps de l'article (sites de SITE_RULES) ou après `max_bytes` octets, sans jamais charger la page entière.
+    """
+
+    def __init__(self, max_workers=16, timeout=(5, 20), pool_maxsize=16, max_bytes=2 * 2 ** 20, chunk_size=16384,
+                 archive=None, metrics=None):
+        """
+        Initialise la classe ContentExtractor.
+
+        Args:
+            max_workers (int): Nombre de pages téléchargées simultanément.
+            timeout (float or tuple): Délai maximal (connexion, lecture) en secondes pour chaque requête.
+            pool_maxsize (int): Nombre de connexions conservées ouvertes par hôte.
+            max_bytes (int): Nombre maximal d'octets lus par page.
+            chunk_size (int): Taille des blocs lus sur le réseau.
+            archive (PageArchive): Archive où conserver les pages téléchargées, ou None. L'analyse s'arrête
+                toujours à la fin de l'article, mais la page est alors lue jusqu'au bout (dans la limite de
+                `max_bytes`) pour être archivée entière et réextraite si la règle du site change.
+            metrics (Metrics): Mesures de la collecte (durée de chaque extraction), ou None.
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.archive = archive
+        self.metrics = metrics
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def extract(self, url):
+        """
+        Extrait le contenu textuel à partir d'une URL donnée.
+
+        Args:
+            url (str): L'URL de la page web.
+
+        Returns:
+            str: Le contenu textuel extrait de l'URL, ou une chaîne vide en cas d'échec.
+        """
+        if self.metrics is None:
+            return self.download_and_parse(url)
+        with self.metrics.timer('rssi_stage_seconds', stage='extract'):
+            return self.download_and_parse(url)
+
+    def download_and_parse(self, url):
+        # Télécharge la page en flux et l'analyse, en affichant l'erreur éventuelle
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 200:
+                    content_type = response.headers.get('Content-Type') or 'text/html'
+                    encoding = content_charset(content_type)
+                    chunks = iter(response.iter_content(chunk_size=self.chunk_size))
+                    if self.archive is None:
+                        return self.parse(chunks, url, encoding)
+                    # Les blocs sont analysés au fil de la lecture et gardés pour l'archive. Une fois l'article
+                    # extrait, le reste de la page est lu sans être analysé : l'archive reçoit la page entière,
+                    # avec son type d'origine pour la décoder de la même façon à la réextraction
+                    content = bytearray()
+                    text = self.parse(self.buffered(chunks, content), url, encoding)
+                    for chunk in chunks:
+                        if len(content) >= self.max_bytes:
+                            break
+                        content += chunk
+                    self.archive.add(url, bytes(content[:self.max_bytes]), content_type)
+                    return text
+                else:
+                    print("La demande a échoué avec le code d'état :", response.status_code)
+        except requests.exceptions.Timeout as e:
+            print("Délai dépassé :", e)
+        except requests.exceptions.ConnectionError as e:
+            print("Erreur de connexion :", e)
+        except requests.exceptions.RequestException as e:
+            print("Erreur de requête :", e)
+        except Exception as e:
+            print("Une erreur s'est produite :", e)
+        return ""
+
+    @staticmethod
+    def buffered(chunks, content):
+        # Transmet les blocs d'une réponse en les ajoutant à `content`, pour l'archive
+        for chunk in chunks:
+            content += chunk
+            yield chunk
+
+    def parse(self, chunks, url, encoding='utf-8'):
+        """
+        Analyse une page HTML bloc par bloc et retourne le texte de l'article.
+
+        Args:
+            chunks (iterable): Les blocs d'octets de la page (réponse HTTP en flux ou fichier sauvegardé).
+            url (str): L'URL de la page, qui détermine la règle de site.
+            encoding (str): L'encodage de la page.
+
+        Returns:
+            str: Le contenu textuel extrait de la page.
+        """
+        parser = ParagraphParser(site_rule(url))
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        read = 0
+        for chunk in chunks:
+            # Le bloc qui franchit la limite est coupé à `max_bytes`
+            chunk = chunk[:self.max_bytes - read]
+            read += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.done or read >= self.max_bytes:
+                break
+        else:
+            parser.feed(decoder.decode(b'', final=True))
+        return parser.text()
+
+    def extract_many(self, urls):
+        """
+        Extrait le contenu d'un lot d'URL en parallèle et retourne les résultats au fur et à mesure.
+
+        Args:
+            urls (iterable): Les URL des pages à extraire.
+
+        Yields:
+            tuple: (URL, contenu textuel extrait) dans l'ordre de fin des téléchargements.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.extract, url): url for url in urls}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def close(self):
+        """
+        Ferme la session HTTP partagée.
+        """
+        self.session.close()
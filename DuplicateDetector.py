@@ -0,0 +1,315 @@
+import argparse
+import hashlib
+import os
+import re
+import shelve
+import sqlite3
+import time
+import zlib
+from contextlib import nullcontext
+
+import numpy as np
+
+from ArticleStore import open_article_store
+
+# Nombre premier de Mersenne (2^31 - 1) utilisé par les permutations de MinHash : a * x + b tient sur 64 bits
+MERSENNE_PRIME = (1 << 31) - 1
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def index_path_for(db_path):
+    """
+    Retourne le chemin de l'index LSH associé à une base d'articles (à côté de la base).
+
+    Args:
+        db_path (str): Chemin vers la base d'articles (par exemple ./items/article_db ou ./items/articles.sqlite).
+
+    Returns:
+        str: Le chemin de l'index (par exemple ./items/article_db_lsh).
+    """
+    return os.path.splitext(db_path)[0] + '_lsh'
+
+
+class ShelveLSHIndex:
+    """
+    Index LSH stocké dans un shelve : signatures sous 's:<identifiant>', identifiants des articles sous chaque clé de
+    bande. Un shelve ne peut être écrit que par un seul processus.
+    """
+
+    def __init__(self, path):
+        self.db = shelve.open(path)
+
+    def __contains__(self, article_id):
+        return 's:' + article_id in self.db
+
+    def signature(self, article_id):
+        return self.db['s:' + article_id]
+
+    def candidates(self, band_keys):
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self.db.get(key, ()))
+        return candidates
+
+    def add(self, article_id, signature, band_keys):
+        self.db['s:' + article_id] = signature
+        for key in band_keys:
+            self.db[key] = self.db.get(key, []) + [article_id]
+
+    def transaction(self):
+        return nullcontext()
+
+    def close(self):
+        self.db.close()
+
+
+class SQLiteLSHIndex:
+    """
+    Index LSH stocké dans SQLite en mode WAL, partageable entre plusieurs collecteurs (processus).
+
+    La recherche d'un article et son ajout se font dans une même transaction d'écriture (`transaction`) : deux
+    collecteurs qui reçoivent en même temps deux versions d'une même dépêche ne peuvent pas les indexer toutes les deux
+    comme originales.
+    """
+
+    def __init__(self, path):
+        # Transactions explicites (BEGIN IMMEDIATE) ; attente longue comme pour la base d'articles partagée
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS signatures (
+                article_id TEXT PRIMARY KEY,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band_key TEXT NOT NULL,
+                article_id TEXT NOT NULL,
+                PRIMARY KEY (band_key, article_id)
+            ) WITHOUT ROWID;
+        ''')
+
+    def __contains__(self, article_id):
+        return self.connection.execute('SELECT 1 FROM signatures WHERE article_id = ?', (article_id,)).fetchone() \
+            is not None
+
+    def signature(self, article_id):
+        return self.connection.execute('SELECT signature FROM signatures WHERE article_id = ?',
+                                       (article_id,)).fetchone()[0]
+
+    def candidates(self, band_keys):
+        placeholders = ', '.join('?' * len(band_keys))
+        return {row[0] for row in self.connection.execute(
+            f'SELECT DISTINCT article_id FROM bands WHERE band_key IN ({placeholders})', band_keys)}
+
+    def add(self, article_id, signature, band_keys):
+        self.connection.execute('INSERT OR IGNORE INTO signatures (article_id, signature) VALUES (?, ?)',
+                                (article_id, signature))
+        self.connection.executemany('INSERT OR IGNORE INTO bands (band_key, article_id) VALUES (?, ?)',
+                                    [(key, article_id) for key in band_keys])
+
+    def transaction(self):
+        # Le verrou d'écriture est pris dès le début : la recherche et l'ajout sont atomiques entre collecteurs
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def close(self):
+        self.connection.close()
+
+
+def open_lsh_index(path):
+    """
+    Ouvre un index LSH en choisissant l'implémentation d'après l'extension du chemin, comme open_article_store.
+
+    Args:
+        path (str): Chemin vers l'index. Les chemins se terminant par .sqlite ou .sqlite3 ouvrent un index SQLite,
+            partageable entre collecteurs, les autres un shelve.
+
+    Returns:
+        ShelveLSHIndex or SQLiteLSHIndex: L'index ouvert.
+    """
+    if path.endswith(('.sqlite', '.sqlite3')):
+        return SQLiteLSHIndex(path)
+    return ShelveLSHIndex(path)
+
+
+class DuplicateDetector:
+    """
+    Détection des articles quasi identiques (même dépêche reprise par plusieurs flux, résumé retouché...).
+
+    Chaque article est résumé par une signature MinHash de ses shingles de mots, découpée en bandes indexées par LSH :
+    deux articles ne sont comparés que s'ils partagent au moins une bande, ce qui garde une recherche en temps constant
+    quelle que soit la taille du corpus. L'index est un shelve persistant placé à côté de la base d'articles, ou une
+    base SQLite partagée par les collecteurs d'une collecte répartie (voir open_lsh_index).
+    """
+
+    def __init__(self, index_path, num_perm=128, bands=32, shingle_size=5, threshold=0.8, seed=42):
+        """
+        Initialise la classe DuplicateDetector.
+
+        Args:
+            index_path (str): Chemin vers l'index LSH (voir index_path_for et open_lsh_index).
+            num_perm (int): Nombre de permutations de la signature MinHash.
+            bands (int): Nombre de bandes LSH (doit diviser num_perm).
+            shingle_size (int): Nombre de mots par shingle.
+            threshold (float): Similarité de Jaccard estimée à partir de laquelle deux articles sont des doublons.
+            seed (int): Graine des permutations, qui doit rester la même pour un index donné.
+        """
+        if num_perm % bands:
+            raise ValueError(f"Le nombre de permutations ({num_perm}) doit être un multiple du nombre de bandes ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self.index = open_lsh_index(index_path)
+
+    @staticmethod
+    def article_text(article):
+        # Texte comparé : titre, résumé et contenu de l'article
+        return ' '.join((article.get('Titre', ''), article.get('Description / Résumé', ''), article.get('Contenu', '')))
+
+    def shingles(self, text):
+        """
+        Découpe un texte en shingles de `shingle_size` mots consécutifs, hachés de façon déterministe.
+
+        Args:
+            text (str): Le texte à découper.
+
+        Returns:
+            numpy.ndarray: Les hachages distincts des shingles (vide si le texte ne contient aucun mot).
+        """
+        words = WORD_PATTERN.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            shingles = {' '.join(words)} if words else set()
+        else:
+            shingles = {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+        return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64,
+                           count=len(shingles))
+
+    def signature(self, text):
+        """
+        Calcule la signature MinHash d'un texte.
+
+        Args:
+            text (str): Le texte de l'article.
+
+        Returns:
+            numpy.ndarray: La signature (num_perm valeurs), ou None si le texte ne contient aucun mot.
+        """
+        hashes = self.shingles(text) % MERSENNE_PRIME
+        if not len(hashes):
+            return None
+        return ((self.a[:, None] * hashes[None, :] + self.b[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+    def band_keys(self, signature):
+        # Une clé par bande : numéro de la bande et empreinte de ses valeurs
+        return [f'b{band}:' + hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(),
+                                              digest_size=8).hexdigest()
+                for band in range(self.bands)]
+
+    def find_duplicate(self, signature):
+        """
+        Cherche dans l'index l'article le plus proche d'une signature.
+
+        Args:
+            signature (numpy.ndarray): La signature MinHash de l'article.
+
+        Returns:
+            tuple: (identifiant de l'article le plus proche, similarité estimée), ou (None, 0.0) si aucun article
+            n'atteint le seuil.
+        """
+        best_id, best_similarity = None, 0.0
+        for candidate in self.index.candidates(self.band_keys(signature)):
+            candidate_signature = np.frombuffer(self.index.signature(candidate), dtype=np.uint64)
+            similarity = float(np.mean(candidate_signature == signature))
+            if similarity > best_similarity:
+                best_id, best_similarity = candidate, similarity
+        if best_similarity < self.threshold:
+            return None, 0.0
+        return best_id, best_similarity
+
+    def add(self, article_id, signature):
+        """
+        Ajoute la signature d'un article à l'index.
+
+        Args:
+            article_id (str): L'identifiant de l'article.
+            signature (numpy.ndarray): La signature MinHash de l'article.
+        """
+        self.index.add(article_id, signature.tobytes(), self.band_keys(signature))
+
+    def check(self, article_id, article):
+        """
+        Vérifie si un article est le doublon d'un article déjà indexé, et l'indexe sinon.
+
+        Seuls les articles originaux sont indexés : le doublon d'un doublon est rattaché à l'article d'origine.
+
+        Args:
+            article_id (str): L'identifiant de l'article.
+            article (dict): Les champs de l'article.
+
+        Returns:
+            str: L'identifiant de l'article original, ou None si l'article n'est pas un doublon.
+        """
+        if article_id in self.index:
+            return None
+        signature = self.signature(self.article_text(article))
+        if signature is None:
+            return None
+        with self.index.transaction():
+            original_id, similarity = self.find_duplicate(signature)
+            if original_id is None:
+                self.add(article_id, signature)
+        return original_id
+
+    def close(self):
+        """
+        Ferme l'index LSH.
+        """
+        self.index.close()
+
+
+def is_duplicate(article):
+    """
+    Indique si un article a été marqué comme doublon à l'ingestion (champ 'Doublon de').
+
+    Args:
+        article (dict): Les champs de l'article.
+
+    Returns:
+        bool: True si l'article est le doublon d'un autre article de la base.
+    """
+    return bool(article.get('Doublon de'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Marque les doublons d'une base d'articles existante.")
+    parser.add_argument('--db', default='./items/article_db', help="Base d'articles")
+    args = parser.parse_args()
+
+    article_db = open_article_store(args.db, 'c')
+    detector = DuplicateDetector(index_path_for(args.db))
+    duplicates = 0
+    start = time.perf_counter()
+    try:
+        article_ids = list(article_db.keys())
+        for article_id in article_ids:
+            article = article_db[article_id]
+            if is_duplicate(article):
+                continue
+            original_id = detector.check(article_id, article)
+            if original_id is not None:
+                article['Doublon de'] = original_id
+                article_db[article_id] = article
+                duplicates += 1
+    finally:
+        detector.close()
+        article_db.close()
+    elapsed = time.perf_counter() - start
+    print(f"{duplicates} doublons marqués sur {len(article_ids)} articles "
+          f"({1000 * elapsed / max(len(article_ids), 1):.3f} ms par article)")
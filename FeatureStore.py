@@ -0,0 +1,263 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+
+# Version du format des répertoires écrits par FeatureStore.save
+FORMAT_VERSION = 1
+
+
+def write_strings(directory, name, strings):
+    """
+    Écrit une table de chaînes : les chaînes encodées en UTF-8 bout à bout (<name>.npy), la position de chacune
+    (<name>_offsets.npy) et leur ordre alphabétique (<name>_order.npy) pour les recherches par dichotomie.
+
+    Args:
+        directory (str): Le répertoire de destination.
+        name (str): Le nom de la table.
+        strings (iterable): Les chaînes, dans l'ordre des lignes ou des colonnes.
+    """
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    # L'ordre des octets UTF-8 est celui des points de code : les recherches comparent directement les octets
+    order = np.asarray(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.int64)
+    np.save(os.path.join(directory, f'{name}.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    np.save(os.path.join(directory, f'{name}_offsets.npy'), offsets)
+    np.save(os.path.join(directory, f'{name}_order.npy'), order)
+
+
+class StringTable:
+    """
+    Table de chaînes ouverte en mémoire partagée (mmap) : seule la chaîne demandée est lue et décodée.
+
+    S'utilise comme un tableau de chaînes (longueur, accès par position, par tranche ou par tableau de positions,
+    itération, conversion en tableau NumPy), avec en plus la recherche de la position d'une chaîne par dichotomie.
+    """
+
+    def __init__(self, directory, name):
+        """
+        Initialise la classe StringTable.
+
+        Args:
+            directory (str): Le répertoire de la table.
+            name (str): Le nom de la table (voir `write_strings`).
+        """
+        self.buffer = np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(directory, f'{name}_offsets.npy'), mmap_mode='r')
+        self.order = np.load(os.path.join(directory, f'{name}_order.npy'), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def encoded(self, position):
+        # Octets UTF-8 de la chaîne à une position donnée
+        return self.buffer[self.offsets[position]:self.offsets[position + 1]].tobytes()
+
+    def decode_many(self, positions):
+        # Décode plusieurs chaînes : les positions et les octets sont convertis en objets Python en une seule fois
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self.offsets[positions].tolist()
+        ends = self.offsets[positions + 1].tolist()
+        if len(positions) * 8 < len(self):
+            return [self.buffer[start:end].tobytes().decode('utf-8') for start, end in zip(starts, ends)]
+        buffer = self.buffer.tobytes()
+        return [buffer[start:end].decode('utf-8') for start, end in zip(starts, ends)]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return np.asarray(self.decode_many(range(*position.indices(len(self)))), dtype=object)
+        if isinstance(position, (list, np.ndarray)):
+            return np.asarray(self.decode_many(position), dtype=object)
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self.encoded(position).decode('utf-8')
+
+    def __iter__(self):
+        return iter(self.decode_many(range(len(self))))
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.decode_many(range(len(self))), dtype=object)
+
+    def index(self, string):
+        """
+        Retourne la position d'une chaîne, en ne lisant que les O(log n) chaînes comparées.
+
+        Args:
+            string (str): La chaîne cherchée.
+
+        Returns:
+            int: Sa position dans la table, ou None si elle est absente.
+        """
+        target = string.encode('utf-8')
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.encoded(int(self.order[middle])) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self.encoded(int(self.order[low])) == target:
+            return int(self.order[low])
+        return None
+
+
+class FeatureStore:
+    """
+    Matrice creuse (CSR) et vocabulaire d'un dictionnaire, stockés en tableaux plats ouverts en mémoire partagée
+    (mmap).
+
+    Un répertoire contient les tableaux `data`, `indices` et `indptr` de la matrice (.npy), le vocabulaire et les
+    identifiants des articles en tables de chaînes (voir `write_strings`), et meta.json. L'ouverture ne lit que
+    meta.json : les pages des tableaux ne sont lues qu'à l'accès et sont partagées entre les processus qui ouvrent le
+    même dictionnaire, et les lignes de quelques articles s'obtiennent sans lire le reste de la matrice.
+    """
+
+    def __init__(self, directory):
+        """
+        Ouvre un dictionnaire écrit par `FeatureStore.save`.
+
+        Args:
+            directory (str): Le répertoire du dictionnaire.
+
+        Raises:
+            ValueError: Si le dictionnaire a été écrit dans un autre format.
+        """
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Format de dictionnaire {meta.get('format_version')} non pris en charge : {directory}")
+        self.directory = directory
+        self.shape = tuple(meta['shape'])
+        arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                  for name in ('data', 'indices', 'indptr')]
+        # Les indices sont déjà au type attendu par SciPy : la matrice reste adossée aux fichiers, sans copie
+        self.matrix = sp.csr_matrix(tuple(arrays), shape=self.shape, copy=False)
+        self.feature_names = StringTable(directory, 'vocabulary')
+        self.article_ids = StringTable(directory, 'article_ids') if meta['has_article_ids'] else None
+
+    @staticmethod
+    def save(directory, feature_names, sparse_matrix, article_ids=None):
+        """
+        Écrit un dictionnaire. Les fichiers sont écrits dans un répertoire temporaire qui remplace ensuite l'ancien :
+        les processus qui ont ouvert l'ancien dictionnaire continuent de le lire sans erreur.
+
+        Args:
+            directory (str): Le répertoire du dictionnaire.
+            feature_names (iterable): Les termes, dans l'ordre des colonnes.
+            sparse_matrix (scipy.sparse matrix): La matrice documents x termes.
+            article_ids (iterable): Les identifiants des articles, dans l'ordre des lignes, ou None.
+
+        Returns:
+            FeatureStore: Le dictionnaire écrit, ouvert en mémoire partagée.
+        """
+        csr = sparse_matrix.tocsr()
+        if not csr.has_sorted_indices:
+            csr = csr.sorted_indices()
+        # Indices en int32 tant que possible : c'est le type que SciPy choisit à l'ouverture
+        index_dtype = np.int32 if max(csr.nnz, max(csr.shape)) < np.iinfo(np.int32).max else np.int64
+        article_ids = list(article_ids) if article_ids is not None else None
+        if article_ids is not None and len(article_ids) != csr.shape[0]:
+            raise ValueError(f"{len(article_ids)} identifiants pour {csr.shape[0]} lignes")
+
+        directory = os.path.normpath(directory)
+        temporary = directory + '.tmp'
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        np.save(os.path.join(temporary, 'data.npy'), csr.data)
+        np.save(os.path.join(temporary, 'indices.npy'), csr.indices.astype(index_dtype, copy=False))
+        np.save(os.path.join(temporary, 'indptr.npy'), csr.indptr.astype(index_dtype, copy=False))
+        write_strings(temporary, 'vocabulary', feature_names)
+        if article_ids is not None:
+            write_strings(temporary, 'article_ids', article_ids)
+        with open(os.path.join(temporary, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'format_version': FORMAT_VERSION, 'shape': list(csr.shape),
+                       'has_article_ids': article_ids is not None}, f)
+
+        previous = directory + '.old'
+        shutil.rmtree(previous, ignore_errors=True)
+        if os.path.exists(directory):
+            os.replace(directory, previous)
+        os.replace(temporary, directory)
+        shutil.rmtree(previous, ignore_errors=True)
+        return FeatureStore(directory)
+
+    def row_of(self, article_id):
+        """
+        Retourne la ligne d'un article.
+
+        Args:
+            article_id (str): L'identifiant de l'article.
+
+        Returns:
+            int: Le numéro de la ligne, ou None si l'article est absent du dictionnaire.
+        """
+        if self.article_ids is None:
+            return None
+        return self.article_ids.index(article_id)
+
+    def rows(self, article_ids):
+        """
+        Extrait les lignes de quelques articles, sans lire le reste de la matrice.
+
+        Args:
+            article_ids (iterable): Les identifiants des articles.
+
+        Returns:
+            scipy.sparse.csr_matrix: Les lignes des articles, dans l'ordre demandé.
+
+        Raises:
+            KeyError: Si un article est absent du dictionnaire.
+        """
+        row_numbers = []
+        for article_id in article_ids:
+            row = self.row_of(article_id)
+            if row is None:
+                raise KeyError(article_id)
+            row_numbers.append(row)
+        return self.matrix[row_numbers]
+
+
+def convert_joblib(dico_dir):
+    """
+    Convertit les dictionnaires joblib d'un répertoire (feature_names_<nom>.joblib, sparse_matrix_<nom>.joblib et, s'il
+    existe, manifest_<nom>.joblib) en dictionnaires FeatureStore (<répertoire>/<nom>/).
+
+    Args:
+        dico_dir (str): Le répertoire des dictionnaires joblib (par exemple dico/).
+
+    Returns:
+        list: Les répertoires des dictionnaires convertis.
+    """
+    converted = []
+    for filename_feature in sorted(glob.glob(os.path.join(dico_dir, 'feature_names_*.joblib'))):
+        name = os.path.basename(filename_feature)[len('feature_names_'):-len('.joblib')]
+        filename_matrix = os.path.join(dico_dir, f'sparse_matrix_{name}.joblib')
+        if not os.path.exists(filename_matrix):
+            print(f"Pas de matrice {filename_matrix}, {filename_feature} n'est pas converti")
+            continue
+        sparse_matrix = joblib.load(filename_matrix)
+        filename_manifest = os.path.join(dico_dir, f'manifest_{name}.joblib')
+        article_ids = None
+        if os.path.exists(filename_manifest):
+            manifest = joblib.load(filename_manifest)
+            article_ids = sorted(manifest, key=manifest.get)
+        store = FeatureStore.save(os.path.join(dico_dir, name), joblib.load(filename_feature), sparse_matrix,
+                                  article_ids)
+        print(f"{name} : {store.shape[0]} documents x {store.shape[1]} termes -> {store.directory}")
+        converted.append(store.directory)
+    return converted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convertit les dictionnaires joblib en dictionnaires FeatureStore.")
+    parser.add_argument('dico_dir', nargs='?', default='dico', help="Répertoire des dictionnaires joblib")
+    args = parser.parse_args()
+    convert_joblib(args.dico_dir)
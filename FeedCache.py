@@ -0,0 +1,102 @@
+import hashlib
+import shelve
+import threading
+
+
+class FeedCache:
+    """
+    Cache persistant des validateurs HTTP de chaque flux RSS (ETag, Last-Modified et empreinte du contenu).
+
+    Il permet d'envoyer des requêtes conditionnelles et de ne pas analyser un flux qui n'a pas changé depuis le
+    dernier passage, que le serveur réponde 304 ou renvoie un contenu identique.
+    """
+
+    def __init__(self, cache_path='./items/feed_cache'):
+        """
+        Initialise la classe FeedCache.
+
+        Args:
+            cache_path (str): Chemin vers la base de données shelve du cache.
+        """
+        self.cache_db = shelve.open(cache_path)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(content):
+        """
+        Calcule l'empreinte du contenu brut d'un flux.
+
+        Args:
+            content (bytes): Le contenu brut du flux.
+
+        Returns:
+            str: L'empreinte SHA-1 du contenu.
+        """
+        return hashlib.sha1(content).hexdigest()
+
+    def conditional_headers(self, url):
+        """
+        Construit les en-têtes de requête conditionnelle pour un flux.
+
+        Args:
+            url (str): L'URL du flux.
+
+        Returns:
+            dict: Les en-têtes If-None-Match / If-Modified-Since connus pour ce flux.
+        """
+        with self._lock:
+            entry = self.cache_db.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url, content):
+        """
+        Indique si le contenu d'un flux est identique à celui du dernier passage.
+
+        Args:
+            url (str): L'URL du flux.
+            content (bytes): Le contenu brut qui vient d'être téléchargé.
+
+        Returns:
+            bool: True si l'empreinte du contenu correspond à celle en cache.
+        """
+        with self._lock:
+            entry = self.cache_db.get(url, {})
+        return entry.get('hash') == self.content_hash(content)
+
+    @classmethod
+    def validators(cls, content, etag=None, last_modified=None):
+        """
+        Construit les validateurs d'un flux qui vient d'être téléchargé.
+
+        Args:
+            content (bytes): Le contenu brut du flux.
+            etag (str): La valeur de l'en-tête ETag renvoyé par le serveur.
+            last_modified (str): La valeur de l'en-tête Last-Modified renvoyé par le serveur.
+
+        Returns:
+            dict: Les validateurs, à enregistrer avec `update`.
+        """
+        return {'etag': etag, 'last_modified': last_modified, 'hash': cls.content_hash(content)}
+
+    def update(self, url, validators):
+        """
+        Enregistre les validateurs d'un flux. À n'appeler qu'une fois les articles du flux stockés : sinon, une collecte
+        interrompue laisserait le flux marqué inchangé et ses articles non stockés ne seraient jamais collectés.
+
+        Args:
+            url (str): L'URL du flux.
+            validators (dict): Les validateurs construits par `validators`.
+        """
+        with self._lock:
+            self.cache_db[url] = validators
+
+    def close(self):
+        """
+        Ferme la base de données du cache.
+        """
+        self.cache_db.close()
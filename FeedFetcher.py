@@ -0,0 +1,180 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import feedparser
+import requests
+
+
+class FeedFetcher:
+    """
+    Classe pour télécharger et analyser plusieurs flux RSS en parallèle.
+
+    Les flux sont téléchargés par un pool de threads borné (plafond global), avec en plus une limite de requêtes
+    simultanées par hôte afin de ne pas surcharger un même éditeur (CNN, NYTimes, LeMonde...).
+    """
+
+    def __init__(self, max_workers=16, max_per_host=4, timeout=15, cache=None, archive=None, metrics=None):
+        """
+        Initialise la classe FeedFetcher.
+
+        Args:
+            max_workers (int): Nombre maximal de téléchargements simultanés, tous hôtes confondus.
+            max_per_host (int): Nombre maximal de téléchargements simultanés vers un même hôte.
+            timeout (float): Délai maximal (en secondes) accordé à chaque requête HTTP.
+            cache (FeedCache): Cache des validateurs HTTP. Si fourni, les flux inchangés ne sont ni retéléchargés
+                (réponse 304) ni réanalysés (contenu identique). Le cache n'est pas mis à jour par le FeedFetcher :
+                les validateurs sont retournés avec le flux analysé, pour être enregistrés une fois ses articles
+                stockés.
+            archive (PageArchive): Archive où conserver le contenu brut des flux téléchargés, ou None.
+            metrics (Metrics): Mesures de la collecte (latence, taille et issue de chaque téléchargement, durée de
+                l'analyse), ou None.
+        """
+        self.cache = cache
+        self.archive = archive
+        self.metrics = metrics
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_per_host)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+
+    def _host_semaphore(self, url):
+        """
+        Retourne le sémaphore limitant les requêtes simultanées vers l'hôte de l'URL.
+
+        Args:
+            url (str): L'URL du flux.
+
+        Returns:
+            threading.BoundedSemaphore: Le sémaphore associé à l'hôte.
+        """
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_semaphores[host]
+
+    def download(self, url, headers=None):
+        """
+        Télécharge le contenu brut d'un flux. Les chemins locaux (flux de benchmark) sont lus directement sur le disque.
+
+        Args:
+            url (str): L'URL ou le chemin local du flux.
+            headers (dict): En-têtes HTTP supplémentaires (requête conditionnelle).
+
+        Returns:
+            tuple: (code d'état, contenu brut, en-têtes de la réponse).
+        """
+        if urlparse(url).scheme not in ('http', 'https'):
+            with open(url, 'rb') as f:
+                return 200, f.read(), {}
+        with self._host_semaphore(url):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.status_code, response.content, response.headers
+
+    def fetch(self, url):
+        """
+        Télécharge et analyse un flux RSS en indiquant l'issue du téléchargement.
+
+        Args:
+            url (str): L'URL ou le chemin local du flux.
+
+        Returns:
+            tuple: (état, flux analysé, validateurs) où l'état vaut 'ok', 'unchanged' ou 'error'. Le flux analysé vaut
+            None si l'état n'est pas 'ok', et les validateurs (voir FeedCache.validators) valent None sans cache.
+        """
+        start = time.perf_counter()
+        try:
+            headers = self.cache.conditional_headers(url) if self.cache is not None else {}
+            status, content, response_headers = self.download(url, headers)
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur lors du téléchargement du flux {url} :", e)
+            return self.record(url, 'error', start)
+        except OSError as e:
+            print(f"Erreur lors de la lecture du flux {url} :", e)
+            return self.record(url, 'error', start)
+
+        if status == 304 or (self.cache is not None and self.cache.is_unchanged(url, content)):
+            print(f"Flux inchangé depuis le dernier passage : {url}")
+            return self.record(url, 'unchanged', start, content)
+
+        if self.archive is not None:
+            self.archive.add(url, content, 'application/rss+xml')
+        self.record(url, 'ok', start, content)
+        parse_start = time.perf_counter()
+        parsed_feed = feedparser.parse(content)
+        if self.metrics is not None:
+            self.metrics.observe('rssi_stage_seconds', time.perf_counter() - parse_start, stage='parse')
+        validators = None
+        if self.cache is not None:
+            validators = self.cache.validators(content, response_headers.get('ETag'),
+                                               response_headers.get('Last-Modified'))
+        return 'ok', parsed_feed, validators
+
+    def record(self, url, status, start, content=b''):
+        """
+        Enregistre la latence, la taille et l'issue du téléchargement d'un flux.
+
+        Args:
+            url (str): L'URL du flux.
+            status (str): L'issue du téléchargement ('ok', 'unchanged' ou 'error').
+            start (float): L'instant du début du téléchargement (time.perf_counter).
+            content (bytes): Le contenu téléchargé.
+
+        Returns:
+            tuple: (état, None, None), pour les issues sans flux analysé.
+        """
+        if self.metrics is not None:
+            self.metrics.observe('rssi_feed_fetch_seconds', time.perf_counter() - start, feed=url)
+            self.metrics.increment('rssi_feed_bytes_total', len(content), feed=url)
+            self.metrics.increment('rssi_feed_fetches_total', feed=url, status=status)
+        return status, None, None
+
+    def fetch_feed(self, url):
+        """
+        Télécharge et analyse un flux RSS.
+
+        Args:
+            url (str): L'URL ou le chemin local du flux.
+
+        Returns:
+            feedparser.FeedParserDict: Le flux analysé, ou None en cas d'erreur ou si le flux n'a pas changé.
+        """
+        return self.fetch(url)[1]
+
+    def fetch_all(self, rss_feeds):
+        """
+        Télécharge tous les flux en parallèle et les retourne au fur et à mesure de leur arrivée.
+
+        La durée totale est ainsi bornée par le flux le plus lent plutôt que par la somme des latences.
+
+        Args:
+            rss_feeds (dict): Un dictionnaire de flux RSS avec leurs URL et catégories.
+
+        Yields:
+            tuple: (nom du flux, informations du flux, flux analysé, validateurs) pour chaque flux téléchargé avec
+            succès.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch, feed_info['url']): (feed_name, feed_info)
+                for feed_name, feed_info in rss_feeds.items()
+            }
+            for future in as_completed(futures):
+                feed_name, feed_info = futures[future]
+                status, parsed_feed, validators = future.result()
+                if parsed_feed is not None:
+                    yield feed_name, feed_info, parsed_feed, validators
+
+    def close(self):
+        """
+        Ferme la session HTTP partagée.
+        """
+        self.session.close()
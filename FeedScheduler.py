@@ -0,0 +1,154 @@
+import heapq
+import shelve
+import time
+
+
+
+class FeedScheduler:
+    """
+    Planificateur adaptatif qui interroge chaque flux RSS à un rythme proportionnel à son activité.
+
+    Pour chaque flux, le planificateur estime un rythme de publication (articles par seconde) à partir des dates des
+    entrées et du nombre de nouveaux identifiants trouvés lors du dédoublonnage. Les flux très actifs
+    (LeMonde_international...) sont interrogés souvent, les flux calmes (Santepubliquefrance...) rarement. En cas
+    d'erreur, l'intervalle est doublé à chaque échec consécutif. Les prochains passages sont ordonnés dans une file de
+    priorité.
+    """
+
+    def __init__(self, scraper, state_path='./items/feed_schedule', min_interval=300, max_interval=6 * 3600,
+                 default_interval=1800, max_backoff=24 * 3600, target_new_articles=2, smoothing=0.3):
+        """
+        Initialise la classe FeedScheduler.
+
+        Args:
+            scraper (ArticleScraper): Le scraper qui traite et stocke les articles de chaque flux.
+            state_path (str): Chemin vers la base de données shelve conservant l'état de chaque flux entre deux lancements.
+            min_interval (float): Intervalle minimal entre deux passages sur un même flux (secondes).
+            max_interval (float): Intervalle maximal entre deux passages sur un flux sans erreur (secondes).
+            default_interval (float): Intervalle utilisé pour un flux jamais interrogé (secondes).
+            max_backoff (float): Intervalle maximal après des erreurs répétées (secondes).
+            target_new_articles (float): Nombre moyen de nouveaux articles visé à chaque passage.
+            smoothing (float): Poids de la dernière observation dans la moyenne mobile exponentielle du rythme.
+        """
+        self.scraper = scraper
+        self.state_db = shelve.open(state_path)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.max_backoff = max_backoff
+        self.target_new_articles = target_new_articles
+        self.smoothing = smoothing
+        self.queue = []
+
+        now = time.time()
+        for feed_name in scraper.rss_feeds:
+            state = self.state_db.get(feed_name, {'rate': None, 'errors': 0, 'last_poll': None, 'next_poll': now})
+            self.state_db[feed_name] = state
+            heapq.heappush(self.queue, (state['next_poll'], feed_name))
+
+    @staticmethod
+    def observed_rate(new_articles, elapsed, entry_dates):
+        """
+        Estime le rythme de publication d'un flux lors d'un passage.
+
+        Dès qu'un passage précédent existe, le rythme est mesuré par le nombre de nouveaux identifiants trouvés lors du
+        dédoublonnage depuis ce passage. Au premier passage, il est estimé à partir de l'écart entre les dates de
+        publication des entrées du flux.
+
+        Args:
+            new_articles (int): Nombre de nouveaux articles trouvés lors du passage.
+            elapsed (float): Temps écoulé depuis le passage précédent (secondes), ou None pour un premier passage.
+            entry_dates (list): Dates de publication des entrées du flux (secondes depuis l'époque).
+
+        Returns:
+            float: Le rythme estimé en articles par seconde, ou None si aucune estimation n'est possible.
+        """
+        if elapsed:
+            return new_articles / elapsed
+        if len(entry_dates) >= 2:
+            span = max(entry_dates) - min(entry_dates)
+            if span > 0:
+                return (len(entry_dates) - 1) / span
+        return None
+
+    def next_interval(self, state):
+        """
+        Calcule l'intervalle avant le prochain passage d'un flux à partir de son état.
+
+        Args:
+            state (dict): L'état du flux (rythme estimé et nombre d'erreurs consécutives).
+
+        Returns:
+            float: L'intervalle en secondes.
+        """
+        if state['errors']:
+            base = self.default_interval if not state['rate'] else self.target_new_articles / state['rate']
+            return min(self.max_backoff, max(self.min_interval, base) * 2 ** state['errors'])
+        if not state['rate']:
+            return self.default_interval if state['rate'] is None else self.max_interval
+        interval = self.target_new_articles / state['rate']
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def poll(self, feed_name, fetcher):
+        """
+        Interroge un flux, met à jour son état et le replace dans la file de priorité.
+
+        Args:
+            feed_name (str): Le nom du flux dans le dictionnaire `rss_feeds`.
+            fetcher (FeedFetcher): Le FeedFetcher utilisé pour télécharger le flux.
+
+        Returns:
+            float: La date (secondes depuis l'époque) du prochain passage prévu pour ce flux.
+        """
+        state = self.state_db[feed_name]
+        now = time.time()
+        status, new_articles, entry_dates = self.scraper.scrape_feed(self.scraper.rss_feeds[feed_name], fetcher)
+
+        if status == 'error':
+            state['errors'] += 1
+        else:
+            state['errors'] = 0
+            elapsed = now - state['last_poll'] if state['last_poll'] else None
+            rate = self.observed_rate(new_articles, elapsed, entry_dates)
+            if rate is not None:
+                if state['rate'] is None:
+                    state['rate'] = rate
+                else:
+                    state['rate'] = self.smoothing * rate + (1 - self.smoothing) * state['rate']
+            state['last_poll'] = now
+
+        state['next_poll'] = now + self.next_interval(state)
+        self.state_db[feed_name] = state
+        heapq.heappush(self.queue, (state['next_poll'], feed_name))
+        print(f"{feed_name} : {status}, {new_articles} nouveaux articles, "
+              f"prochain passage dans {state['next_poll'] - now:.0f}s")
+        return state['next_poll']
+
+    def run(self, max_polls=None):
+        """
+        Lance la boucle du planificateur : attend le prochain flux dû, l'interroge, puis recommence.
+
+        Args:
+            max_polls (int): Nombre maximal de passages avant de rendre la main, ou None pour tourner indéfiniment.
+
+        Returns:
+            None
+        """
+        fetcher = self.scraper.make_fetcher()
+        polls = 0
+        try:
+            while self.queue and (max_polls is None or polls < max_polls):
+                next_poll, feed_name = heapq.heappop(self.queue)
+                delay = next_poll - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                self.poll(feed_name, fetcher)
+                polls += 1
+        finally:
+            fetcher.close()
+
+    def close(self):
+        """
+        Ferme la base de données de l'état des flux.
+        """
+        self.state_db.close()
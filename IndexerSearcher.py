@@ -1,28 +1,142 @@
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, helpers
+import itertools
 import shelve
+import time
+from collections import OrderedDict
+from ArticleStore import SeenIds, open_article_store
+from DuplicateDetector import is_duplicate
+
+
+class QueryCache:
+    """
+    Cache LRU des résultats de recherche, dont chaque entrée expire après `ttl` secondes.
+
+    Les requêtes sont normalisées (casse et espaces) avant d'être utilisées comme clé : « Football  Europe » et
+    « football europe » partagent la même entrée, comme elles partagent les mêmes résultats avec l'analyseur standard
+    d'Elasticsearch. Les entrées d'un index sont effacées quand de nouveaux articles y sont indexés ; la durée de vie
+    borne le retard sur les indexations faites par d'autres processus.
+    """
+
+    def __init__(self, max_size=256, ttl=60):
+        """
+        Initialise la classe QueryCache.
+
+        Args:
+            max_size (int): Nombre maximal de résultats gardés dans le cache.
+            ttl (float): Durée de vie d'une entrée, en secondes.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query):
+        # Forme normalisée d'une requête : minuscules et espaces simples
+        return ' '.join(query.lower().split())
+
+    def get(self, key):
+        """
+        Retourne les résultats en cache pour une clé, s'ils n'ont pas expiré.
+
+        Args:
+            key (tuple): La clé de la recherche (index, requête normalisée, paramètres).
+
+        Returns:
+            dict: Les résultats, ou None si la clé est absente ou expirée.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, results):
+        """
+        Ajoute des résultats au cache, en retirant le plus ancien si le cache est plein.
+
+        Args:
+            key (tuple): La clé de la recherche.
+            results (dict): Les résultats.
+        """
+        self.entries[key] = (time.monotonic(), results)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, index_name):
+        """
+        Efface les résultats en cache d'un index.
+
+        Args:
+            index_name (str): Nom de l'index Elasticsearch.
+        """
+        for key in [key for key in self.entries if key[0] == index_name]:
+            del self.entries[key]
 
 class IndexerSearcher:
     """
-    Classe pour gérer la recherche dans Elasticsearch et l'indexation d'articles depuis une base de données Shelve.
+    Classe pour gérer la recherche dans Elasticsearch et l'indexation d'articles depuis une base de données d'articles
+    (shelve ou SQLite).
     """
 
-    def __init__(self, shelve_db_path, elastic_host, elastic_port, elastic_password, elastic_ca_certs):
+    # Champs interrogés et poids de chacun dans le score : tous les champs de l'article restent interrogés, et les
+    # trois champs de texte sont pondérés comme pour LocalSearcher
+    FIELDS = {'URL du flux source': 1.0, 'URL de la page source': 1.0, 'Date': 1.0, 'Titre': 3.0,
+              'Description / Résumé': 2.0, 'Langue': 1.0, 'Contenu': 1.0}
+
+    # Champs renvoyés par défaut : le contenu complet n'est pas renvoyé, seuls ses extraits surlignés le sont
+    SOURCE_FIELDS = ['URL du flux source', 'URL de la page source', 'Date', 'Titre', 'Description / Résumé', 'Langue',
+                     'Catégorie']
+
+    # Champ de l'identifiant de l'article, indexé tel quel (keyword) pour servir au tri
+    ID_FIELD = 'Identifiant'
+
+    # Version de la correspondance des champs, enregistrée dans le _meta de l'index. Un index d'une version antérieure
+    # est mis à niveau au prochain index_articles (voir upgrade_mapping). Version 1 : champ ID_FIELD
+    MAPPING_VERSION = 1
+
+    # Correspondance des champs imposée à la création de l'index
+    MAPPINGS = {'_meta': {'version': MAPPING_VERSION}, 'properties': {ID_FIELD: {'type': 'keyword'}}}
+
+    # Critères de tri des résultats. Le second, unique par article, départage les scores égaux : la pagination par
+    # search_after ne saute ni ne répète aucun article tant que l'index ne change pas entre deux pages
+    SORT = [{'_score': 'desc'}, {ID_FIELD: 'asc'}]
+
+    def __init__(self, shelve_db_path, elastic_host, elastic_port, elastic_password, elastic_ca_certs, es=None,
+                 sync_state_path='./items/es_sync', query_cache=None):
         """
         Initialise une instance de la classe ElasticsearchSearch.
 
         Args:
-            shelve_db_path (str): Chemin vers la base de données Shelve.
+            shelve_db_path (str): Chemin vers la base de données d'articles (shelve, ou SQLite si le chemin se termine
+                par .sqlite).
             elastic_host (str): Hôte Elasticsearch.
             elastic_port (int): Port Elasticsearch.
             elastic_password (str): Mot de passe Elasticsearch.
             elastic_ca_certs (str): Chemin vers le certificat CA pour Elasticsearch.
+            es (Elasticsearch): Client Elasticsearch déjà configuré (par exemple avec un transport simulé pour les
+                tests). Si None, un client est créé à partir des paramètres de connexion.
+            sync_state_path (str): Chemin vers la base shelve mémorisant, pour chaque index, le numéro de séquence du
+                dernier article envoyé. Pour une base d'articles shelve, les identifiants déjà envoyés sont rangés à
+                côté, un ensemble SeenIds par index (voir ids_path).
+            query_cache (QueryCache): Cache des résultats de recherche. Par défaut, un cache de 256 requêtes gardées
+                60 secondes.
         """
-        self.shelve_db = shelve.open(shelve_db_path, 'r')
+        self.shelve_db = open_article_store(shelve_db_path, 'r')
         self.elastic_host = elastic_host
         self.elastic_port = elastic_port
         self.elastic_password = elastic_password
         self.elastic_ca_certs = elastic_ca_certs
-        self.es = self.setup_elasticsearch()
+        self.es = es if es is not None else self.setup_elasticsearch()
+        self.sync_state_path = sync_state_path
+        self.sync_state = shelve.open(sync_state_path)
+        self.query_cache = query_cache if query_cache is not None else QueryCache()
 
     def setup_elasticsearch(self):
         """
@@ -40,58 +154,217 @@ class IndexerSearcher:
             raise ValueError("Connection to Elasticsearch failed")
         return es
 
-    def index_articles(self, index_name):
+    def ids_path(self, index_name):
+        # Chemin de l'ensemble des identifiants déjà envoyés à un index
+        return f'{self.sync_state_path}_{index_name}_ids'
+
+    def upgrade_mapping(self, index_name):
         """
-        Indexe tous les articles de la base de données Shelve dans Elasticsearch.
+        Met à niveau la correspondance des champs d'un index créé par une version antérieure.
+
+        Les documents indexés avant l'ajout du champ ID_FIELD ne l'ont pas : ils seraient triés en dernier et mal
+        départagés par search_after. Le champ est déclaré, puis recopié depuis _id dans ces documents par une requête
+        _update_by_query, et la nouvelle version est enregistrée. Un index déjà à jour n'est pas modifié.
+
+        Args:
+            index_name (str): Nom de l'index Elasticsearch existant.
+
+        Returns:
+            int: Le nombre de documents complétés.
+        """
+        mappings = self.es.indices.get_mapping(index=index_name)[index_name]['mappings']
+        if mappings.get('_meta', {}).get('version', 0) >= self.MAPPING_VERSION:
+            return 0
+        self.es.indices.put_mapping(index=index_name, properties=self.MAPPINGS['properties'],
+                                    meta=self.MAPPINGS['_meta'])
+        response = self.es.update_by_query(
+            index=index_name,
+            query={'bool': {'must_not': {'exists': {'field': self.ID_FIELD}}}},
+            script={'source': f"ctx._source['{self.ID_FIELD}'] = ctx._id", 'lang': 'painless'},
+            conflicts='proceed',
+            refresh=True
+        )
+        print(f"Index {index_name} mis à niveau (version {self.MAPPING_VERSION}) : {response['updated']} documents "
+              f"complétés")
+        return response['updated']
+
+    def pending_articles(self, state):
+        """
+        Retourne les articles ajoutés depuis la dernière synchronisation, en mettant à jour l'état au fil de la
+        lecture.
+
+        Pour une base SQLite, l'état est le numéro de séquence du dernier article envoyé (high-water mark). Pour une
+        base shelve, qui n'a pas d'ordre d'insertion, c'est l'ensemble des identifiants déjà envoyés (voir
+        ArticleStore.new_items).
+
+        Args:
+            state (dict): L'état de synchronisation de l'index ({'seq': int, 'ids': SeenIds}).
+
+        Yields:
+            tuple: (identifiant, article) pour chaque article à indexer.
+        """
+        return self.shelve_db.new_items(state)
+
+    def index_articles(self, index_name, chunk_size=500, thread_count=1):
+        """
+        Indexe dans Elasticsearch les articles ajoutés depuis la dernière synchronisation.
+
+        Un index créé par une version antérieure est d'abord mis à niveau (voir upgrade_mapping). Les doublons marqués à
+        l'ingestion ne sont pas indexés. Les articles sont envoyés par requêtes _bulk de `chunk_size` documents, avec le
+        rafraîchissement de l'index désactivé pendant le chargement. L'état de synchronisation n'est enregistré que si
+        tous les documents ont été acceptés, de sorte qu'un chargement interrompu est repris au prochain lancement.
 
         Args:
             index_name (str): Nom de l'index Elasticsearch.
+            chunk_size (int): Nombre de documents par requête _bulk.
+            thread_count (int): Nombre de requêtes _bulk envoyées en parallèle.
+
+        Returns:
+            int: Le nombre d'articles indexés.
         """
-        for article_id, article in self.shelve_db.items():
-            self.es.index(index=index_name, id=article_id, body=article)
-            print(f"Indexed article with ID: {article_id}")
+        # Seul le numéro de séquence est gardé dans sync_state ; les identifiants sont lus un à un dans leur SeenIds
+        stored = self.sync_state.get(index_name, {'seq': 0})
+        state = {'seq': stored['seq'], 'ids': SeenIds(self.ids_path(index_name))}
+        try:
+            return self.send_pending(index_name, state, stored, chunk_size, thread_count)
+        finally:
+            state['ids'].close()
+
+    def send_pending(self, index_name, state, stored, chunk_size, thread_count):
+        # Envoie les articles en attente et enregistre l'état de synchronisation (voir index_articles)
+        if 'ids' in stored:
+            # État enregistré avant SeenIds : l'ensemble des identifiants est repris une fois dans son SeenIds
+            for article_id in stored['ids']:
+                state['ids'].add(article_id)
+            state['ids'].commit()
+            self.sync_state[index_name] = {'seq': state['seq']}
+        if self.es.indices.exists(index=index_name):
+            self.upgrade_mapping(index_name)
+        actions = (
+            {'_index': index_name, '_id': article_id, '_source': {**article, self.ID_FIELD: article_id}}
+            for article_id, article in self.pending_articles(state)
+            if not is_duplicate(article)
+        )
+        first_action = next(actions, None)
+        if first_action is None:
+            print("L'index est à jour, aucun nouvel article à indexer.")
+            return 0
+        actions = itertools.chain([first_action], actions)
+
+        if not self.es.indices.exists(index=index_name):
+            self.es.indices.create(index=index_name, mappings=self.MAPPINGS)
+        self.es.indices.put_settings(index=index_name, settings={'index': {'refresh_interval': '-1'}})
+        indexed, failed = 0, 0
+        try:
+            if thread_count > 1:
+                results = helpers.parallel_bulk(self.es, actions, thread_count=thread_count, chunk_size=chunk_size,
+                                                raise_on_error=False)
+            else:
+                results = helpers.streaming_bulk(self.es, actions, chunk_size=chunk_size, raise_on_error=False)
+            for ok, info in results:
+                if ok:
+                    indexed += 1
+                else:
+                    failed += 1
+                    print(f"Échec de l'indexation : {info}")
+        finally:
+            self.es.indices.put_settings(index=index_name, settings={'index': {'refresh_interval': None}})
+            self.es.indices.refresh(index=index_name)
+
+        if failed == 0:
+            state['ids'].commit()
+            self.sync_state[index_name] = {'seq': state['seq']}
+        if indexed:
+            self.query_cache.invalidate(index_name)
+        print(f"{indexed} articles indexés, {failed} échecs")
+        return indexed
 
-    def search(self, index_name, query):
+    def search(self, index_name, query, size=10, search_after=None, source_fields=None):
         """
-        Effectue une recherche dans Elasticsearch en fonction de la requête et affiche les résultats.
+        Effectue une recherche dans Elasticsearch et retourne une page de résultats.
+
+        La requête est cherchée dans les champs de FIELDS, chacun avec son poids. Seuls les champs demandés sont
+        renvoyés, avec des extraits surlignés du titre, de la description et du contenu. Les résultats d'une même
+        recherche sont servis par le cache tant que l'index n'a pas reçu de nouveaux articles.
 
         Args:
             index_name (str): Nom de l'index Elasticsearch.
             query (str): Terme de recherche.
+            size (int): Nombre maximal de résultats de la page.
+            search_after (list): La valeur 'search_after' de la page précédente, pour obtenir la page suivante, ou None
+                pour la première page.
+            source_fields (list): Les champs des articles à renvoyer (SOURCE_FIELDS par défaut).
+
+        Returns:
+            dict: {'total': nombre d'articles trouvés, 'hits': [{'_id', '_score', '_source', 'highlight'}],
+            'search_after': valeur à passer pour obtenir la page suivante, ou None s'il n'y en a pas}. Le résultat
+            peut être partagé avec le cache : il ne doit pas être modifié.
         """
-        result = self.es.search(index=index_name, body={
+        query = QueryCache.normalize(query)
+        source_fields = list(source_fields or self.SOURCE_FIELDS)
+        key = (index_name, query, size, tuple(search_after or ()), tuple(source_fields))
+        results = self.query_cache.get(key)
+        if results is not None:
+            return results
+
+        body = {
             "query": {
                 "bool": {
-                    "should": [
-                        {"match": {"URL du flux source": query.strip()}},
-                        {"match": {"URL de la page source": query.strip()}},
-                        {"match": {"Date": query.strip()}},
-                        {"match": {"Titre": query.strip()}},
-                        {"match": {"Description / Résumé": query.strip()}},
-                        {"match": {"Langue": query.strip()}},
-                        {"match": {"Contenu": query.strip()}}
-                    ]
+                    # lenient : une requête textuelle sur un champ typé (date...) ne fait pas échouer la recherche
+                    "should": [{"match": {field: {"query": query, "boost": boost, "lenient": True}}}
+                               for field, boost in self.FIELDS.items()]
                 }
             },
-        })
-
-        if result.get('hits') is not None and result['hits'].get('hits') is not None:
-            for hit in result['hits']['hits']:
-                print(f"ID: {hit['_id']}")
-                print(f"URL du flux source: {hit['_source']['URL du flux source']}")
-                print(f"URL de la page source: {hit['_source']['URL de la page source']}")
-                print(f"Date: {hit['_source']['Date']}")
-                print(f"Titre: {hit['_source']['Titre']}")
-                print(f"Description / Résumé: {hit['_source']['Description / Résumé']}")
-                print(f"Langue: {hit['_source']['Langue']}")
-                print(f"Contenu: {hit['_source']['Contenu']}")
-                print("--------")
+            "_source": source_fields,
+            "highlight": {
+                "fields": {
+                    "Titre": {"number_of_fragments": 0},
+                    "Description / Résumé": {"number_of_fragments": 0},
+                    "Contenu": {"fragment_size": 150, "number_of_fragments": 3}
+                }
+            },
+            "size": size,
+            "sort": self.SORT
+        }
+        if search_after:
+            body["search_after"] = list(search_after)
+        result = self.es.search(index=index_name, body=body)
+
+        hits = [{'_id': hit['_id'], '_score': hit.get('_score'), '_source': hit.get('_source', {}),
+                 'highlight': hit.get('highlight', {})} for hit in result['hits']['hits']]
+        total = result['hits'].get('total', {})
+        results = {
+            'total': total.get('value', len(hits)) if isinstance(total, dict) else total,
+            'hits': hits,
+            # Une page incomplète est la dernière
+            'search_after': result['hits']['hits'][-1].get('sort') if hits and len(hits) == size else None
+        }
+        self.query_cache.put(key, results)
+        return results
+
+    @staticmethod
+    def print_results(results):
+        """
+        Affiche une page de résultats de `search`.
+
+        Args:
+            results (dict): Les résultats.
+        """
+        for hit in results['hits']:
+            print(f"ID: {hit['_id']}")
+            for field, value in hit['_source'].items():
+                print(f"{field}: {value}")
+            for field, snippets in hit['highlight'].items():
+                print(f"Extraits ({field}): {' … '.join(snippets)}")
+            print("--------")
+        print(f"{len(results['hits'])} résultats affichés sur {results['total']}")
 
     def close(self):
         """
-        Ferme la base de données Shelve.
+        Ferme la base de données d'articles et l'état de synchronisation.
         """
         self.shelve_db.close()
+        self.sync_state.close()
 
 # Exemple d'utilisation de la classe
 if __name__ == "__main__":
@@ -106,6 +379,6 @@ if __name__ == "__main__":
     es_search.index_articles(index_name='rssi')
 
     query = input("Enter a search: ")
-    es_search.search(index_name='rssi', query=query)
+    es_search.print_results(es_search.search(index_name='rssi', query=query))
 
     es_search.close()
@@ -0,0 +1,136 @@
+import random
+import shelve
+
+from langdetect import DetectorFactory, detect
+from langdetect.lang_detect_exception import LangDetectException
+
+# langdetect est aléatoire sans graine fixe : la même entrée donnerait des langues différentes d'une collecte à l'autre
+DetectorFactory.seed = 0
+
+
+class LanguageIdentifier:
+    """
+    Identification de la langue des titres d'articles, avec cache et connaissance de la langue habituelle de chaque flux.
+
+    Les langues détectées sont comptées par flux. Une fois qu'un flux a publié assez d'articles presque tous dans la
+    même langue (un flux du Monde est en français), la détection est sautée pour ses nouveaux articles, sauf pour un
+    échantillon (`recheck_rate`) qui est toujours détecté : si la majorité de l'échantillon d'un lot contredit la
+    langue du flux, ses comptes repartent de cet échantillon et le flux n'est plus considéré comme sûr. Les autres
+    titres sont détectés une seule fois grâce à un cache persistant indexé par identifiant d'article, qui évite de
+    redétecter à chaque collecte les articles écartés pour leur langue.
+    """
+
+    def __init__(self, state_path='./items/language_state', min_observations=20, confidence=0.95, recheck_rate=0.05,
+                 cache_path=None, seed=0):
+        """
+        Initialise la classe LanguageIdentifier.
+
+        Args:
+            state_path (str): Chemin vers la base shelve des langues observées pour chaque flux.
+            min_observations (int): Nombre d'articles détectés nécessaires avant de faire confiance à un flux.
+            confidence (float): Proportion minimale de la langue majoritaire d'un flux pour sauter la détection.
+            recheck_rate (float): Proportion des articles d'un flux sûr dont la langue est tout de même détectée.
+            cache_path (str): Chemin vers la base shelve des langues détectées par identifiant d'article. Par défaut,
+                à côté de `state_path` (suffixe _cache).
+            seed (int): Graine du tirage de l'échantillon revérifié.
+        """
+        self.state = shelve.open(state_path)
+        self.cache = shelve.open(cache_path or state_path + '_cache')
+        self.min_observations = min_observations
+        self.confidence = confidence
+        self.recheck_rate = recheck_rate
+        self.random = random.Random(seed)
+
+    def feed_prior(self, feed_url):
+        """
+        Retourne la langue habituelle d'un flux, si elle est assez sûre pour sauter la détection.
+
+        Args:
+            feed_url (str): L'URL du flux.
+
+        Returns:
+            str: Le code de la langue du flux, ou None si le flux n'a pas encore de langue sûre.
+        """
+        counts = self.state.get(feed_url)
+        if not counts:
+            return None
+        total = sum(counts.values())
+        language, count = max(counts.items(), key=lambda item: item[1])
+        if total >= self.min_observations and count / total >= self.confidence:
+            return language
+        return None
+
+    def detect(self, text, article_id=None):
+        """
+        Détecte la langue d'un texte, en passant par le cache si l'identifiant de l'article est connu.
+
+        Args:
+            text (str): Le texte à analyser.
+            article_id (str): L'identifiant de l'article, clé du cache, ou None pour ne pas utiliser le cache.
+
+        Returns:
+            str: Le code de la langue détectée, ou '' si elle n'a pas pu être détectée.
+        """
+        if article_id is not None and article_id in self.cache:
+            return self.cache[article_id]
+        try:
+            language = detect(text)
+        except LangDetectException:
+            language = ''
+        if article_id is not None:
+            self.cache[article_id] = language
+        return language
+
+    def identify_many(self, texts, feed_url=None, article_ids=None):
+        """
+        Identifie la langue d'un lot de textes provenant d'un même flux.
+
+        Args:
+            texts (list): Les textes à analyser (titres normalisés). Les textes de moins de 3 caractères ne sont pas
+                analysés.
+            feed_url (str): L'URL du flux des textes, pour utiliser et enrichir la langue habituelle du flux.
+            article_ids (list): Les identifiants des articles, dans l'ordre des textes, qui servent de clé au cache.
+                Sans identifiants, les textes identiques d'un lot ne sont détectés qu'une fois, sans cache.
+
+        Returns:
+            list: Le code de langue de chaque texte ('' si elle n'a pas pu être déterminée), dans l'ordre des textes.
+        """
+        prior = self.feed_prior(feed_url) if feed_url else None
+        if article_ids is None:
+            article_ids = [None] * len(texts)
+
+        languages = []
+        sampled = []
+        detected = {}
+        for text, article_id in zip(texts, article_ids):
+            if len(text) < 3:
+                languages.append('')
+            elif prior is not None and self.random.random() >= self.recheck_rate:
+                languages.append(prior)
+            else:
+                if article_id is not None:
+                    language = self.detect(text, article_id)
+                else:
+                    if text not in detected:
+                        detected[text] = self.detect(text)
+                    language = detected[text]
+                languages.append(language)
+                if language:
+                    sampled.append(language)
+
+        if feed_url and sampled:
+            counts = self.state.get(feed_url, {})
+            if prior is not None and sum(language != prior for language in sampled) * 2 > len(sampled):
+                # L'échantillon contredit la langue du flux : elle n'est plus sûre et les comptes repartent à zéro
+                counts = {}
+            for language in sampled:
+                counts[language] = counts.get(language, 0) + 1
+            self.state[feed_url] = counts
+        return languages
+
+    def close(self):
+        """
+        Ferme la base des langues observées et le cache.
+        """
+        self.state.close()
+        self.cache.close()
@@ -0,0 +1,235 @@
+import json
+import math
+import os
+from collections import Counter
+
+import numpy as np
+
+from ArticleStore import open_article_store
+from DuplicateDetector import is_duplicate
+from TextNormalizer import TextNormalizer
+from TokenCache import TokenCache
+
+
+class LocalSearcher:
+    """
+    Moteur de recherche embarqué, alternative à Elasticsearch, exposant la même méthode `search(index_name, query)`.
+
+    L'index inversé est construit avec le même pipeline de stemming et de stop words que
+    `dictionaryCreator.process_articles`, et les résultats sont classés par BM25 sur les champs Titre, Description et
+    Contenu. Les listes de postings sont stockées dans des tableaux NumPy compacts (identifiants de documents en int32,
+    fréquences en uint16) et ouvertes en mémoire partagée (mmap) : une requête ne lit que les postings de ses termes.
+    """
+
+    # Champs indexés et poids de chacun dans le score final
+    FIELDS = {'Titre': 3.0, 'Description / Résumé': 2.0, 'Contenu': 1.0}
+
+    def __init__(self, shelve_db_path, index_dir='./index', k1=1.2, b=0.75, token_cache_path='./items/token_cache'):
+        """
+        Initialise la classe LocalSearcher.
+
+        Args:
+            shelve_db_path (str): Chemin vers la base de données d'articles (shelve, ou SQLite si le chemin se termine
+                par .sqlite).
+            index_dir (str): Répertoire contenant un sous-répertoire par index.
+            k1 (float): Paramètre de saturation de la fréquence des termes de BM25.
+            b (float): Paramètre de normalisation par la longueur des documents de BM25.
+            token_cache_path (str): Chemin du cache des racines des articles (voir TokenCache), partagé avec
+                dictionaryCreator, ou None pour normaliser chaque article à chaque indexation.
+        """
+        self.shelve_db = open_article_store(shelve_db_path, 'r')
+        self.index_dir = index_dir
+        self.k1 = k1
+        self.b = b
+        self._indexes = {}
+        self.normalizers = {'fr': TextNormalizer.for_language('french'), 'en': TextNormalizer.for_language('english')}
+        self.token_cache = TokenCache(token_cache_path) if token_cache_path else None
+
+    def analyze(self, text, language):
+        """
+        Découpe et stemme un texte avec le pipeline de la langue donnée.
+
+        Args:
+            text (str): Le texte à analyser.
+            language (str): 'fr' pour le français, toute autre valeur pour l'anglais.
+
+        Returns:
+            list: Les termes stemmés.
+        """
+        return self.normalizers['fr' if language == 'fr' else 'en'].normalize(text)
+
+    def index_articles(self, index_name):
+        """
+        Construit l'index inversé de tous les articles de la base, hors doublons, et l'écrit sur le disque.
+
+        Args:
+            index_name (str): Nom de l'index (sous-répertoire de `index_dir`).
+
+        Returns:
+            int: Le nombre d'articles indexés.
+        """
+        doc_ids = []
+        postings = {}
+        doc_lengths = {field: [] for field in self.FIELDS}
+        for article_id, article in self.shelve_db.items():
+            if is_duplicate(article):
+                continue
+            doc = len(doc_ids)
+            doc_ids.append(article_id)
+            language = article.get('Langue', '').lower()
+            if self.token_cache is not None:
+                article_terms = self.token_cache.fields(article_id, article,
+                                                        self.normalizers['fr' if language == 'fr' else 'en'])
+            else:
+                article_terms = {field: self.analyze(article.get(field, ''), language) for field in self.FIELDS}
+            for field in self.FIELDS:
+                terms = article_terms[field]
+                doc_lengths[field].append(len(terms))
+                for term, tf in Counter(terms).items():
+                    postings.setdefault(term, {}).setdefault(field, []).append((doc, tf))
+
+        path = os.path.join(self.index_dir, index_name)
+        os.makedirs(path, exist_ok=True)
+        terms = sorted(postings)
+        for field_number, field in enumerate(self.FIELDS):
+            offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+            docs, tfs = [], []
+            for term_number, term in enumerate(terms):
+                field_postings = postings[term].get(field, [])
+                offsets[term_number + 1] = offsets[term_number] + len(field_postings)
+                docs.extend(doc for doc, tf in field_postings)
+                tfs.extend(min(tf, np.iinfo(np.uint16).max) for doc, tf in field_postings)
+            np.save(os.path.join(path, f'offsets_{field_number}.npy'), offsets)
+            np.save(os.path.join(path, f'docs_{field_number}.npy'), np.asarray(docs, dtype=np.int32))
+            np.save(os.path.join(path, f'tfs_{field_number}.npy'), np.asarray(tfs, dtype=np.uint16))
+            np.save(os.path.join(path, f'doclen_{field_number}.npy'), np.asarray(doc_lengths[field], dtype=np.int32))
+
+        with open(os.path.join(path, 'terms.json'), 'w', encoding='utf-8') as f:
+            json.dump(terms, f, ensure_ascii=False)
+        with open(os.path.join(path, 'doc_ids.json'), 'w', encoding='utf-8') as f:
+            json.dump(doc_ids, f)
+        self._indexes.pop(index_name, None)
+        print(f"{len(doc_ids)} articles indexés, {len(terms)} termes distincts")
+        return len(doc_ids)
+
+    def load_index(self, index_name):
+        """
+        Ouvre un index en mémoire partagée (mmap). L'index ouvert est conservé pour les requêtes suivantes.
+
+        Args:
+            index_name (str): Nom de l'index.
+
+        Returns:
+            dict: Le vocabulaire, les identifiants d'articles et les tableaux de chaque champ.
+        """
+        if index_name not in self._indexes:
+            path = os.path.join(self.index_dir, index_name)
+            with open(os.path.join(path, 'terms.json'), encoding='utf-8') as f:
+                terms = json.load(f)
+            with open(os.path.join(path, 'doc_ids.json'), encoding='utf-8') as f:
+                doc_ids = json.load(f)
+            fields = []
+            for field_number, boost in enumerate(self.FIELDS.values()):
+                doc_lengths = np.load(os.path.join(path, f'doclen_{field_number}.npy'), mmap_mode='r')
+                fields.append({
+                    'boost': boost,
+                    'offsets': np.load(os.path.join(path, f'offsets_{field_number}.npy'), mmap_mode='r'),
+                    'docs': np.load(os.path.join(path, f'docs_{field_number}.npy'), mmap_mode='r'),
+                    'tfs': np.load(os.path.join(path, f'tfs_{field_number}.npy'), mmap_mode='r'),
+                    'doc_lengths': doc_lengths,
+                    'avg_length': float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+                })
+            self._indexes[index_name] = {
+                'term_ids': {term: term_id for term_id, term in enumerate(terms)},
+                'doc_ids': doc_ids,
+                'fields': fields
+            }
+        return self._indexes[index_name]
+
+    def score(self, index_name, query):
+        """
+        Calcule le score BM25 de chaque article pour une requête.
+
+        La langue de la requête n'étant pas connue, elle est analysée avec les pipelines français et anglais.
+
+        Args:
+            index_name (str): Nom de l'index.
+            query (str): Terme de recherche.
+
+        Returns:
+            numpy.ndarray: Le score de chaque article, dans l'ordre des identifiants de l'index.
+        """
+        index = self.load_index(index_name)
+        n_docs = len(index['doc_ids'])
+        scores = np.zeros(n_docs, dtype=np.float64)
+        query_terms = set(self.analyze(query, 'fr')) | set(self.analyze(query, 'en'))
+        for term in query_terms:
+            term_id = index['term_ids'].get(term)
+            if term_id is None:
+                continue
+            for field in index['fields']:
+                start, end = field['offsets'][term_id], field['offsets'][term_id + 1]
+                if start == end:
+                    continue
+                docs = field['docs'][start:end]
+                tfs = field['tfs'][start:end].astype(np.float64)
+                idf = math.log(1 + (n_docs - (end - start) + 0.5) / ((end - start) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * field['doc_lengths'][docs] / max(field['avg_length'], 1e-9))
+                scores[docs] += field['boost'] * idf * tfs * (self.k1 + 1) / (tfs + norm)
+        return scores
+
+    def search(self, index_name, query, size=10):
+        """
+        Effectue une recherche dans l'index local et affiche les résultats.
+
+        Args:
+            index_name (str): Nom de l'index.
+            query (str): Terme de recherche.
+            size (int): Nombre maximal de résultats.
+
+        Returns:
+            list: Les résultats, au même format que les hits Elasticsearch ({'_id', '_score', '_source'}).
+        """
+        scores = self.score(index_name, query.strip())
+        matching = np.flatnonzero(scores)
+        if len(matching) > size:
+            matching = matching[np.argpartition(-scores[matching], size)[:size]]
+        matching = matching[np.argsort(-scores[matching], kind='stable')]
+
+        doc_ids = self.load_index(index_name)['doc_ids']
+        hits = []
+        for doc in matching:
+            article_id = doc_ids[doc]
+            hits.append({'_id': article_id, '_score': float(scores[doc]), '_source': self.shelve_db[article_id]})
+
+        for hit in hits:
+            print(f"ID: {hit['_id']}")
+            print(f"URL du flux source: {hit['_source']['URL du flux source']}")
+            print(f"URL de la page source: {hit['_source']['URL de la page source']}")
+            print(f"Date: {hit['_source']['Date']}")
+            print(f"Titre: {hit['_source']['Titre']}")
+            print(f"Description / Résumé: {hit['_source']['Description / Résumé']}")
+            print(f"Langue: {hit['_source']['Langue']}")
+            print(f"Contenu: {hit['_source']['Contenu']}")
+            print("--------")
+        return hits
+
+    def close(self):
+        """
+        Ferme la base de données d'articles et le cache des racines.
+        """
+        self.shelve_db.close()
+        if self.token_cache is not None:
+            self.token_cache.close()
+
+
+# Exemple d'utilisation de la classe
+if __name__ == "__main__":
+    local_search = LocalSearcher(shelve_db_path='./items/article_db')
+
+    local_search.index_articles(index_name='rssi')
+
+    query = input("Enter a search: ")
+    local_search.search(index_name='rssi', query=query)
+
+    local_search.close()
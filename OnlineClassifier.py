@@ -0,0 +1,229 @@
+import argparse
+import os
+
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+
+from ArticleStore import SeenIds, open_article_store
+from CategoryClassifier import PIPELINES
+from DuplicateDetector import is_duplicate
+from TokenCache import TokenCache
+from dictionaryCreator import process_articles
+from training_pipeline import make_vectorizer
+
+# Version du format des points de reprise : un point de reprise d'un autre format est ignoré
+CHECKPOINT_FORMAT_VERSION = 2
+
+# Estimateurs capables d'apprendre par mini-lots (partial_fit) et de fournir des probabilités
+ESTIMATORS = {
+    'sgd': lambda: SGDClassifier(loss='log_loss', random_state=42),
+    'bayes': lambda: MultinomialNB()
+}
+
+
+class OnlineClassifier:
+    """
+    Classifieur de catégorie mis à jour en continu à partir des articles nouvellement stockés.
+
+    Les caractéristiques sont calculées par hachage (HashingVectorizer), sans vocabulaire à réentraîner, et l'estimateur
+    apprend par mini-lots avec `partial_fit` : le coût de l'entraînement suit le volume de chaque collecte et non la
+    taille du corpus. Le modèle et la position de lecture dans la base sont sauvegardés ensemble dans un point de
+    reprise. Pour une base shelve, les identifiants des articles déjà appris sont rangés à part, dans un shelve indexé
+    par identifiant (voir SeenIds), pour que le point de reprise ne grossisse pas avec le corpus.
+    """
+
+    def __init__(self, language, estimator='sgd', checkpoint_path=None, batch_size=256, checkpoint_every=10,
+                 token_cache=None):
+        """
+        Initialise la classe OnlineClassifier, en reprenant le point de reprise s'il existe.
+
+        Args:
+            language (str): La langue des articles traités ('fr' ou 'en').
+            estimator (str): L'estimateur à utiliser ('sgd' ou 'bayes'), ignoré si un point de reprise est repris.
+            checkpoint_path (str): Chemin du point de reprise (./models/online_{langue}.joblib par défaut).
+            batch_size (int): Nombre d'articles par mini-lot.
+            checkpoint_every (int): Nombre de mini-lots entre deux sauvegardes du point de reprise.
+            token_cache (TokenCache): Cache des racines des articles déjà normalisés, ou None.
+        """
+        self.language = language
+        self.checkpoint_path = checkpoint_path or os.path.join('./models', f'online_{language}.joblib')
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.token_cache = token_cache
+        stopwords, self.stemmer = PIPELINES[language]
+        self.stopwords = stopwords
+        self.vectorizer = make_vectorizer('hashing', stopwords)
+
+        self.estimator_name = estimator
+        self.estimator = ESTIMATORS[estimator]()
+        self.classes = None
+        self.state = {'seq': 0}
+        self.trained = 0
+        resumed = self.load_checkpoint()
+        # Sans point de reprise, l'apprentissage repart de zéro : les identifiants déjà appris sont oubliés
+        os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+        self.state['ids'] = SeenIds(self.ids_path(), 'c' if resumed else 'n')
+
+    def ids_path(self):
+        # Shelve des identifiants déjà appris, à côté du point de reprise
+        return os.path.splitext(self.checkpoint_path)[0] + '_ids'
+
+    def load_checkpoint(self):
+        """
+        Reprend l'estimateur, les catégories et la position de lecture sauvegardés.
+
+        Returns:
+            bool: True si un point de reprise compatible a été repris.
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return False
+        checkpoint = joblib.load(self.checkpoint_path)
+        if checkpoint.get('format_version') != CHECKPOINT_FORMAT_VERSION or checkpoint.get('language') != self.language:
+            print(f"Point de reprise {self.checkpoint_path} incompatible, l'apprentissage repart de zéro")
+            return False
+        self.estimator_name = checkpoint['estimator_name']
+        self.estimator = checkpoint['estimator']
+        self.classes = checkpoint['classes']
+        self.state['seq'] = checkpoint['seq']
+        self.trained = checkpoint['trained']
+        return True
+
+    def save_checkpoint(self):
+        """
+        Sauvegarde l'estimateur et la position de lecture, en remplaçant l'ancien point de reprise de façon atomique,
+        puis les identifiants des articles appris depuis la dernière sauvegarde.
+        """
+        os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+        temporary_path = self.checkpoint_path + '.tmp'
+        joblib.dump({
+            'format_version': CHECKPOINT_FORMAT_VERSION,
+            'language': self.language,
+            'estimator_name': self.estimator_name,
+            'estimator': self.estimator,
+            'classes': self.classes,
+            'seq': self.state['seq'],
+            'trained': self.trained
+        }, temporary_path)
+        os.replace(temporary_path, self.checkpoint_path)
+        self.state['ids'].commit()
+
+    def transform(self, articles):
+        # Textes traités par dictionaryCreator (lus dans le cache des racines s'il est fourni) puis caractéristiques
+        # hachées (matrice creuse)
+        return self.vectorizer.transform(process_articles(articles, self.stopwords, self.stemmer,
+                                                          token_cache=self.token_cache))
+
+    def learn_batch(self, articles):
+        """
+        Met à jour l'estimateur avec un mini-lot d'articles étiquetés.
+
+        Args:
+            articles (dict): Les articles du lot, indexés par identifiant, avec leur champ 'Catégorie'.
+        """
+        labels = [article['Catégorie'] for article in articles.values()]
+        self.estimator.partial_fit(self.transform(articles), labels, classes=self.classes)
+        self.trained += len(articles)
+
+    def learn(self, article_db):
+        """
+        Apprend sur les articles étiquetés de la langue ajoutés à la base depuis le dernier passage.
+
+        Les catégories sont fixées au premier passage d'après celles présentes dans la base. Les articles d'une
+        catégorie apparue depuis sont ignorés (signalés en fin de passage) : il faut alors repartir de zéro en
+        supprimant le point de reprise.
+
+        Args:
+            article_db (ArticleStore): La base d'articles (./items/article_db).
+
+        Returns:
+            int: Le nombre d'articles appris lors de ce passage.
+        """
+        if self.classes is None:
+            self.classes = np.array(sorted(category for category, languages in
+                                           article_db.count_by_category_language().items()
+                                           if self.language in languages and category != 'Catégorie inconnue'))
+        known_classes = set(self.classes)
+        unknown_categories = set()
+        learned = 0
+        batches = 0
+        batch = {}
+        for article_id, article in article_db.new_items(self.state):
+            if (article.get('Langue', '').lower() != self.language or not article.get('Catégorie')
+                    or is_duplicate(article)):
+                continue
+            if article['Catégorie'] not in known_classes:
+                unknown_categories.add(article['Catégorie'])
+                continue
+            batch[article_id] = article
+            if len(batch) >= self.batch_size:
+                self.learn_batch(batch)
+                learned += len(batch)
+                batches += 1
+                batch = {}
+                if batches % self.checkpoint_every == 0:
+                    self.save_checkpoint()
+        if batch:
+            self.learn_batch(batch)
+            learned += len(batch)
+        self.save_checkpoint()
+
+        if unknown_categories:
+            print(f"Catégories inconnues du modèle {self.language} ignorées : {', '.join(sorted(unknown_categories))}")
+        return learned
+
+    def predict(self, article_db):
+        """
+        Prédit la catégorie d'un lot d'articles (même format que CategoryClassifier.predict).
+
+        Args:
+            article_db (dict): Les articles à classer, indexés par identifiant.
+
+        Returns:
+            dict: {identifiant: (catégorie prédite, [[catégorie, probabilité], ...])}.
+        """
+        if not article_db or not self.trained:
+            return {}
+        probabilities = self.estimator.predict_proba(self.transform(article_db))
+        classes = self.estimator.classes_
+        predictions = {}
+        for article_id, article_probabilities in zip(article_db, probabilities):
+            predictions[article_id] = (
+                str(classes[np.argmax(article_probabilities)]),
+                [[str(category), float(probability)] for category, probability in zip(classes, article_probabilities)]
+            )
+        return predictions
+
+    def close(self):
+        """
+        Ferme le shelve des identifiants déjà appris.
+        """
+        self.state['ids'].close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Met à jour les classifieurs en ligne avec les nouveaux articles.")
+    parser.add_argument('--db', default='./items/article_db', help="Base d'articles étiquetés")
+    parser.add_argument('--models', default='./models', help="Répertoire des points de reprise")
+    parser.add_argument('--estimator', choices=list(ESTIMATORS), default='sgd')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--token-cache', default='./items/token_cache',
+                        help="Cache des racines de chaque article (voir TokenCache)")
+    args = parser.parse_args()
+
+    article_db = open_article_store(args.db, 'r')
+    token_cache = TokenCache(args.token_cache)
+    try:
+        for language in PIPELINES:
+            classifier = OnlineClassifier(language, args.estimator,
+                                          os.path.join(args.models, f'online_{language}.joblib'), args.batch_size,
+                                          token_cache=token_cache)
+            try:
+                learned = classifier.learn(article_db)
+            finally:
+                classifier.close()
+            print(f"Modèle en ligne {language} : {learned} nouveaux articles appris, {classifier.trained} au total")
+    finally:
+        token_cache.close()
+        article_db.close()
@@ -0,0 +1,257 @@
+import argparse
+import gzip
+import os
+import shelve
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from ArticleStore import open_article_store
+from ContentExtractor import ContentExtractor, content_charset
+
+
+class PageArchive:
+    """
+    Archive compressée, en ajout seul, des flux RSS et des pages d'articles téléchargés (format inspiré de WARC).
+
+    Chaque page est un enregistrement (en-têtes WARC puis contenu brut) compressé dans son propre membre gzip et ajouté
+    à la fin du segment courant (segment-00000.warc.gz, ...). Un index shelve donne pour chaque URL la position du
+    dernier enregistrement (segment, décalage, longueur), et pour chaque article l'URL de sa page : un enregistrement
+    se relit avec une seule lecture et une seule décompression, sans parcourir le segment.
+    """
+
+    def __init__(self, archive_dir='./items/archive', segment_size=64 * 2 ** 20, flag='c'):
+        """
+        Initialise la classe PageArchive.
+
+        Args:
+            archive_dir (str): Répertoire des segments et de l'index.
+            segment_size (int): Taille à partir de laquelle un nouveau segment est commencé.
+            flag (str): 'r' pour la lecture seule, 'c' pour la lecture/écriture.
+        """
+        self.archive_dir = archive_dir
+        self.segment_size = segment_size
+        if flag != 'r':
+            os.makedirs(archive_dir, exist_ok=True)
+        self.index = shelve.open(os.path.join(archive_dir, 'index'), flag)
+        segments = sorted(name for name in os.listdir(archive_dir) if name.endswith('.warc.gz'))
+        self.segment = segments[-1] if segments else self.segment_name(0)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def segment_name(number):
+        return f'segment-{number:05d}.warc.gz'
+
+    @staticmethod
+    def make_record(url, content, content_type):
+        # Enregistrement WARC : en-têtes, ligne vide, contenu brut
+        headers = (
+            'WARC/1.0\r\n'
+            'WARC-Type: response\r\n'
+            f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n'
+            f'WARC-Date: {time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}\r\n'
+            f'WARC-Target-URI: {url}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(content)}\r\n'
+            '\r\n'
+        )
+        return headers.encode('utf-8') + content + b'\r\n\r\n'
+
+    def add(self, url, content, content_type='text/html'):
+        """
+        Ajoute une page à l'archive. La position de la page dans l'index est remplacée par celle du nouvel
+        enregistrement.
+
+        Args:
+            url (str): L'URL de la page ou du flux.
+            content (bytes): Le contenu brut téléchargé.
+            content_type (str): Le type du contenu, avec son encodage (en-tête Content-Type de la réponse pour une
+                page, 'application/rss+xml' pour un flux).
+        """
+        member = gzip.compress(self.make_record(url, content, content_type))
+        with self.lock:
+            path = os.path.join(self.archive_dir, self.segment)
+            if os.path.exists(path) and os.path.getsize(path) >= self.segment_size:
+                self.segment = self.segment_name(int(self.segment[8:13]) + 1)
+                path = os.path.join(self.archive_dir, self.segment)
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(member)
+            self.index['url:' + url] = (self.segment, offset, len(member))
+
+    def link(self, article_id, url):
+        """
+        Associe un article à l'URL de sa page archivée.
+
+        Args:
+            article_id (str): L'identifiant de l'article.
+            url (str): L'URL de la page de l'article.
+        """
+        with self.lock:
+            self.index['id:' + article_id] = url
+
+    def location(self, url):
+        """
+        Retourne la position du dernier enregistrement d'une URL.
+
+        Args:
+            url (str): L'URL de la page ou du flux.
+
+        Returns:
+            tuple: (segment, décalage, longueur), ou None si l'URL n'est pas archivée.
+        """
+        return self.index.get('url:' + url)
+
+    def read(self, url):
+        """
+        Relit le contenu brut archivé d'une URL.
+
+        Args:
+            url (str): L'URL de la page ou du flux.
+
+        Returns:
+            bytes: Le contenu brut, ou None si l'URL n'est pas archivée.
+        """
+        location = self.location(url)
+        return read_record(self.archive_dir, location)[1] if location else None
+
+    def article_urls(self):
+        """
+        Retourne les articles dont la page est archivée.
+
+        Returns:
+            dict: {identifiant de l'article: URL de sa page}.
+        """
+        return {key[3:]: url for key, url in self.index.items() if key.startswith('id:')}
+
+    def close(self):
+        """
+        Ferme l'index de l'archive.
+        """
+        self.index.close()
+
+
+def read_record(archive_dir, location):
+    """
+    Lit et décompresse un enregistrement à partir de sa position, puis retourne son type et son contenu brut.
+
+    Args:
+        archive_dir (str): Répertoire des segments.
+        location (tuple): (segment, décalage, longueur) de l'enregistrement.
+
+    Returns:
+        tuple: (type du contenu, contenu brut de l'enregistrement sans les en-têtes WARC).
+    """
+    segment, offset, length = location
+    with open(os.path.join(archive_dir, segment), 'rb') as f:
+        f.seek(offset)
+        record = gzip.decompress(f.read(length))
+    headers, content = record.split(b'\r\n\r\n', 1)
+    content_type = 'text/html'
+    for line in headers.decode('utf-8').split('\r\n'):
+        name, _, value = line.partition(':')
+        if name.lower() == 'content-type':
+            content_type = value.strip()
+    return content_type, content[:-4]
+
+
+# Extracteur de chaque processus de réextraction
+_extractor = None
+
+
+def _init_worker():
+    global _extractor
+    _extractor = ContentExtractor()
+
+
+def _reextract_in_worker(archive_dir, article_id, url, location):
+    # Une page archivée sans encodage déclaré est décodée en UTF-8, comme à son extraction (voir content_charset)
+    content_type, content = read_record(archive_dir, location)
+    return article_id, _extractor.parse([content[:_extractor.max_bytes]], url, content_charset(content_type))
+
+
+def reextract(db_path, archive_dir='./items/archive', processes=None):
+    """
+    Reconstruit le champ 'Contenu' de tous les articles dont la page est archivée, sans aucun accès au réseau.
+
+    Les pages sont relues et analysées par un pool de processus avec la logique d'extraction actuelle de
+    ContentExtractor.
+
+    Args:
+        db_path (str): Chemin vers la base d'articles.
+        archive_dir (str): Répertoire de l'archive.
+        processes (int): Nombre de processus (par défaut, le nombre de cœurs).
+
+    Returns:
+        int: Le nombre d'articles réextraits.
+    """
+    archive = PageArchive(archive_dir, flag='r')
+    try:
+        jobs = [(archive_dir, article_id, url, archive.location(url))
+                for article_id, url in archive.article_urls().items() if archive.location(url)]
+    finally:
+        archive.close()
+
+    article_db = open_article_store(db_path, 'c')
+    reextracted = 0
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as executor:
+            for article_id, text in executor.map(_reextract_in_worker, *zip(*jobs), chunksize=16) if jobs else ():
+                if article_id not in article_db:
+                    continue
+                article = article_db[article_id]
+                article['Contenu'] = text
+                article_db[article_id] = article
+                reextracted += 1
+    finally:
+        article_db.close()
+    return reextracted
+
+
+def export_pages(archive_dir, output_dir):
+    """
+    Exporte les pages d'articles archivées en fichiers HTML, nommés d'après leur domaine, pour servir de pages de test
+    déterministes aux benchmarks (voir benchmarks/bench_html_extraction.py).
+
+    Args:
+        archive_dir (str): Répertoire de l'archive.
+        output_dir (str): Répertoire de destination.
+
+    Returns:
+        int: Le nombre de pages exportées.
+    """
+    archive = PageArchive(archive_dir, flag='r')
+    os.makedirs(output_dir, exist_ok=True)
+    exported = 0
+    try:
+        for article_id, url in archive.article_urls().items():
+            content = archive.read(url)
+            if content is None:
+                continue
+            with open(os.path.join(output_dir, f'{urlsplit(url).hostname}_{article_id}.html'), 'wb') as f:
+                f.write(content)
+            exported += 1
+    finally:
+        archive.close()
+    return exported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Réextrait le contenu des articles depuis l'archive des pages.")
+    parser.add_argument('action', choices=['reextract', 'export'],
+                        help="Reconstruire 'Contenu' depuis l'archive ou exporter les pages pour les benchmarks")
+    parser.add_argument('--db', default='./items/article_db', help="Base d'articles")
+    parser.add_argument('--archive', default='./items/archive', help="Répertoire de l'archive")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--output', default='./pages', help="Répertoire de destination de l'export")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.action == 'reextract':
+        count = reextract(args.db, args.archive, args.processes)
+        print(f"{count} articles réextraits depuis l'archive en {time.perf_counter() - start:.1f}s")
+    else:
+        count = export_pages(args.archive, args.output)
+        print(f"{count} pages exportées dans {args.output}")
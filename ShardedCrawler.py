@@ -0,0 +1,263 @@
+import argparse
+import bisect
+import hashlib
+import multiprocessing
+import os
+import time
+
+from DuplicateDetector import index_path_for
+from FeedScheduler import FeedScheduler
+from pipeline import Pipeline, PipelineConfig
+
+
+class HashRing:
+    """
+    Anneau de hachage cohérent : chaque clé (nom de flux) est attribuée au premier collecteur qui la suit sur l'anneau.
+
+    Chaque collecteur occupe `replicas` points de l'anneau, ce qui équilibre les parts. Ajouter ou retirer un collecteur
+    ne déplace que les flux de sa part : les autres collecteurs gardent leurs flux, et donc leur cache HTTP, leur
+    planification et les langues observées de chaque flux.
+    """
+
+    def __init__(self, nodes, replicas=128):
+        """
+        Initialise la classe HashRing.
+
+        Args:
+            nodes (iterable): Les noms des collecteurs.
+            replicas (int): Nombre de points de chaque collecteur sur l'anneau.
+        """
+        self.ring = sorted((self.hash(f'{node}#{replica}'), node) for node in nodes for replica in range(replicas))
+        self.points = [point for point, node in self.ring]
+
+    @staticmethod
+    def hash(key):
+        # Position d'une clé sur l'anneau, identique sur tous les hôtes (contrairement à hash())
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+    def node_for(self, key):
+        """
+        Retourne le collecteur d'une clé.
+
+        Args:
+            key (str): La clé (nom du flux).
+
+        Returns:
+            str: Le nom du collecteur.
+        """
+        position = bisect.bisect(self.points, self.hash(key)) % len(self.points)
+        return self.ring[position][1]
+
+
+def shard_feeds(rss_feeds, worker_names, replicas=128):
+    """
+    Répartit les flux entre les collecteurs par hachage cohérent de leur nom.
+
+    Args:
+        rss_feeds (dict): Un dictionnaire de flux RSS avec leurs URL et catégories.
+        worker_names (list): Les noms de tous les collecteurs, identiques sur tous les hôtes.
+        replicas (int): Nombre de points de chaque collecteur sur l'anneau.
+
+    Returns:
+        dict: {nom du collecteur: {nom du flux: informations du flux}}, avec une entrée (éventuellement vide) par
+        collecteur.
+    """
+    ring = HashRing(worker_names, replicas)
+    shards = {worker_name: {} for worker_name in worker_names}
+    for feed_name, feed_info in rss_feeds.items():
+        shards[ring.node_for(feed_name)][feed_name] = feed_info
+    return shards
+
+
+def crawl_shard(worker_name, worker_names, rss_feeds, db_path, state_dir='./items/workers',
+                archive_dir='./items/archive', daemon=False):
+    """
+    Collecte la part des flux d'un collecteur dans la base partagée.
+
+    L'état propre à chaque flux (cache HTTP, planification, langues observées) est rangé dans le répertoire du
+    collecteur. Les articles, leurs réservations et l'index des quasi-doublons sont partagés : l'index LSH est une base
+    SQLite à côté de la base d'articles (par exemple ./items/article_db_lsh.sqlite), si bien qu'une dépêche reprise par
+    des flux de parts différentes est reconnue comme doublon.
+
+    Args:
+        worker_name (str): Le nom de ce collecteur.
+        worker_names (list): Les noms de tous les collecteurs.
+        rss_feeds (dict): Tous les flux RSS, dont seule la part de ce collecteur est collectée.
+        db_path (str): Chemin vers la base SQLite partagée.
+        state_dir (str): Répertoire contenant un sous-répertoire d'état par collecteur.
+        archive_dir (str): Répertoire contenant une archive (voir PageArchive) par collecteur, ou None.
+        daemon (bool): Si True, tourne en continu avec FeedScheduler, sinon collecte chaque flux une fois.
+
+    Returns:
+        int: Le nombre d'articles stockés (0 en mode continu).
+    """
+    shard = shard_feeds(rss_feeds, worker_names)[worker_name]
+    if not shard:
+        print(f"{worker_name} : aucun flux attribué")
+        return 0
+    worker_dir = os.path.join(state_dir, worker_name)
+    os.makedirs(worker_dir, exist_ok=True)
+    config = PipelineConfig(
+        db_path=db_path,
+        archive_dir=os.path.join(archive_dir, worker_name) if archive_dir else None,
+        feed_cache_path=os.path.join(worker_dir, 'feed_cache'),
+        language_state_path=os.path.join(worker_dir, 'language_state'),
+        duplicates_index_path=index_path_for(db_path) + '.sqlite',
+        worker_name=worker_name
+    )
+    scraper = Pipeline(shard, config)
+    print(f"{worker_name} : {len(shard)} flux")
+    stored = 0
+    try:
+        if daemon:
+            scheduler = FeedScheduler(scraper, state_path=os.path.join(worker_dir, 'feed_schedule'))
+            try:
+                scheduler.run()
+            finally:
+                scheduler.close()
+        else:
+            stored = scraper.scrape_articles()
+    except KeyboardInterrupt:
+        print(f"Arrêt de {worker_name}")
+    finally:
+        scraper.metrics.write(os.path.join(worker_dir, 'metrics'))
+        scraper.close_database()
+    return stored
+
+
+class CrawlSupervisor:
+    """
+    Lance un processus par collecteur et relance ceux qui s'arrêtent anormalement.
+
+    Les collecteurs se coordonnent uniquement par la base SQLite partagée (voir SQLiteArticleStore.claim_many) : un
+    collecteur arrêté ne retarde que sa part. Ses articles réservés mais pas stockés sont libérés à sa fermeture, ou,
+    s'il s'est arrêté brutalement, repris dès sa relance (ou par un autre collecteur à l'expiration de la réservation).
+    Pour répartir la collecte sur plusieurs hôtes, chaque hôte lance son superviseur avec la même liste complète de
+    collecteurs et seulement les siens dans `local_workers`.
+    """
+
+    def __init__(self, rss_feeds, worker_names, db_path='./items/article_db.sqlite', local_workers=None,
+                 state_dir='./items/workers', archive_dir='./items/archive', daemon=False, max_restarts=5,
+                 restart_delay=10):
+        """
+        Initialise la classe CrawlSupervisor.
+
+        Args:
+            rss_feeds (dict): Un dictionnaire de flux RSS avec leurs URL et catégories.
+            worker_names (list): Les noms de tous les collecteurs.
+            db_path (str): Chemin vers la base SQLite partagée (.sqlite) : un shelve ne peut être écrit que par un
+                seul processus.
+            local_workers (list): Les collecteurs lancés par ce superviseur (tous par défaut).
+            state_dir (str): Répertoire contenant un sous-répertoire d'état par collecteur.
+            archive_dir (str): Répertoire contenant une archive par collecteur, ou None.
+            daemon (bool): Si True, les collecteurs tournent en continu.
+            max_restarts (int): Nombre maximal de relances d'un même collecteur.
+            restart_delay (float): Délai avant la relance d'un collecteur arrêté (secondes), doublé à chaque relance.
+
+        Raises:
+            ValueError: Si la base n'est pas une base SQLite ou si un collecteur local est inconnu.
+        """
+        if not db_path.endswith(('.sqlite', '.sqlite3')):
+            raise ValueError(f"La collecte répartie nécessite une base SQLite partagée (.sqlite) : {db_path}")
+        unknown = set(local_workers or ()) - set(worker_names)
+        if unknown:
+            raise ValueError(f"Collecteurs inconnus : {', '.join(sorted(unknown))}")
+        self.rss_feeds = rss_feeds
+        self.worker_names = list(worker_names)
+        self.local_workers = list(local_workers or worker_names)
+        self.db_path = db_path
+        self.state_dir = state_dir
+        self.archive_dir = archive_dir
+        self.daemon = daemon
+        self.max_restarts = max_restarts
+        self.restart_delay = restart_delay
+        self.processes = {}
+        self.restarts = {worker_name: 0 for worker_name in self.local_workers}
+        # Date de relance prévue de chaque collecteur arrêté
+        self.restart_at = {}
+
+    def start(self, worker_name):
+        """
+        Lance le processus d'un collecteur.
+
+        Args:
+            worker_name (str): Le nom du collecteur.
+
+        Returns:
+            multiprocessing.Process: Le processus lancé.
+        """
+        process = multiprocessing.Process(
+            target=crawl_shard, name=worker_name,
+            args=(worker_name, self.worker_names, self.rss_feeds, self.db_path, self.state_dir, self.archive_dir,
+                  self.daemon)
+        )
+        process.start()
+        self.processes[worker_name] = process
+        return process
+
+    def check(self):
+        """
+        Constate les collecteurs arrêtés et relance, après leur délai, ceux qui se sont arrêtés anormalement.
+
+        Returns:
+            bool: True tant qu'au moins un collecteur tourne ou attend sa relance.
+        """
+        now = time.time()
+        for worker_name, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            del self.processes[worker_name]
+            if process.exitcode == 0 and not self.daemon:
+                print(f"{worker_name} : part collectée")
+            elif self.restarts[worker_name] >= self.max_restarts:
+                print(f"{worker_name} : arrêté (code {process.exitcode}), abandonné après {self.max_restarts} relances")
+            else:
+                delay = self.restart_delay * 2 ** self.restarts[worker_name]
+                self.restarts[worker_name] += 1
+                self.restart_at[worker_name] = now + delay
+                print(f"{worker_name} : arrêté (code {process.exitcode}), relancé dans {delay:.0f}s")
+        for worker_name, restart_at in list(self.restart_at.items()):
+            if restart_at <= now:
+                del self.restart_at[worker_name]
+                self.start(worker_name)
+        return bool(self.processes or self.restart_at)
+
+    def run(self, poll_interval=1):
+        """
+        Lance les collecteurs locaux et les surveille jusqu'à ce que tous aient terminé leur part.
+
+        Args:
+            poll_interval (float): Intervalle entre deux vérifications des processus (secondes).
+
+        Returns:
+            dict: Le nombre de relances de chaque collecteur local.
+        """
+        for worker_name in self.local_workers:
+            self.start(worker_name)
+        try:
+            while self.check():
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            print("Arrêt des collecteurs")
+            for process in self.processes.values():
+                process.join()
+        return self.restarts
+
+
+if __name__ == "__main__":
+    from ArticleScraper import RSS_FEEDS
+
+    parser = argparse.ArgumentParser(description="Collecte les flux RSS avec plusieurs collecteurs partageant une "
+                                                 "base SQLite, chacun responsable d'une part des flux.")
+    parser.add_argument('--workers', type=int, default=4, help="Nombre de collecteurs (noms worker-0, worker-1...)")
+    parser.add_argument('--names', help="Noms de tous les collecteurs, séparés par des virgules (remplace --workers)")
+    parser.add_argument('--local', nargs='+',
+                        help="Collecteurs lancés sur cet hôte (tous par défaut), pour répartir la collecte entre hôtes")
+    parser.add_argument('--db', default='./items/article_db.sqlite', help="Base SQLite partagée")
+    parser.add_argument('--daemon', action='store_true', help="Tourne en continu (voir FeedScheduler)")
+    args = parser.parse_args()
+
+    worker_names = args.names.split(',') if args.names else [f'worker-{number}' for number in range(args.workers)]
+    supervisor = CrawlSupervisor(RSS_FEEDS, worker_names, args.db, local_workers=args.local, daemon=args.daemon)
+    restarts = supervisor.run()
+    print(f"Collecte terminée, {sum(restarts.values())} relances")
@@ -0,0 +1,145 @@
+import hashlib
+import re
+from collections import OrderedDict
+from multiprocessing import Pool
+
+import snowballstemmer
+from stop_words import get_stop_words
+
+# Expressions régulières compilées une seule fois
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+NUMBERS_PATTERN = re.compile(r'\d+')
+
+# À incrémenter à chaque modification de `normalize` qui change son résultat : les racines conservées par TokenCache
+# sous l'ancienne version ne sont alors plus lues
+NORMALIZER_VERSION = 1
+
+
+class TextNormalizer:
+    """
+    Pipeline de normalisation de texte : suppression de la ponctuation et des chiffres, mise en minuscules, filtrage
+    des stop words et stemming Snowball.
+
+    Le résultat est identique à celui de `dictionaryCreator.process_articles`, mais les stop words sont consultés dans
+    un ensemble, chaque mot distinct d'un texte n'est traité qu'une fois, les mots absents du cache sont stemmés en un
+    seul appel à `stemWords`, et les racines sont conservées dans un cache LRU borné (le vocabulaire de presse est très
+    concentré sur quelques milliers de mots).
+    """
+
+    def __init__(self, stopwords, stemmer, cache_size=200000):
+        """
+        Initialise la classe TextNormalizer.
+
+        Args:
+            stopwords (iterable): Les stop words de la langue.
+            stemmer (snowballstemmer.Stemmer): Le stemmer Snowball de la langue.
+            cache_size (int): Nombre maximal de mots conservés dans le cache mot -> racine.
+        """
+        self.stopwords = frozenset(stopwords)
+        self.stemmer = stemmer
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.version = self.pipeline_version()
+
+    def pipeline_version(self):
+        """
+        Calcule l'empreinte du pipeline : version de `normalize`, expressions régulières, stemmer et stop words.
+
+        Returns:
+            str: L'empreinte, identique pour deux pipelines qui produisent les mêmes racines.
+        """
+        description = '\n'.join([str(NORMALIZER_VERSION), PUNCTUATION_PATTERN.pattern, NUMBERS_PATTERN.pattern,
+                                 type(self.stemmer).__name__] + sorted(self.stopwords))
+        return hashlib.sha1(description.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def for_language(cls, language, cache_size=200000):
+        """
+        Crée un TextNormalizer avec les stop words et le stemmer Snowball d'une langue.
+
+        Args:
+            language (str): Le nom de la langue ('french' ou 'english').
+            cache_size (int): Nombre maximal de mots conservés dans le cache mot -> racine.
+
+        Returns:
+            TextNormalizer: Le pipeline de la langue.
+        """
+        return cls(get_stop_words(language), snowballstemmer.stemmer(language), cache_size)
+
+    def _stems(self, words):
+        """
+        Retourne la racine de chaque mot distinct, ou None pour les stop words, en passant par le cache.
+
+        Args:
+            words (set): Les mots distincts d'un texte.
+
+        Returns:
+            dict: {mot: racine ou None}.
+        """
+        stems = {}
+        misses = []
+        for word in words:
+            if word in self.cache:
+                self.cache.move_to_end(word)
+                stems[word] = self.cache[word]
+            elif word.lower() in self.stopwords:
+                stems[word] = None
+            else:
+                misses.append(word)
+
+        if misses:
+            for word, stem in zip(misses, self.stemmer.stemWords(misses)):
+                stems[word] = stem
+                self.cache[word] = stem
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return stems
+
+    def normalize(self, text):
+        """
+        Normalise un texte.
+
+        Args:
+            text (str): Le texte brut.
+
+        Returns:
+            list: Les racines des mots du texte, dans l'ordre, sans les stop words.
+        """
+        # Supprime la ponctuation, met en minuscules et supprime les chiffres
+        text = NUMBERS_PATTERN.sub('', PUNCTUATION_PATTERN.sub('', text).lower())
+        words = text.split()
+        stems = self._stems(set(words))
+        return [stems[word] for word in words if stems[word] is not None]
+
+    def normalize_many(self, texts, processes=1, chunksize=64):
+        """
+        Normalise une liste de textes, éventuellement en répartissant les textes sur plusieurs processus.
+
+        Chaque processus a son propre cache : le mode multiprocessus n'est rentable que sur de gros corpus, lorsque le
+        stemming domine le coût de transfert des textes.
+
+        Args:
+            texts (list): Les textes bruts.
+            processes (int): Nombre de processus. Avec 1, les textes sont traités dans le processus courant.
+            chunksize (int): Nombre de textes envoyés à la fois à chaque processus.
+
+        Returns:
+            list: Pour chaque texte, la liste de ses racines, dans l'ordre d'entrée.
+        """
+        if processes <= 1:
+            return [self.normalize(text) for text in texts]
+        with Pool(processes, initializer=_init_worker, initargs=(self.stopwords, self.stemmer, self.cache_size)) as pool:
+            return pool.map(_normalize_in_worker, texts, chunksize=chunksize)
+
+
+# Pipeline propre à chaque processus du mode multiprocessus
+_worker_normalizer = None
+
+
+def _init_worker(stopwords, stemmer, cache_size):
+    global _worker_normalizer
+    _worker_normalizer = TextNormalizer(stopwords, stemmer, cache_size)
+
+
+def _normalize_in_worker(text):
+    return _worker_normalizer.normalize(text)
@@ -0,0 +1,123 @@
+import hashlib
+import shelve
+
+# Champs normalisés de chaque article, dans l'ordre où `dictionaryCreator.process_articles` les combine
+FIELDS = ('Titre', 'Description / Résumé', 'Contenu')
+
+
+class TokenCache:
+    """
+    Cache persistant des racines de chaque article, pour que chaque article ne soit normalisé (ponctuation, stop words,
+    stemming) qu'une seule fois par tous les traitements : dictionnaire, jeux de données et index de recherche.
+
+    Les racines sont conservées champ par champ sous la clé '<empreinte du pipeline>:<identifiant>' : un autre
+    pipeline (autre langue, stop words ou version de TextNormalizer) ne lit jamais les racines d'un autre. Chaque
+    entrée porte aussi l'empreinte du texte de l'article, pour qu'un article dont le contenu a été extrait à nouveau
+    soit normalisé à nouveau.
+    """
+
+    def __init__(self, cache_path='./items/token_cache', flag='c'):
+        """
+        Initialise la classe TokenCache.
+
+        Args:
+            cache_path (str): Chemin vers la base de données shelve du cache.
+            flag (str): Mode d'ouverture du shelve ('c' pour lire et écrire, 'r' pour seulement lire).
+        """
+        self.cache_db = shelve.open(cache_path, flag)
+        self.writable = flag != 'r'
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_hash(article):
+        """
+        Calcule l'empreinte des champs normalisés d'un article.
+
+        Args:
+            article (dict): L'article.
+
+        Returns:
+            str: L'empreinte BLAKE2b des champs.
+        """
+        text = '\x1f'.join(article.get(field, '') for field in FIELDS)
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+    def fields_many(self, articles, normalizer, processes=1):
+        """
+        Retourne les racines de chaque champ d'une série d'articles, en ne normalisant que les articles absents du
+        cache.
+
+        Args:
+            articles (iterable): Les couples (identifiant, article).
+            normalizer (TextNormalizer): Le pipeline de normalisation de la langue des articles.
+            processes (int): Nombre de processus utilisés pour normaliser les articles absents du cache.
+
+        Returns:
+            list: Pour chaque article, dans l'ordre, un tuple des racines de chaque champ de FIELDS, séparées par des
+            espaces.
+        """
+        results = []
+        missing = []
+        texts = []
+        for article_id, article in articles:
+            key = f'{normalizer.version}:{article_id}'
+            digest = self.content_hash(article)
+            cached = self.cache_db.get(key)
+            if cached is not None and cached[0] == digest:
+                results.append(cached[1])
+                continue
+            missing.append((len(results), key, digest))
+            results.append(None)
+            texts.extend(article.get(field, '') for field in FIELDS)
+
+        self.hits += len(results) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            stemmed_texts = normalizer.normalize_many(texts, processes)
+            for number, (index, key, digest) in enumerate(missing):
+                fields = tuple(' '.join(stemmed_words) for stemmed_words in
+                               stemmed_texts[number * len(FIELDS):(number + 1) * len(FIELDS)])
+                results[index] = fields
+                if self.writable:
+                    self.cache_db[key] = (digest, fields)
+        return results
+
+    def fields(self, article_id, article, normalizer):
+        """
+        Retourne les racines de chaque champ d'un article.
+
+        Args:
+            article_id (str): L'identifiant de l'article.
+            article (dict): L'article.
+            normalizer (TextNormalizer): Le pipeline de normalisation de la langue de l'article.
+
+        Returns:
+            dict: {champ: liste des racines} pour chaque champ de FIELDS.
+        """
+        stems = self.fields_many([(article_id, article)], normalizer)[0]
+        return {field: field_stems.split() for field, field_stems in zip(FIELDS, stems)}
+
+    def processed_texts(self, articles, normalizer, processes=1):
+        """
+        Retourne le texte traité de chaque article, identique à celui de `dictionaryCreator.process_articles`.
+
+        Args:
+            articles (iterable): Les couples (identifiant, article).
+            normalizer (TextNormalizer): Le pipeline de normalisation de la langue des articles.
+            processes (int): Nombre de processus utilisés pour normaliser les articles absents du cache.
+
+        Returns:
+            list: Les racines de tous les champs de chaque article, séparées par des espaces.
+        """
+        return [' '.join(field_stems for field_stems in stems if field_stems)
+                for stems in self.fields_many(articles, normalizer, processes)]
+
+    def close(self):
+        """
+        Ferme le cache.
+
+        Returns:
+            None
+        """
+        self.cache_db.close()
@@ -0,0 +1,79 @@
+"""
+Benchmark du chargement des dictionnaires : matrice et vocabulaire picklés (dico/*.joblib) contre FeatureStore (tableaux
+plats ouverts en mémoire partagée).
+
+Mesure l'ouverture, la lecture de quelques lignes par identifiant d'article et le calcul des occurrences de mots. Les
+matrices livrées dans dico/ n'ont pas d'identifiants d'articles : des identifiants factices sont écrits dans un
+FeatureStore temporaire.
+
+Usage :
+    python benchmarks/bench_feature_store.py --language french --rows 100
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import joblib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from FeatureStore import FeatureStore  # noqa: E402
+from corpus_stats import word_occurrences  # noqa: E402
+
+DICO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dico')
+
+
+def timed(function, repeat):
+    # Retourne (résultat, durée moyenne en millisecondes)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--language', choices=['french', 'english'], default='french')
+    parser.add_argument('--rows', type=int, default=100, help="Nombre de lignes lues par identifiant d'article")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    filename_feature = os.path.join(DICO_DIR, f'feature_names_{args.language}.joblib')
+    filename_matrix = os.path.join(DICO_DIR, f'sparse_matrix_{args.language}.joblib')
+
+    def load_joblib():
+        return joblib.load(filename_feature), joblib.load(filename_matrix).tocsr()
+
+    (feature_names, sparse_matrix), joblib_load = timed(load_joblib, args.repeat)
+    article_ids = [f'article{row:08d}' for row in range(sparse_matrix.shape[0])]
+    wanted = random.Random(42).sample(range(len(article_ids)), min(args.rows, len(article_ids)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store_dir = os.path.join(directory, args.language)
+        FeatureStore.save(store_dir, feature_names, sparse_matrix, article_ids)
+        store, store_open = timed(lambda: FeatureStore(store_dir), args.repeat)
+
+        manifest = {article_id: row for row, article_id in enumerate(article_ids)}
+        _, joblib_rows = timed(lambda: load_joblib()[1][[manifest[article_ids[row]] for row in wanted]], args.repeat)
+        rows, store_rows = timed(lambda: FeatureStore(store_dir).rows([article_ids[row] for row in wanted]),
+                                 args.repeat)
+        if (rows != sparse_matrix[wanted]).nnz:
+            print("ERREUR : les lignes lues dans le FeatureStore diffèrent de la matrice joblib")
+            return
+
+        _, joblib_occurrences = timed(lambda: word_occurrences(*load_joblib()), 1)
+        _, store_occurrences = timed(lambda: word_occurrences(store.feature_names, FeatureStore(store_dir).matrix), 1)
+
+    print(f"Matrice {args.language} : {sparse_matrix.shape[0]} documents x {sparse_matrix.shape[1]} termes, "
+          f"{sparse_matrix.nnz} valeurs non nulles")
+    print(f"{'Ouverture':<28} joblib : {joblib_load:9.2f} ms | FeatureStore : {store_open:9.2f} ms")
+    print(f"{f'Lecture de {len(wanted)} lignes':<28} joblib : {joblib_rows:9.2f} ms | "
+          f"FeatureStore : {store_rows:9.2f} ms")
+    print(f"{'Occurrences des mots':<28} joblib : {joblib_occurrences:9.2f} ms | "
+          f"FeatureStore : {store_occurrences:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
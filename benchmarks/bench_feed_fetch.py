@@ -0,0 +1,85 @@
+"""
+Benchmark du téléchargement des flux RSS : séquentiel (feedparser.parse URL par URL) contre FeedFetcher (parallèle).
+
+Un serveur HTTP local simule des éditeurs lents : chaque flux est servi après un délai fixe. Les flux sont répartis sur
+plusieurs adresses de loopback (127.0.0.1, 127.0.0.2, ...) pour que la limite par hôte s'applique comme en production.
+
+Usage :
+    python benchmarks/bench_feed_fetch.py --feeds 80 --delay 0.2 --hosts 8
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import feedparser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from FeedFetcher import FeedFetcher  # noqa: E402
+
+FEED_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Flux {name}</title>
+{items}
+</channel></rss>"""
+
+ITEM_TEMPLATE = """<item><title>Article {i} du flux {name}</title><link>http://example.com/{name}/{i}</link>
+<description>Résumé de l'article {i}</description></item>"""
+
+
+def make_handler(delay, items_per_feed):
+    class StubFeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            name = self.path.strip('/')
+            items = "\n".join(ITEM_TEMPLATE.format(i=i, name=name) for i in range(items_per_feed))
+            body = FEED_TEMPLATE.format(name=name, items=items).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubFeedHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--feeds', type=int, default=80, help="Nombre de flux simulés")
+    parser.add_argument('--delay', type=float, default=0.2, help="Latence simulée de chaque flux (secondes)")
+    parser.add_argument('--hosts', type=int, default=8, help="Nombre d'hôtes distincts (127.0.0.1 à 127.0.0.N)")
+    parser.add_argument('--items', type=int, default=20, help="Nombre d'entrées par flux")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('0.0.0.0', 0), make_handler(args.delay, args.items))
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    rss_feeds = {
+        f'feed{i}': {'url': f'http://127.0.0.{i % args.hosts + 1}:{port}/feed{i}', 'categorie': 'BENCHMARK'}
+        for i in range(args.feeds)
+    }
+
+    start = time.perf_counter()
+    serial_entries = sum(len(feedparser.parse(feed_info['url']).entries) for feed_info in rss_feeds.values())
+    serial_time = time.perf_counter() - start
+
+    fetcher = FeedFetcher()
+    start = time.perf_counter()
+    concurrent_entries = sum(len(d.entries) for _, _, d, _ in fetcher.fetch_all(rss_feeds))
+    concurrent_time = time.perf_counter() - start
+    fetcher.close()
+    server.shutdown()
+
+    print(f"Flux : {args.feeds}, latence simulée : {args.delay}s, hôtes : {args.hosts}")
+    print(f"Séquentiel : {serial_time:.2f}s ({serial_entries} entrées)")
+    print(f"Parallèle  : {concurrent_time:.2f}s ({concurrent_entries} entrées)")
+    print(f"Accélération : x{serial_time / concurrent_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
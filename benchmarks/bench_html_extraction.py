@@ -0,0 +1,127 @@
+"""
+Benchmark de l'extraction du contenu des pages d'articles : analyse complète par BeautifulSoup (html.parser, puis
+find_all("p")) contre l'analyse en flux de ContentExtractor (ParagraphParser, arrêt à la fin de l'article). Affiche,
+pour chaque méthode, les octets réellement lus, le débit en Mo/s rapporté à ces octets et à la taille des pages, la
+taille du texte extrait et le pic mémoire. Les durées sont mesurées sans tracemalloc, le pic mémoire dans une passe
+séparée.
+
+Les pages sont lues dans un répertoire de pages sauvegardées, nommées d'après leur domaine pour appliquer la règle de
+site (par exemple www.lemonde.fr_article1.html). Sans répertoire, des pages synthétiques imitant une page d'actualité
+(scripts en ligne volumineux, publicités, corps de l'article puis commentaires) sont générées.
+
+Usage :
+    python benchmarks/bench_html_extraction.py --fixtures ./pages --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from ContentExtractor import ContentExtractor, SITE_RULES  # noqa: E402
+
+
+def synthetic_page(rng, domain):
+    # Page d'actualité synthétique construite autour du conteneur de la règle du site
+    tag, attribute, fragment = SITE_RULES[domain]
+    opening = f'<{tag} {attribute}="{fragment} main">' if attribute else f'<{tag}>'
+    words = [f'mot{i}' for i in range(3000)]
+
+    def paragraph():
+        return '<p>' + ' '.join(rng.choices(words, k=rng.randint(40, 120))) + ' <a href="#">lien</a>.</p>'
+
+    script = '<script>var data = ' + '{"k": "' + 'x' * 200000 + '"};</script>'
+    ads = ''.join(f'<div class="ad"><p>Publicité {i}</p></div>' for i in range(50))
+    body = ''.join(paragraph() for _ in range(rng.randint(10, 30)))
+    comments = ''.join(f'<div class="comment">{paragraph()}</div>' for _ in range(200))
+    return (f'<html><head><style>p {{ color: black; }}</style>{script}</head><body>{ads}{opening}{body}</{tag}>'
+            f'{script}{comments}</body></html>').encode('utf-8')
+
+
+def load_fixtures(directory, synthetic_pages):
+    if directory:
+        fixtures = []
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(('.html', '.htm')):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    fixtures.append((f"https://{name.split('_')[0]}/", f.read()))
+        return fixtures
+    rng = random.Random(42)
+    domains = list(SITE_RULES)
+    return [(f'https://www.{domains[i % len(domains)]}/', synthetic_page(rng, domains[i % len(domains)]))
+            for i in range(synthetic_pages)]
+
+
+def beautifulsoup_extract(url, html):
+    # Méthode d'origine de ContentExtractor.extract : la page est toujours lue entière
+    soup = BeautifulSoup(html.decode('utf-8', errors='replace'), "html.parser")
+    return " ".join([p.get_text().replace('\n', ' ').replace('\t', ' ') for p in soup.find_all("p")]), len(html)
+
+
+def streaming_extract(extractor, url, html):
+    # Retourne le texte et le nombre d'octets consommés par l'analyse, qui s'arrête à la fin de l'article
+    consumed = 0
+
+    def chunks():
+        nonlocal consumed
+        for i in range(0, len(html), extractor.chunk_size):
+            chunk = html[i:i + extractor.chunk_size]
+            consumed += len(chunk)
+            yield chunk
+
+    text = extractor.parse(chunks(), url)
+    return text, min(consumed, extractor.max_bytes)
+
+
+def run(function, fixtures):
+    # Retourne (octets consommés, caractères extraits) sur une passe
+    consumed = characters = 0
+    for url, html in fixtures:
+        text, read = function(url, html)
+        consumed += read
+        characters += len(text)
+    return consumed, characters
+
+
+def measure(function, fixtures, repeat):
+    # Retourne (durée totale, pic mémoire en Mo, octets consommés, caractères extraits) ; le pic mémoire est mesuré
+    # dans une passe séparée pour ne pas fausser les durées
+    start = time.perf_counter()
+    for _ in range(repeat):
+        consumed, characters = run(function, fixtures)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run(function, fixtures)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, consumed, characters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', help="Répertoire des pages HTML sauvegardées")
+    parser.add_argument('--synthetic-pages', type=int, default=18, help="Nombre de pages générées sans --fixtures")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures, args.synthetic_pages)
+    size = sum(len(html) for url, html in fixtures) / 2 ** 20
+    print(f"{len(fixtures)} pages, {size:.1f} Mo")
+
+    extractor = ContentExtractor()
+    for name, function in (('BeautifulSoup', beautifulsoup_extract),
+                           ('ParagraphParser', lambda url, html: streaming_extract(extractor, url, html))):
+        elapsed, peak, consumed, characters = measure(function, fixtures, args.repeat)
+        consumed /= 2 ** 20
+        print(f"{name:<16} {consumed:6.1f} Mo lus  {consumed * args.repeat / elapsed:8.1f} Mo/s lus  "
+              f"{size * args.repeat / elapsed:8.1f} Mo/s de pages  pic mémoire {peak:7.1f} Mo  "
+              f"{characters} caractères extraits")
+    extractor.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark du temps CPU passé à identifier la langue des entrées pendant une série de collectes : chemin d'origine
+(langdetect.detect sur chaque titre, y compris les entrées déjà en base) contre dédoublonnage préalable et
+LanguageIdentifier (cache et langue habituelle de chaque flux).
+
+Les flux sont synthétiques : chaque flux publie dans une seule langue et, à chaque collecte, seule une partie de ses
+entrées est nouvelle, comme un vrai flux RSS.
+
+Usage :
+    python benchmarks/bench_language_detection.py --feeds 20 --entries 30 --cycles 5 --new-ratio 0.2
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from langdetect import detect
+from stop_words import get_stop_words
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from LanguageIdentifier import LanguageIdentifier  # noqa: E402
+
+WORDS = {
+    'fr': ['gouvernement', 'réforme', 'président', 'élection', 'économie', 'marché', 'ministre', 'projet', 'annonce',
+           'nouvelle', 'semaine', 'pays', 'monde', 'santé', 'école', 'entreprise', 'emploi', 'justice', 'culture',
+           'équipe', 'match', 'victoire', 'saison', 'recherche', 'découverte'],
+    'en': ['government', 'reform', 'president', 'election', 'economy', 'market', 'minister', 'project', 'announces',
+           'new', 'week', 'country', 'world', 'health', 'school', 'company', 'jobs', 'justice', 'culture', 'team',
+           'match', 'victory', 'season', 'research', 'discovery']
+}
+STOP_WORDS = {'fr': get_stop_words('french')[:40], 'en': get_stop_words('english')[:40]}
+
+
+def make_title(rng, language):
+    words = rng.choices(WORDS[language], k=6) + rng.choices(STOP_WORDS[language], k=4)
+    rng.shuffle(words)
+    return ' '.join(words)
+
+
+def simulate_cycles(feeds, entries, cycles, new_ratio):
+    # Retourne, pour chaque collecte, la liste (URL du flux, titres des entrées du flux)
+    rng = random.Random(42)
+    languages = {f'https://example.com/feed{i}': 'fr' if i % 2 else 'en' for i in range(feeds)}
+    current = {url: [make_title(rng, language) for _ in range(entries)] for url, language in languages.items()}
+    result = []
+    for _ in range(cycles):
+        result.append([(url, list(titles)) for url, titles in current.items()])
+        new_entries = int(entries * new_ratio)
+        for url, titles in current.items():
+            current[url] = [make_title(rng, languages[url]) for _ in range(new_entries)] + titles[:entries - new_entries]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--feeds', type=int, default=20)
+    parser.add_argument('--entries', type=int, default=30, help="Entrées par flux")
+    parser.add_argument('--cycles', type=int, default=5, help="Nombre de collectes simulées")
+    parser.add_argument('--new-ratio', type=float, default=0.2, help="Part des entrées nouvelles à chaque collecte")
+    args = parser.parse_args()
+
+    cycles = simulate_cycles(args.feeds, args.entries, args.cycles, args.new_ratio)
+
+    # Chemin d'origine : détection de chaque titre avant le dédoublonnage
+    legacy_times = []
+    for feeds in cycles:
+        start = time.process_time()
+        for url, titles in feeds:
+            for title in titles:
+                detect(title)
+        legacy_times.append(time.process_time() - start)
+
+    # Nouveau chemin : dédoublonnage puis identification par lot
+    identifier_times = []
+    detected = 0
+    with tempfile.TemporaryDirectory() as directory:
+        identifier = LanguageIdentifier(os.path.join(directory, 'language_state'))
+        seen = set()
+        for feeds in cycles:
+            start = time.process_time()
+            for url, titles in feeds:
+                new_titles = [title for title in titles if title not in seen]
+                seen.update(new_titles)
+                if identifier.feed_prior(url) is None:
+                    detected += len(new_titles)
+                identifier.identify_many(new_titles, url, new_titles)
+            identifier_times.append(time.process_time() - start)
+        identifier.close()
+
+    print(f"{args.feeds} flux x {args.entries} entrées, {args.cycles} collectes, "
+          f"{args.new_ratio:.0%} d'entrées nouvelles par collecte ({detected} titres réellement analysés)")
+    for cycle, (legacy, identifier_time) in enumerate(zip(legacy_times, identifier_times)):
+        print(f"Collecte {cycle + 1} : d'origine {legacy * 1000:8.1f} ms CPU | "
+              f"LanguageIdentifier {identifier_time * 1000:8.1f} ms CPU")
+    print(f"Total : d'origine {sum(legacy_times):.3f}s | LanguageIdentifier {sum(identifier_times):.3f}s "
+          f"({sum(legacy_times) / max(sum(identifier_times), 1e-9):.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de la collecte répartie : débit (articles stockés par seconde) selon le nombre de collecteurs partageant une
+base SQLite (voir ShardedCrawler).
+
+Un serveur HTTP local simule des éditeurs lents : chaque flux et chaque page d'article sont servis après un délai fixe.
+Chaque mesure part d'une base et d'un état vides, et vérifie qu'aucun article n'est stocké deux fois alors que chaque
+entrée est publiée par deux flux, attribués le plus souvent à deux collecteurs différents.
+
+Usage :
+    python benchmarks/bench_sharded_crawl.py --feeds 32 --items 20 --delay 0.05 --workers 1 2 4
+"""
+import argparse
+import contextlib
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from ShardedCrawler import CrawlSupervisor  # noqa: E402
+
+FEED_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Flux {name}</title>
+{items}
+</channel></rss>"""
+
+ITEM_TEMPLATE = """<item><title>Scientists report new findings about the climate of distant planets, study {i}</title>
+<link>http://{host}/page/{i}</link>
+<description>The research team published the results of study {i}</description></item>"""
+
+PAGE_TEMPLATE = """<html><body><article><p>The research team published the results of study {i}. The findings describe
+the atmosphere and the climate of several distant planets.</p></article></body></html>"""
+
+
+def make_handler(delay, items_per_feed, feeds):
+    class StubPublisherHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            host = self.headers.get('Host')
+            if self.path.startswith('/page/'):
+                body = PAGE_TEMPLATE.format(i=self.path.rsplit('/', 1)[1])
+            else:
+                # Chaque entrée est publiée par deux flux consécutifs : le flux n reprend la moitié du flux n - 1
+                number = int(self.path.strip('/')[len('feed'):])
+                half = max(items_per_feed // 2, 1)
+                entries = [i for i in range(half * feeds) if i // half in (number, (number - 1) % feeds)]
+                items = "\n".join(ITEM_TEMPLATE.format(i=i, host=host) for i in entries)
+                body = FEED_TEMPLATE.format(name=self.path.strip('/'), items=items)
+            body = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html' if self.path.startswith('/page/') else 'application/rss+xml')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubPublisherHandler
+
+
+def crawl(rss_feeds, worker_count):
+    # Retourne (durée, articles stockés, identifiants distincts) d'une collecte complète avec worker_count collecteurs
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'articles.sqlite')
+        supervisor = CrawlSupervisor(rss_feeds, [f'worker-{number}' for number in range(worker_count)], db_path,
+                                     state_dir=os.path.join(directory, 'workers'), archive_dir=None)
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            supervisor.run(poll_interval=0.05)
+        elapsed = time.perf_counter() - start
+        connection = sqlite3.connect(db_path)
+        stored, distinct = connection.execute('SELECT COUNT(*), COUNT(DISTINCT article_id) FROM articles').fetchone()
+        connection.close()
+    return elapsed, stored, distinct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--feeds', type=int, default=32, help="Nombre de flux simulés")
+    parser.add_argument('--items', type=int, default=20, help="Nombre d'entrées par flux")
+    parser.add_argument('--delay', type=float, default=0.05, help="Latence simulée de chaque requête (secondes)")
+    parser.add_argument('--hosts', type=int, default=8, help="Nombre d'hôtes distincts (127.0.0.1 à 127.0.0.N)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help="Nombres de collecteurs mesurés")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('0.0.0.0', 0), make_handler(args.delay, args.items, args.feeds))
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    rss_feeds = {
+        f'feed{i}': {'url': f'http://127.0.0.{i % args.hosts + 1}:{port}/feed{i}', 'categorie': 'BENCHMARK'}
+        for i in range(args.feeds)
+    }
+
+    print(f"Flux : {args.feeds}, entrées par flux : {args.items}, latence simulée : {args.delay}s, "
+          f"processeurs : {os.cpu_count()}")
+    reference = None
+    for worker_count in args.workers:
+        elapsed, stored, distinct = crawl(rss_feeds, worker_count)
+        throughput = stored / elapsed
+        reference = reference or throughput / worker_count
+        print(f"{worker_count:>2} collecteurs : {elapsed:6.2f}s, {stored} articles ({distinct} distincts), "
+              f"{throughput:7.1f} articles/s, efficacité {throughput / (reference * worker_count):.0%}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark mémoire / temps de l'entraînement des classifieurs : chemin dense des notebooks (DictVectorizer(sparse=False)
+sur des dictionnaires de mots) contre chemin creux (matrice CSR de dictionaryCreator passée telle quelle).
+
+Les matrices livrées dans dico/ n'ont pas d'étiquettes : des catégories pseudo-aléatoires (graine fixe) sont utilisées,
+ce qui suffit à mesurer le coût d'entraînement.
+
+Usage :
+    python benchmarks/bench_sparse_vs_dense.py --language french --classifiers LogReg RF
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction import DictVectorizer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from training_pipeline import CLASSIFIERS, make_classifier, weight_matrix  # noqa: E402
+
+DICO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dico')
+
+
+def measure(function):
+    # Exécute la fonction et retourne (résultat, durée en secondes, pic mémoire en Mo)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def dense_features(feature_names, sparse_matrix):
+    # Reproduit le chemin des notebooks : un dictionnaire {mot: valeur} par document puis DictVectorizer dense
+    rows = []
+    for row in range(sparse_matrix.shape[0]):
+        start, end = sparse_matrix.indptr[row], sparse_matrix.indptr[row + 1]
+        rows.append(dict(zip(feature_names[sparse_matrix.indices[start:end]], sparse_matrix.data[start:end])))
+    return DictVectorizer(sparse=False).fit_transform(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--language', choices=['french', 'english'], default='french')
+    parser.add_argument('--classifiers', nargs='+', choices=list(CLASSIFIERS), default=['LogReg', 'RF'])
+    parser.add_argument('--mode', choices=['count', 'tfidf'], default='count', help="Pondération de la matrice creuse")
+    parser.add_argument('--categories', type=int, default=6, help="Nombre de catégories pseudo-aléatoires")
+    args = parser.parse_args()
+
+    feature_names = np.asarray(joblib.load(os.path.join(DICO_DIR, f'feature_names_{args.language}.joblib')))
+    sparse_matrix = joblib.load(os.path.join(DICO_DIR, f'sparse_matrix_{args.language}.joblib')).tocsr()
+    labels = np.random.default_rng(42).integers(0, args.categories, sparse_matrix.shape[0])
+    print(f"Matrice {args.language} : {sparse_matrix.shape[0]} documents x {sparse_matrix.shape[1]} termes, "
+          f"{sparse_matrix.nnz} valeurs non nulles")
+
+    dense, dense_time, dense_peak = measure(lambda: dense_features(feature_names, sparse_matrix))
+    sparse, sparse_time, sparse_peak = measure(lambda: weight_matrix(sparse_matrix, args.mode))
+    print(f"{'Caractéristiques':<22} dense : {dense_time:7.3f}s {dense_peak:9.1f} Mo | "
+          f"creux : {sparse_time:7.3f}s {sparse_peak:9.1f} Mo")
+
+    for name in args.classifiers:
+        _, dense_fit, dense_fit_peak = measure(lambda: CLASSIFIERS[name]().fit(dense, labels))
+        _, sparse_fit, sparse_fit_peak = measure(lambda: make_classifier(name).fit(sparse, labels))
+        print(f"{'Entraînement ' + name:<22} dense : {dense_fit:7.3f}s {dense_fit_peak:9.1f} Mo | "
+              f"creux : {sparse_fit:7.3f}s {sparse_fit_peak:9.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark de la normalisation de texte : pipeline historique de process_articles contre TextNormalizer
+(un processus, puis plusieurs). Vérifie que les trois produisent exactement les mêmes racines et affiche le débit en
+tokens par seconde.
+
+Usage :
+    python benchmarks/bench_text_normalizer.py --db ./items/article_db --language fr --processes 4
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+import snowballstemmer
+from stop_words import get_stop_words
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from ArticleStore import open_article_store  # noqa: E402
+from TextNormalizer import TextNormalizer  # noqa: E402
+
+LANGUAGES = {'fr': 'french', 'en': 'english'}
+
+
+def legacy_process(text, stopwords, stemmer):
+    # Pipeline d'origine de dictionaryCreator.process_articles
+    text_without_punctuation = re.sub(r'[^\w\s]', '', text)
+    text_lower = text_without_punctuation.lower()
+    text_without_numbers = re.sub(r'\d+', '', text_lower)
+    words = text_without_numbers.split()
+    filtered_words = [word for word in words if word.lower() not in stopwords]
+    return [stemmer.stemWord(word) for word in filtered_words]
+
+
+def load_texts(db_path, language, synthetic_articles):
+    if os.path.exists(db_path) or os.path.exists(db_path + '.db') or os.path.exists(db_path + '.dat'):
+        article_db = open_article_store(db_path, 'r')
+        texts = [
+            f"{article.get('Titre', '')} {article.get('Description / Résumé', '')} {article.get('Contenu', '')}"
+            for article_id, article in article_db.items() if article.get('Langue', '').lower() == language
+        ]
+        article_db.close()
+        if texts:
+            return texts, f"base {db_path}"
+
+    # Corpus synthétique à distribution de Zipf à partir des stop words et de mots courants
+    random.seed(42)
+    vocabulary = [f"mot{i}ation" for i in range(20000)] + get_stop_words(LANGUAGES[language])
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    texts = [
+        ' '.join(random.choices(vocabulary, weights, k=400)) + ", 2023 ! L'article n°12."
+        for _ in range(synthetic_articles)
+    ]
+    return texts, "corpus synthétique"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='./items/article_db', help="Base d'articles à utiliser comme corpus")
+    parser.add_argument('--language', choices=LANGUAGES, default='fr', help="Langue des articles")
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help="Processus du mode multiprocessus")
+    parser.add_argument('--synthetic-articles', type=int, default=2000,
+                        help="Taille du corpus synthétique si la base est absente ou vide")
+    args = parser.parse_args()
+
+    texts, source = load_texts(args.db, args.language, args.synthetic_articles)
+    stopwords = get_stop_words(LANGUAGES[args.language])
+    stemmer = snowballstemmer.stemmer(LANGUAGES[args.language])
+
+    start = time.perf_counter()
+    legacy = [legacy_process(text, stopwords, stemmer) for text in texts]
+    legacy_time = time.perf_counter() - start
+    tokens = sum(len(text.split()) for text in texts)
+
+    start = time.perf_counter()
+    single = TextNormalizer(stopwords, stemmer).normalize_many(texts)
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    multi = TextNormalizer(stopwords, stemmer).normalize_many(texts, processes=args.processes)
+    multi_time = time.perf_counter() - start
+
+    if single != legacy or multi != legacy:
+        print("ERREUR : la sortie de TextNormalizer diffère du pipeline historique")
+        sys.exit(1)
+
+    print(f"{len(texts)} textes ({source}), {tokens} tokens, sorties identiques")
+    print(f"Historique            : {tokens / legacy_time:12.0f} tokens/s")
+    print(f"TextNormalizer        : {tokens / single_time:12.0f} tokens/s (x{legacy_time / single_time:.1f})")
+    print(f"TextNormalizer ({args.processes} pr.) : {tokens / multi_time:12.0f} tokens/s (x{legacy_time / multi_time:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import label_binarize
+
+from ArticleStore import open_article_store
+from CategoryClassifier import PIPELINES
+from dictionaryCreator import separate_articles_by_language
+from TokenCache import TokenCache
+from training_pipeline import CLASSIFIERS, build_pipeline, load_dataset
+
+# Banc d'essai des classifieurs des notebooks : chaque tâche (classifieur x pli x langue) est exécutée dans un pool de
+# processus, avec validation croisée stratifiée, mesure du temps d'entraînement, de la latence de prédiction et du pic
+# mémoire, et les métriques des notebooks (accuracy, precision, recall, AUC). Le vectoriseur est ajusté dans chaque pli,
+# sur ses seuls articles d'entraînement, avec le classifieur (training_pipeline.build_pipeline) : ni le vocabulaire ni
+# les poids TF-IDF ne voient les articles de test. Le rapport est écrit en JSON.
+
+METRICS = ['accuracy', 'precision_micro', 'recall_micro', 'auc_micro', 'precision_macro', 'recall_macro', 'auc_macro',
+           'fit_seconds', 'predict_ms_per_article', 'peak_memory_mb']
+
+# Jeux de données de chaque processus, transmis une seule fois à son démarrage
+_datasets = None
+
+
+def _init_worker(datasets):
+    global _datasets
+    _datasets = datasets
+
+
+def run_job(language, classifier_name, mode, fold, train_index, test_index):
+    """
+    Entraîne et évalue un classifieur sur un pli d'une langue. Les durées sont mesurées sans tracemalloc, qui ralentit
+    chaque allocation ; le pic mémoire est mesuré dans une seconde passe identique.
+
+    Args:
+        language (str): La langue du jeu de données ('fr' ou 'en').
+        classifier_name (str): Le nom du classifieur dans training_pipeline.CLASSIFIERS.
+        mode (str): Le mode de caractéristiques ('count', 'tfidf' ou 'hashing').
+        fold (int): Le numéro du pli.
+        train_index (numpy.ndarray): Les lignes d'entraînement.
+        test_index (numpy.ndarray): Les lignes de test.
+
+    Returns:
+        dict: Les métriques de qualité, de temps et de mémoire du pli.
+    """
+    texts, labels = _datasets[language]
+    stopwords = PIPELINES[language][0]
+
+    # Vectoriseur et classifieur ajustés sur les seuls articles d'entraînement du pli
+    classifier = build_pipeline(classifier_name, mode, stopwords)
+    start = time.perf_counter()
+    classifier.fit(texts[train_index], labels[train_index])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predicted = classifier.predict(texts[test_index])
+    predict_seconds = time.perf_counter() - start
+
+    # Seconde passe, sous tracemalloc, pour le pic mémoire seul
+    measured = build_pipeline(classifier_name, mode, stopwords)
+    tracemalloc.start()
+    measured.fit(texts[train_index], labels[train_index])
+    measured.predict(texts[test_index])
+    peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+
+    expected = labels[test_index]
+    result = {
+        'language': language,
+        'classifier': classifier_name,
+        'fold': fold,
+        'accuracy': accuracy_score(expected, predicted),
+        'precision_micro': precision_score(expected, predicted, average='micro', zero_division=0),
+        'recall_micro': recall_score(expected, predicted, average='micro', zero_division=0),
+        'precision_macro': precision_score(expected, predicted, average='macro', zero_division=0),
+        'recall_macro': recall_score(expected, predicted, average='macro', zero_division=0),
+        'fit_seconds': fit_seconds,
+        'predict_ms_per_article': 1000 * predict_seconds / len(test_index),
+        'peak_memory_mb': peak_memory_mb
+    }
+    # AUC calculée comme dans les notebooks, sur les prédictions binarisées
+    for average in ('micro', 'macro'):
+        try:
+            result[f'auc_{average}'] = roc_auc_score(label_binarize(expected, classes=classifier.classes_),
+                                                     label_binarize(predicted, classes=classifier.classes_),
+                                                     average=average)
+        except ValueError:
+            result[f'auc_{average}'] = None
+    return result
+
+
+def load_datasets(db_path, token_cache=None):
+    """
+    Prépare les textes traités et les catégories de chaque langue à partir de la base d'articles. Les textes ne sont
+    pas vectorisés ici : le vectoriseur est ajusté dans chaque pli (voir run_job).
+
+    Args:
+        db_path (str): Chemin vers la base d'articles étiquetés.
+        token_cache (TokenCache): Cache des racines des articles déjà normalisés, ou None.
+
+    Returns:
+        dict: {langue: (tableau des textes traités, tableau des catégories)}.
+    """
+    article_db = open_article_store(db_path, 'r')
+    articles_by_language = dict(zip(('fr', 'en'), separate_articles_by_language(article_db)))
+    article_db.close()
+
+    datasets = {}
+    for language, articles in articles_by_language.items():
+        if not articles:
+            continue
+        stopwords, stemmer = PIPELINES[language]
+        texts, labels = load_dataset(articles, stopwords, stemmer, token_cache)
+        datasets[language] = (np.asarray(texts, dtype=object), np.asarray(labels))
+    return datasets
+
+
+def summarize(results, latency_budget_ms=None):
+    """
+    Agrège les résultats par langue et par classifieur (moyenne et écart-type sur les plis).
+
+    Args:
+        results (list): Les résultats de chaque tâche.
+        latency_budget_ms (float): Latence de prédiction maximale par article, ou None.
+
+    Returns:
+        list: Une entrée par (langue, classifieur), triée par accuracy décroissante dans chaque langue.
+    """
+    groups = {}
+    for result in results:
+        groups.setdefault((result['language'], result['classifier']), []).append(result)
+
+    summary = []
+    for (language, classifier_name), fold_results in groups.items():
+        entry = {'language': language, 'classifier': classifier_name, 'folds': len(fold_results)}
+        for metric in METRICS:
+            values = [result[metric] for result in fold_results if result[metric] is not None]
+            entry[metric] = statistics.mean(values) if values else None
+            entry[f'{metric}_std'] = statistics.pstdev(values) if values else None
+        if latency_budget_ms is not None:
+            entry['within_latency_budget'] = entry['predict_ms_per_article'] <= latency_budget_ms
+        summary.append(entry)
+    summary.sort(key=lambda entry: (entry['language'], -entry['accuracy']))
+    return summary
+
+
+def run_benchmark(datasets, classifier_names, mode='count', folds=5, workers=None, latency_budget_ms=None):
+    """
+    Exécute toutes les tâches (classifieur x pli x langue) dans un pool de processus.
+
+    Args:
+        datasets (dict): {langue: (tableau des textes traités, tableau des catégories)}.
+        classifier_names (list): Les classifieurs à comparer.
+        mode (str): Le mode de caractéristiques ('count', 'tfidf' ou 'hashing').
+        folds (int): Nombre de plis de la validation croisée stratifiée.
+        workers (int): Nombre de processus (par défaut, le nombre de cœurs).
+        latency_budget_ms (float): Latence de prédiction maximale par article, ou None.
+
+    Returns:
+        dict: Le rapport, avec les paramètres, le résultat de chaque tâche et le résumé.
+    """
+    jobs = []
+    for language, (texts, labels) in datasets.items():
+        cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+        for fold, (train_index, test_index) in enumerate(cv.split(texts, labels)):
+            for classifier_name in classifier_names:
+                jobs.append((language, classifier_name, mode, fold, train_index, test_index))
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(datasets,)) as executor:
+        futures = [executor.submit(run_job, *job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"{result['language']} {result['classifier']:<7} pli {result['fold']} : "
+                  f"accuracy {result['accuracy']:.3f}, entraînement {result['fit_seconds']:.2f}s")
+
+    return {
+        'mode': mode,
+        'folds': folds,
+        'jobs': len(jobs),
+        'wall_seconds': time.perf_counter() - start,
+        'latency_budget_ms': latency_budget_ms,
+        'results': sorted(results, key=lambda result: (result['language'], result['classifier'], result['fold'])),
+        'summary': summarize(results, latency_budget_ms)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare les classifieurs par validation croisée en parallèle.")
+    parser.add_argument('--db', default='./items/article_db', help="Base d'articles étiquetés")
+    parser.add_argument('--classifiers', nargs='+', choices=list(CLASSIFIERS), default=list(CLASSIFIERS))
+    parser.add_argument('--mode', choices=['count', 'tfidf', 'hashing'], default='count')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus (par défaut : nombre de cœurs)")
+    parser.add_argument('--latency-budget-ms', type=float, default=None,
+                        help="Latence de prédiction maximale par article, signalée dans le résumé")
+    parser.add_argument('--output', default='classifier_benchmark.json', help="Fichier du rapport JSON")
+    parser.add_argument('--token-cache', default='./items/token_cache',
+                        help="Cache des racines de chaque article (voir TokenCache)")
+    args = parser.parse_args()
+
+    token_cache = TokenCache(args.token_cache)
+    datasets = load_datasets(args.db, token_cache)
+    token_cache.close()
+    report = run_benchmark(datasets, args.classifiers, args.mode, args.folds, args.workers, args.latency_budget_ms)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n{report['jobs']} tâches en {report['wall_seconds']:.1f}s, rapport écrit dans {args.output}")
+    for entry in report['summary']:
+        print(f"{entry['language']} {entry['classifier']:<7} accuracy {entry['accuracy']:.3f} "
+              f"(± {entry['accuracy_std']:.3f}), entraînement {entry['fit_seconds']:.2f}s, "
+              f"prédiction {entry['predict_ms_per_article']:.3f} ms/article, mémoire {entry['peak_memory_mb']:.1f} Mo")
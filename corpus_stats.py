@@ -0,0 +1,85 @@
+import numpy as np
+from collections import Counter
+
+
+# Statistiques de corpus calculées directement sur la matrice creuse (CSR) produite par CountVectorizer, sans jamais
+# la densifier : chaque fonction ne parcourt que les valeurs non nulles de la matrice.
+
+def term_frequencies(sparse_matrix):
+    """
+    Calcule le nombre total d'occurrences de chaque terme dans le corpus (somme de chaque colonne).
+
+    Args:
+        sparse_matrix (scipy.sparse matrix): La matrice documents x termes.
+
+    Returns:
+        numpy.ndarray: Le nombre d'occurrences de chaque terme, dans l'ordre des colonnes.
+    """
+    csr = sparse_matrix.tocsr()
+    frequencies = np.bincount(csr.indices, weights=csr.data, minlength=csr.shape[1])
+    if np.issubdtype(csr.dtype, np.integer):
+        return frequencies.astype(np.int64)
+    return frequencies
+
+
+def document_frequencies(sparse_matrix):
+    """
+    Calcule le nombre de documents contenant chaque terme.
+
+    Args:
+        sparse_matrix (scipy.sparse matrix): La matrice documents x termes.
+
+    Returns:
+        numpy.ndarray: Le nombre de documents contenant chaque terme, dans l'ordre des colonnes.
+    """
+    csr = sparse_matrix.tocsr()
+    return np.bincount(csr.indices[csr.data != 0], minlength=csr.shape[1])
+
+
+def document_lengths(sparse_matrix):
+    """
+    Calcule le nombre de termes distincts de chaque document, à partir de `indptr`.
+
+    Args:
+        sparse_matrix (scipy.sparse matrix): La matrice documents x termes.
+
+    Returns:
+        numpy.ndarray: Le nombre de termes distincts de chaque document.
+    """
+    return np.diff(sparse_matrix.tocsr().indptr)
+
+
+def top_k_terms(feature_names, frequencies, k):
+    """
+    Retourne les k termes les plus fréquents, sans trier tout le vocabulaire.
+
+    Args:
+        feature_names (array-like): Les noms des termes, dans l'ordre des colonnes.
+        frequencies (numpy.ndarray): La valeur associée à chaque terme (occurrences ou nombre de documents).
+        k (int): Le nombre de termes à retourner.
+
+    Returns:
+        list: Les couples (terme, valeur), par valeur décroissante.
+    """
+    k = min(k, len(frequencies))
+    if k <= 0:
+        return []
+    top = np.argpartition(-frequencies, k - 1)[:k]
+    top = top[np.argsort(-frequencies[top], kind='stable')]
+    return [(feature_names[i], frequencies[i]) for i in top]
+
+
+def word_occurrences(feature_names, sparse_matrix):
+    """
+    Calcule le nombre total d'occurrences de chaque mot présent dans le corpus.
+
+    Args:
+        feature_names (array-like): Les noms des termes, dans l'ordre des colonnes.
+        sparse_matrix (scipy.sparse matrix): La matrice documents x termes.
+
+    Returns:
+        collections.Counter: {mot: nombre d'occurrences} pour les mots apparaissant au moins une fois.
+    """
+    frequencies = term_frequencies(sparse_matrix)
+    present = np.flatnonzero(frequencies > 0)
+    return Counter(dict(zip(np.asarray(feature_names)[present].tolist(), frequencies[present].tolist())))
@@ -1,17 +1,31 @@
-import shelve
+import argparse
+import os
+from collections import Counter
 import snowballstemmer
 from stop_words import get_stop_words
-import re
 from sklearn.feature_extraction.text import CountVectorizer
-import joblib
-from collections import Counter
+import scipy.sparse as sp
+from ArticleStore import SQLiteArticleStore, open_article_store
+from DuplicateDetector import is_duplicate
+from TextNormalizer import TextNormalizer
+from TokenCache import TokenCache
+from corpus_stats import word_occurrences
+from FeatureStore import FeatureStore
 
 def separate_articles_by_language(article_db):
+    # Une base SQLite filtre directement par langue avec son index ; les autres bases (shelve, dict) sont parcourues
+    # une seule fois pour remplir les deux langues. Les doublons marqués à l'ingestion sont ignorés
+    if isinstance(article_db, SQLiteArticleStore):
+        return tuple({article_id: article for article_id, article in article_db.items_by_language(language)
+                      if not is_duplicate(article)} for language in ('fr', 'en'))
+
     article_db_french = {}
     article_db_english = {}
 
     # Sépare les articles par langue
     for article_id, article in article_db.items():
+        if is_duplicate(article):
+            continue
         language = article.get('Langue', '').lower()
         if language == 'fr':
             article_db_french[article_id] = article
@@ -20,8 +34,14 @@ def separate_articles_by_language(article_db):
 
     return article_db_french, article_db_english
         
-def process_articles(article_db, stopwords, stemmer):
-    all_processed_texts = []
+def process_articles(article_db, stopwords, stemmer, processes=1, token_cache=None):
+    normalizer = TextNormalizer(stopwords, stemmer)
+
+    # Les articles déjà normalisés par ce pipeline sont lus dans le cache des racines (voir TokenCache)
+    if token_cache is not None:
+        return token_cache.processed_texts(article_db.items(), normalizer, processes)
+
+    combined_texts = []
 
     # Traite les articles
     for article_id, article in article_db.items():
@@ -29,44 +49,74 @@ def process_articles(article_db, stopwords, stemmer):
         description = article.get('Description / Résumé', '')
         content = article.get('Contenu', '')
 
-        # Combine les valeurs et imprime
-        combined_text = f"{title} {description} {content}"
-
-        # Supprime la ponctuation, met en minuscules et supprime les chiffres
-        text_without_punctuation = re.sub(r'[^\w\s]', '', combined_text)
-        text_lower = text_without_punctuation.lower()
-        text_without_numbers = re.sub(r'\d+', '', text_lower)
-
-        # Tokenize le texte et effectue le stemming
-        words = text_without_numbers.split()
-        filtered_words = [word for word in words if word.lower() not in stopwords]
-        stemmed_words = [stemmer.stemWord(word) for word in filtered_words]
-
-        # Combine les mots stemmés en une chaîne pour CountVectorizer
-        processed_text = ' '.join(stemmed_words)
-
-        # Ajoute le texte traité à la liste
-        all_processed_texts.append(processed_text)
-
-    return all_processed_texts
-
-def save_and_load_data(vectorizer, sparse_matrix, filename_feature, filename_matrix):
-    # Sauvegarde les noms de caractéristiques et la matrice creuse dans deux fichiers
-    joblib.dump(vectorizer.get_feature_names_out(), filename_feature)
-    joblib.dump(sparse_matrix, filename_matrix)
-
-    # Charge les noms de caractéristiques et la matrice creuse en mémoire
-    loaded_feature_names = joblib.load(filename_feature)
-    loaded_sparse_matrix = joblib.load(filename_matrix)
-
-    return loaded_feature_names, loaded_sparse_matrix
+        # Combine les valeurs
+        combined_texts.append(f"{title} {description} {content}")
+
+    # Normalise les textes (éventuellement sur plusieurs processus) et combine les mots stemmés en une chaîne pour
+    # CountVectorizer
+    return [' '.join(stemmed_words) for stemmed_words in normalizer.normalize_many(combined_texts, processes)]
+
+def save_and_load_data(vectorizer, sparse_matrix, store_dir, article_ids=None):
+    # Sauvegarde les noms de caractéristiques, la matrice creuse et les identifiants des articles en tableaux plats
+    # (voir FeatureStore), puis les ouvre en mémoire partagée : rien n'est relu ni désérialisé
+    store = FeatureStore.save(store_dir, vectorizer.get_feature_names_out(), sparse_matrix, article_ids)
+    return store.feature_names, store.matrix
+
+def build_dictionary(article_db, stopwords, stemmer, store_dir, token_cache=None):
+    # Traite tous les articles et construit le vocabulaire et la matrice creuse complets
+    all_processed_texts = process_articles(article_db, stopwords, stemmer, token_cache=token_cache)
+    vectorizer = CountVectorizer(stop_words=stopwords)
+    all_sparse_matrix = vectorizer.fit_transform(all_processed_texts)
+
+    # Les identifiants des articles donnent la ligne de chaque article dans la matrice
+    return save_and_load_data(vectorizer, all_sparse_matrix, store_dir, list(article_db))
+
+def update_dictionary(article_db, stopwords, stemmer, store_dir, token_cache=None):
+    # Sans identifiants d'articles, impossible de savoir quels articles sont déjà vectorisés : reconstruction complète
+    store = FeatureStore(store_dir) if os.path.exists(os.path.join(store_dir, 'meta.json')) else None
+    if store is None or store.article_ids is None:
+        print(f"Pas de dictionnaire avec identifiants d'articles dans {store_dir}, reconstruction complète")
+        return build_dictionary(article_db, stopwords, stemmer, store_dir, token_cache)
+
+    feature_names = list(store.feature_names)
+    sparse_matrix = store.matrix
+    article_ids = list(store.article_ids)
+    known_ids = set(article_ids)
+
+    # Ne traite que les articles absents du dictionnaire
+    new_articles = {article_id: article for article_id, article in article_db.items() if article_id not in known_ids}
+    print(f"{len(new_articles)} nouveaux articles à vectoriser")
+    if not new_articles:
+        return store.feature_names, sparse_matrix
+
+    # Découpe les textes comme CountVectorizer, et ajoute les nouveaux termes à la fin du vocabulaire
+    analyzer = CountVectorizer(stop_words=stopwords).build_analyzer()
+    vocabulary = {term: column for column, term in enumerate(feature_names)}
+    indptr, indices, data = [0], [], []
+    for processed_text in process_articles(new_articles, stopwords, stemmer, token_cache=token_cache):
+        term_counts = Counter(analyzer(processed_text))
+        for term in term_counts:
+            if term not in vocabulary:
+                vocabulary[term] = len(feature_names)
+                feature_names.append(term)
+        columns = sorted(vocabulary[term] for term in term_counts)
+        indices.extend(columns)
+        data.extend(term_counts[feature_names[column]] for column in columns)
+        indptr.append(len(indices))
+
+    # Élargit l'ancienne matrice aux nouvelles colonnes et y ajoute les nouvelles lignes
+    new_rows = sp.csr_matrix((data, indices, indptr), shape=(len(new_articles), len(feature_names)),
+                             dtype=sparse_matrix.dtype)
+    old_rows = sp.csr_matrix((sparse_matrix.data, sparse_matrix.indices, sparse_matrix.indptr),
+                             shape=(sparse_matrix.shape[0], len(feature_names)))
+    sparse_matrix = sp.vstack([old_rows, new_rows], format='csr')
+
+    store = FeatureStore.save(store_dir, feature_names, sparse_matrix, article_ids + list(new_articles))
+    return store.feature_names, store.matrix
 
 def calculate_word_occurrences(feature_names, sparse_matrix):
-    total_word_occurrences = Counter()
-    for row in sparse_matrix:
-        total_word_occurrences += Counter({feature: count for feature, count in zip(feature_names, row.toarray()[0])})
-
-    return total_word_occurrences
+    # Somme les colonnes de la matrice creuse sans la densifier
+    return word_occurrences(feature_names, sparse_matrix)
 
 def display_word_occurrences(word_occurrences):
     # Affiche le nombre total d'occurrences de chaque mot avec plus de 100 occurrences, trié par nombre en ordre décroissant
@@ -91,44 +141,54 @@ stopwords_french = get_stop_words(lang_french)
 stemmer_english = snowballstemmer.stemmer(lang_english)
 stopwords_english = get_stop_words(lang_english)
 
-# Ouvre le fichier shelve en lecture
-article_db = shelve.open('./items/defi_db', 'r')
-
-# Sépare les articles par langue
-article_db_french, article_db_english = separate_articles_by_language(article_db)
-
-# Ferme le fichier shelve une fois terminé
-article_db.close()
-
-# Traite les articles français
-all_processed_texts_french = process_articles(article_db_french, stopwords_french, stemmer_french)
-
-# Traite les articles anglais
-all_processed_texts_english = process_articles(article_db_english, stopwords_english, stemmer_english)
+def create_dictionaries(db_path='./items/defi_db', dico_dir='dico', incremental=False,
+                        token_cache_path='./items/token_cache'):
+    # Construit (ou met à jour) le dictionnaire et la matrice creuse du français et de l'anglais dans dico_dir
+    create_dictionary = update_dictionary if incremental else build_dictionary
+    token_cache = TokenCache(token_cache_path)
 
-# Utilise CountVectorizer directement sur les textes traités pour chaque langue
-vectorizer_french = CountVectorizer(stop_words=stopwords_french)
-all_sparse_matrix_french = vectorizer_french.fit_transform(all_processed_texts_french)
+    # Ouvre la base d'articles en lecture
+    article_db = open_article_store(db_path, 'r')
 
-vectorizer_english = CountVectorizer(stop_words=stopwords_english)
-all_sparse_matrix_english = vectorizer_english.fit_transform(all_processed_texts_english)
-
-# Sauvegarde et charge les données pour le français
-loaded_feature_names_french, loaded_sparse_matrix_french = save_and_load_data(
-    vectorizer_french, all_sparse_matrix_french, 'dico/feature_names_french.joblib', 'dico/sparse_matrix_french.joblib'
-)
-
-# Sauvegarde et charge les données pour l'anglais
-loaded_feature_names_english, loaded_sparse_matrix_english = save_and_load_data(
-    vectorizer_english, all_sparse_matrix_english, 'dico/feature_names_english.joblib', 'dico/sparse_matrix_english.joblib'
-)
-
-# Calcule les occurrences de mots pour le français
-total_word_occurrences_french = calculate_word_occurrences(loaded_feature_names_french, loaded_sparse_matrix_french)
-print("\nTotal des occurrences de mots dans tous les articles français:")
-display_word_occurrences(total_word_occurrences_french)
-
-# Calcule les occurrences de mots pour l'anglais
-total_word_occurrences_english = calculate_word_occurrences(loaded_feature_names_english, loaded_sparse_matrix_english)
-print("\nTotal des occurrences de mots dans tous les articles anglais:")
-display_word_occurrences(total_word_occurrences_english)
+    # Sépare les articles par langue
+    article_db_french, article_db_english = separate_articles_by_language(article_db)
+
+    # Ferme la base d'articles une fois terminé
+    article_db.close()
+
+    # Traite, vectorise, sauvegarde et charge les données pour le français
+    dictionary_french = create_dictionary(
+        article_db_french, stopwords_french, stemmer_french,
+        os.path.join(dico_dir, 'french'), token_cache
+    )
+
+    # Traite, vectorise, sauvegarde et charge les données pour l'anglais
+    dictionary_english = create_dictionary(
+        article_db_english, stopwords_english, stemmer_english,
+        os.path.join(dico_dir, 'english'), token_cache
+    )
+    print(f"Racines : {token_cache.hits} articles lus dans le cache, {token_cache.misses} articles normalisés")
+    token_cache.close()
+    return dictionary_french, dictionary_english
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construit le dictionnaire et la matrice creuse de chaque langue.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Ne vectorise que les articles absents du dictionnaire, au lieu de tout reconstruire")
+    parser.add_argument('--token-cache', default='./items/token_cache',
+                        help="Cache des racines de chaque article, partagé avec les autres traitements")
+    args = parser.parse_args()
+
+    (loaded_feature_names_french, loaded_sparse_matrix_french), \
+        (loaded_feature_names_english, loaded_sparse_matrix_english) = create_dictionaries(
+            incremental=args.incremental, token_cache_path=args.token_cache)
+
+    # Calcule les occurrences de mots pour le français
+    total_word_occurrences_french = calculate_word_occurrences(loaded_feature_names_french, loaded_sparse_matrix_french)
+    print("\nTotal des occurrences de mots dans tous les articles français:")
+    display_word_occurrences(total_word_occurrences_french)
+
+    # Calcule les occurrences de mots pour l'anglais
+    total_word_occurrences_english = calculate_word_occurrences(loaded_feature_names_english, loaded_sparse_matrix_english)
+    print("\nTotal des occurrences de mots dans tous les articles anglais:")
+    display_word_occurrences(total_word_occurrences_english)
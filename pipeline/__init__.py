@@ -0,0 +1,3 @@
+from pipeline.config import DEFAULT_CONFIG, DEFI_CONFIG, PipelineConfig
+from pipeline.core import Pipeline
+from pipeline.stages import STAGES, classify, dedupe, detect, extract, fetch, store
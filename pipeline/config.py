@@ -0,0 +1,70 @@
+import copy
+
+
+class PipelineConfig:
+    """
+    Configuration d'une chaîne de collecte. La collecte quotidienne et le défi (benchmark) ne diffèrent que par leur
+    configuration : base de destination, champs supplémentaires des articles et étapes activées.
+    """
+
+    def __init__(self, db_path='./items/article_db', archive_dir='./items/archive', feed_cache_path='./items/feed_cache',
+                 language_state_path='./items/language_state', accepted_languages=('fr', 'en'), extra_fields=None,
+                 detect_near_duplicates=True, classifiers_dir=None, concurrent=True, extract_batch_size=256,
+                 classify_batch_size=256, duplicates_index_path=None, worker_name=None, claim_lease=3600):
+        """
+        Initialise la classe PipelineConfig.
+
+        Args:
+            db_path (str): Chemin vers la base d'articles (shelve, ou SQLite si le chemin se termine par .sqlite).
+            archive_dir (str): Répertoire de l'archive des flux et des pages (voir PageArchive), ou None.
+            feed_cache_path (str): Chemin du cache des validateurs HTTP des flux (voir FeedCache), ou None pour analyser
+                chaque flux à chaque passage.
+            language_state_path (str): Chemin des langues observées pour chaque flux (voir LanguageIdentifier).
+            accepted_languages (tuple): Les langues des articles conservés.
+            extra_fields (dict): Champs ajoutés à chaque nouvel article, avec leur valeur initiale.
+            detect_near_duplicates (bool): Si True, les quasi-doublons sont marqués 'Doublon de' (voir
+                DuplicateDetector).
+            classifiers_dir (str): Répertoire des modèles de CategoryClassifier. Si fourni, les articles sont classés
+                avant d'être stockés.
+            concurrent (bool): Si True, les flux sont téléchargés en parallèle.
+            extract_batch_size (int): Nombre maximal d'articles en attente d'extraction de leur page.
+            classify_batch_size (int): Nombre d'articles classés ensemble.
+            duplicates_index_path (str): Chemin de l'index LSH des quasi-doublons. Par défaut, à côté de la base (voir
+                DuplicateDetector.index_path_for).
+            worker_name (str): Nom du collecteur quand plusieurs collecteurs partagent la base, enregistré avec ses
+                réservations d'articles (voir ArticleStore.claim_many). Sans nom, aucune réservation n'est faite.
+            claim_lease (float): Durée (secondes) après laquelle un article réservé par un collecteur arrêté peut être
+                traité par un autre.
+        """
+        self.db_path = db_path
+        self.archive_dir = archive_dir
+        self.feed_cache_path = feed_cache_path
+        self.language_state_path = language_state_path
+        self.accepted_languages = accepted_languages
+        self.extra_fields = extra_fields or {}
+        self.detect_near_duplicates = detect_near_duplicates
+        self.classifiers_dir = classifiers_dir
+        self.concurrent = concurrent
+        self.extract_batch_size = extract_batch_size
+        self.classify_batch_size = classify_batch_size
+        self.duplicates_index_path = duplicates_index_path
+        self.worker_name = worker_name
+        self.claim_lease = claim_lease
+
+    def new_fields(self):
+        # Copie des champs supplémentaires, dont les valeurs (listes...) ne doivent pas être partagées entre articles
+        return copy.deepcopy(self.extra_fields)
+
+
+# Collecte quotidienne des flux de ArticleScraper
+DEFAULT_CONFIG = PipelineConfig()
+
+# Défi : flux de benchmark locaux, analysés à chaque lancement, articles prêts à recevoir leur catégorie prédite
+DEFI_CONFIG = PipelineConfig(
+    db_path='./items/defi_db',
+    archive_dir=None,
+    feed_cache_path=None,
+    detect_near_duplicates=False,
+    concurrent=False,
+    extra_fields={'Catégorie prédite': '', 'Probabilités': []}
+)
@@ -0,0 +1,277 @@
+import calendar
+import copy
+import hashlib
+import os
+
+from ArticleStore import open_article_store
+from ContentExtractor import ContentExtractor
+from DuplicateDetector import DuplicateDetector, index_path_for
+from FeedCache import FeedCache
+from FeedFetcher import FeedFetcher
+from LanguageIdentifier import LanguageIdentifier
+from Metrics import Metrics
+from PageArchive import PageArchive
+from pipeline.config import DEFAULT_CONFIG
+from pipeline.stages import STAGES
+
+
+class Pipeline:
+    """
+    Chaîne de collecte des articles : fetch → dedupe → detect → extract → classify → store.
+
+    Les étapes sont des générateurs enchaînés (voir pipeline.stages) : les articles circulent un par un, et seuls les
+    identifiants en cours de traitement et les lots d'extraction ou de classement sont gardés en mémoire. Les
+    composants (téléchargement, extraction, langue, doublons, archive) sont créés d'après la configuration.
+    """
+
+    def __init__(self, rss_feeds, config=None, metrics=None, stages=None):
+        """
+        Initialise la classe Pipeline.
+
+        Args:
+            rss_feeds (dict): Un dictionnaire de flux RSS avec leurs URL et catégories.
+            config (PipelineConfig): La configuration de la chaîne (DEFAULT_CONFIG par défaut).
+            metrics (Metrics): Mesures de la collecte. Par défaut, de nouvelles mesures sont créées.
+            stages (dict): Implémentations remplaçant certaines étapes, par nom d'étape (par exemple
+                {'extract': mon_extracteur}). Chaque étape reçoit le flux de l'étape précédente et la chaîne.
+        """
+        self.rss_feeds = rss_feeds
+        self.config = config or DEFAULT_CONFIG
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.article_db = open_article_store(self.config.db_path)
+        self.archive = PageArchive(self.config.archive_dir) if self.config.archive_dir else None
+        self.extractor = ContentExtractor(archive=self.archive, metrics=self.metrics)
+        self.feed_cache = FeedCache(self.config.feed_cache_path) if self.config.feed_cache_path else None
+        self.duplicates = (DuplicateDetector(self.config.duplicates_index_path or index_path_for(self.config.db_path))
+                           if self.config.detect_near_duplicates else None)
+        self.language_identifier = LanguageIdentifier(self.config.language_state_path)
+        self.classifiers = self.load_classifiers(self.config.classifiers_dir) if self.config.classifiers_dir else {}
+        self.stages = dict(STAGES)
+        self.stages.update(stages or {})
+        # Identifiants des articles en cours de traitement, pour ne pas traiter deux fois une entrée présente dans
+        # plusieurs flux
+        self.in_flight = set()
+        # Validateurs HTTP des flux analysés, enregistrés dans le cache une fois leurs articles stockés
+        self.feed_validators = {}
+
+    @staticmethod
+    def load_classifiers(classifiers_dir):
+        # Modèles de CategoryClassifier de chaque langue disponible, chargés seulement quand le classement est activé
+        from CategoryClassifier import PIPELINES, CategoryClassifier
+        classifiers = {}
+        for language in PIPELINES:
+            path = os.path.join(classifiers_dir, f'category_{language}.joblib')
+            if os.path.exists(path):
+                classifiers[language] = CategoryClassifier.load(path)
+        return classifiers
+
+    def generate_unique_id(self, title, url, description):
+        """
+        Génère un identifiant unique pour un article en se basant sur son titre, son URL et sa description.
+
+        Args:
+            title (str): Le titre de l'article.
+            url (str): L'URL de l'article.
+            description (str): La description ou le résumé de l'article.
+
+        Returns:
+            str: Un identifiant unique pour l'article.
+        """
+        data = title + url + description
+        md5_hash = hashlib.md5()
+        md5_hash.update(data.encode('utf-8'))
+        return md5_hash.hexdigest()
+
+    def extract_text_from_url(self, url):
+        """
+        Extrait le contenu textuel à partir d'une URL donnée.
+
+        Args:
+            url (str): L'URL de la page web.
+
+        Returns:
+            str: Le contenu textuel extrait de l'URL.
+        """
+        return self.extractor.extract(url)
+
+    def claim_many(self, article_ids):
+        """
+        Réserve les articles à traiter : ceux qui ne sont ni en base, ni en cours de traitement par cette chaîne ou par
+        un autre collecteur partageant la base.
+
+        Les réservations ne sont enregistrées en base que pour un collecteur nommé (config.worker_name) : une collecte
+        sur un seul processus n'en a pas besoin, et ne laisse donc aucune réservation en cas d'interruption.
+
+        Args:
+            article_ids (iterable): Les identifiants des articles.
+
+        Returns:
+            set: Les identifiants réservés, à traiter par cette chaîne.
+        """
+        candidates = [article_id for article_id in article_ids if article_id not in self.in_flight]
+        if self.config.worker_name is None:
+            claimed = {article_id for article_id in candidates if article_id not in self.article_db}
+        else:
+            claimed = self.article_db.claim_many(candidates, self.config.worker_name, self.config.claim_lease)
+        self.in_flight.update(claimed)
+        return claimed
+
+    def release(self, article_id):
+        """
+        Libère un article réservé qui ne sera pas stocké.
+
+        Args:
+            article_id (str): L'identifiant de l'article.
+
+        Returns:
+            None
+        """
+        self.in_flight.discard(article_id)
+        if self.config.worker_name is not None:
+            self.article_db.release(article_id)
+
+    def make_fetcher(self):
+        """
+        Crée le FeedFetcher de la chaîne, avec son cache, son archive et ses mesures.
+
+        Returns:
+            FeedFetcher: Le FeedFetcher, à fermer après usage.
+        """
+        return FeedFetcher(cache=self.feed_cache, archive=self.archive, metrics=self.metrics)
+
+    def stage_names(self):
+        """
+        Retourne les étapes actives, dans l'ordre de la chaîne.
+
+        Returns:
+            list: Les noms des étapes ('classify' n'est active que si des modèles sont chargés).
+        """
+        return [name for name, stage in STAGES if name != 'classify' or self.classifiers]
+
+    def run(self, items, first_stage='fetch'):
+        """
+        Enchaîne les étapes actives à partir d'une étape donnée.
+
+        Args:
+            items (iterable): Les éléments d'entrée de la première étape (pour 'fetch', les couples (nom du flux,
+                informations du flux)).
+            first_stage (str): Le nom de la première étape à exécuter.
+
+        Returns:
+            generator: Les identifiants des articles stockés, produits au fur et à mesure.
+        """
+        names = self.stage_names()
+        for name in names[names.index(first_stage):]:
+            items = self.stages[name](items, self)
+        return items
+
+    def scrape_articles(self, concurrent=None):
+        """
+        Parcours les flux RSS spécifiés et extrait les articles, les stockant dans la base de données.
+
+        Les flux inchangés depuis le dernier passage ne sont pas analysés, les entrées déjà en base sont écartées avant
+        toute détection de langue, et chaque article est stocké dès que son contenu est extrait.
+
+        Args:
+            concurrent (bool): Si True, les flux sont téléchargés en parallèle, sinon un par un. Par défaut, selon la
+                configuration.
+
+        Returns:
+            int: Le nombre d'articles stockés.
+        """
+        if concurrent is not None and concurrent != self.config.concurrent:
+            # La configuration peut être partagée (DEFAULT_CONFIG) : seule la copie de cette chaîne est modifiée
+            self.config = copy.copy(self.config)
+            self.config.concurrent = concurrent
+        stored = sum(1 for article_id in self.run(self.rss_feeds.items()))
+        self.save_feed_validators()
+        return stored
+
+    def scrape_feed(self, feed_info, fetcher):
+        """
+        Télécharge, traite et stocke les articles d'un seul flux RSS.
+
+        Cette méthode est utilisée par le mode planificateur (FeedScheduler), qui interroge chaque flux à son propre
+        rythme.
+
+        Args:
+            feed_info (dict): Les informations du flux (URL et catégorie).
+            fetcher (FeedFetcher): Le FeedFetcher utilisé pour télécharger le flux.
+
+        Returns:
+            tuple: (état du téléchargement, nombre de nouveaux articles, dates de publication des entrées en secondes
+            depuis l'époque). L'état vaut 'ok', 'unchanged' ou 'error'.
+        """
+        status, d, validators = fetcher.fetch(feed_info['url'])
+        if d is None:
+            return status, 0, []
+        if validators is not None:
+            self.feed_validators[feed_info['url']] = validators
+        stored = sum(1 for article_id in self.run([(feed_info, d)], first_stage='dedupe'))
+        # Les articles du flux sont écrits (et visibles des autres collecteurs) sans attendre que le lot d'écriture soit
+        # plein, puis le flux est marqué inchangé
+        self.save_feed_validators()
+        entry_dates = [calendar.timegm(post.published_parsed) for post in d.entries if post.get('published_parsed')]
+        return status, stored, entry_dates
+
+    def save_feed_validators(self):
+        """
+        Écrit les articles en attente, puis enregistre dans le cache les validateurs des flux traités.
+
+        Un flux n'est marqué inchangé qu'après le stockage de ses articles : si la collecte s'interrompt avant, il est
+        réanalysé au passage suivant et ses articles non stockés sont collectés.
+
+        Returns:
+            None
+        """
+        self.article_db.flush()
+        if self.feed_cache is not None:
+            for feed_url, validators in self.feed_validators.items():
+                self.feed_cache.update(feed_url, validators)
+        self.feed_validators = {}
+
+    def store_article(self, article_id, article):
+        """
+        Stocke un article dans la base de données.
+
+        Un article quasi identique à un article déjà stocké (même dépêche reprise par un autre flux) est stocké avec le
+        champ 'Doublon de', qui donne l'identifiant de l'original, pour être ignoré par les traitements suivants.
+
+        Args:
+            article_id (str): L'identifiant unique de l'article.
+            article (dict): Les champs de l'article.
+
+        Returns:
+            None
+        """
+        with self.metrics.timer('rssi_stage_seconds', stage='store'):
+            if self.duplicates is not None:
+                original_id = self.duplicates.check(article_id, article)
+                if original_id is not None:
+                    article['Doublon de'] = original_id
+                    print(f"L'article est un doublon de {original_id}")
+                    self.metrics.increment('rssi_entries_total', feed=article['URL du flux source'],
+                                           status='near_duplicate')
+            self.article_db[article_id] = article
+        print("Item stocké en base de données")
+
+    def close_database(self):
+        """
+        Ferme la base de données et les composants de la chaîne.
+
+        Assurez-vous d'appeler cette méthode une fois que vous avez terminé d'utiliser la base de données.
+
+        Returns:
+            None
+        """
+        # Les articles réservés mais pas encore stockés (collecte interrompue) redeviennent disponibles sans attendre
+        # l'expiration de leur réservation
+        self.article_db.flush()
+        for article_id in list(self.in_flight):
+            self.release(article_id)
+        self.article_db.close()
+        self.extractor.close()
+        self.language_identifier.close()
+        for component in (self.feed_cache, self.duplicates, self.archive):
+            if component is not None:
+                component.close()
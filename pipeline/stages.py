@@ -0,0 +1,212 @@
+# Étapes de la chaîne de collecte. Chaque étape est un générateur qui reçoit le flux d'éléments de l'étape précédente
+# et la chaîne (composants, configuration, mesures), et produit ses propres éléments au fur et à mesure : un article
+# traverse toute la chaîne sans que la collecte entière soit gardée en mémoire. Chaque étape peut être remplacée par
+# une autre implémentation (Pipeline(stages={...})) et mesurée isolément.
+
+
+def fetch(feeds, pipeline):
+    """
+    Télécharge et analyse les flux (l'analyse feedparser est faite par FeedFetcher et mesurée comme étape 'parse').
+
+    Args:
+        feeds (iterable): Les couples (nom du flux, informations du flux).
+        pipeline (Pipeline): La chaîne de collecte.
+
+    Les validateurs HTTP de chaque flux sont mis de côté (Pipeline.feed_validators) : ils ne sont enregistrés dans le
+    cache qu'une fois les articles stockés (Pipeline.save_feed_validators).
+
+    Yields:
+        tuple: (informations du flux, flux analysé) pour chaque flux téléchargé et modifié depuis le dernier passage.
+    """
+    fetcher = pipeline.make_fetcher()
+    try:
+        if pipeline.config.concurrent:
+            for feed_name, feed_info, d, validators in fetcher.fetch_all(dict(feeds)):
+                yield _fetched(feed_info, d, validators, pipeline)
+        else:
+            for feed_name, feed_info in feeds:
+                status, d, validators = fetcher.fetch(feed_info['url'])
+                if d is not None:
+                    yield _fetched(feed_info, d, validators, pipeline)
+    finally:
+        fetcher.close()
+
+
+def _fetched(feed_info, d, validators, pipeline):
+    # Les validateurs du flux attendent que ses articles soient stockés
+    if validators is not None:
+        pipeline.feed_validators[feed_info['url']] = validators
+    return feed_info, d
+
+
+def dedupe(parsed_feeds, pipeline):
+    """
+    Écarte les entrées déjà présentes en base ou déjà en cours de traitement (par cette chaîne ou par un autre
+    collecteur partageant la base), avant tout autre calcul. Les entrées d'un flux sont réservées en un seul lot.
+
+    Args:
+        parsed_feeds (iterable): Les couples (informations du flux, flux analysé).
+        pipeline (Pipeline): La chaîne de collecte.
+
+    Yields:
+        tuple: (informations du flux, {identifiant: (entrée, description normalisée)}) pour les nouvelles entrées.
+    """
+    metrics = pipeline.metrics
+    for feed_info, d in parsed_feeds:
+        feed_url = feed_info['url']
+        posts = []
+        new_posts = {}
+        with metrics.timer('rssi_stage_seconds', stage='hash'):
+            for post in d.entries:
+                description_normalized = post.summary.lower() if 'summary' in post else ''
+                article_id = pipeline.generate_unique_id(post.title, post.link if 'link' in post else '',
+                                                         description_normalized)
+                posts.append((article_id, post, description_normalized))
+            claimed = pipeline.claim_many(article_id for article_id, post, description_normalized in posts)
+            for article_id, post, description_normalized in posts:
+                if article_id in claimed and article_id not in new_posts:
+                    new_posts[article_id] = (post, description_normalized)
+                else:
+                    print("L'article est déjà présent en base de données, il ne sera pas ajouté.")
+        metrics.increment('rssi_entries_total', len(d.entries), feed=feed_url, status='seen')
+        metrics.increment('rssi_entries_total', len(d.entries) - len(new_posts), feed=feed_url, status='duplicate')
+        if new_posts:
+            yield feed_info, new_posts
+
+
+def detect(new_feed_posts, pipeline):
+    """
+    Identifie la langue des nouvelles entrées, un lot par flux, et construit les articles des langues acceptées.
+
+    Args:
+        new_feed_posts (iterable): Les couples (informations du flux, nouvelles entrées) produits par `dedupe`.
+        pipeline (Pipeline): La chaîne de collecte.
+
+    Yields:
+        tuple: (identifiant, article, URL de la page à extraire ou None).
+    """
+    metrics = pipeline.metrics
+    for feed_info, new_posts in new_feed_posts:
+        feed_url = feed_info['url']
+        titles_normalized = [post.title.lower() for post, description_normalized in new_posts.values()]
+        with metrics.timer('rssi_stage_seconds', stage='detect'):
+            title_languages = pipeline.language_identifier.identify_many(titles_normalized, feed_url, list(new_posts))
+
+        for (article_id, (post, description_normalized)), title_normalized, title_language in zip(
+                new_posts.items(), titles_normalized, title_languages):
+            if title_language not in pipeline.config.accepted_languages:
+                print(f"L'article n'est pas ajouté car la langue n'est pas acceptée. Langue détectée : {title_language}")
+                metrics.increment('rssi_entries_total', feed=feed_url, status='rejected_language')
+                pipeline.release(article_id)
+                continue
+
+            metrics.increment('rssi_entries_total', feed=feed_url, status='new')
+            link_to_extract = post.link if 'link' in post and 'content' not in post else None
+            article = {
+                'URL du flux source': feed_url,
+                'URL de la page source': post.link if 'link' in post else '',
+                'Date': post.published if 'published' in post else '',
+                'Titre': title_normalized,
+                'Description / Résumé': description_normalized,
+                'Langue': title_language,
+                'Contenu': "",
+                'Catégorie': feed_info['categorie']
+            }
+            article.update(pipeline.config.new_fields())
+            yield article_id, article, link_to_extract
+
+
+def extract(articles, pipeline):
+    """
+    Extrait le contenu des pages des articles, par lots d'au plus `extract_batch_size` articles téléchargés en
+    parallèle.
+
+    Args:
+        articles (iterable): Les triplets (identifiant, article, URL à extraire ou None).
+        pipeline (Pipeline): La chaîne de collecte.
+
+    Yields:
+        tuple: (identifiant, article) avec son champ 'Contenu' rempli.
+    """
+    articles_by_url = {}
+    waiting = 0
+    for article_id, article, link_to_extract in articles:
+        if link_to_extract is None:
+            yield article_id, article
+            continue
+        articles_by_url.setdefault(link_to_extract, []).append((article_id, article))
+        waiting += 1
+        if waiting >= pipeline.config.extract_batch_size:
+            yield from _extract_batch(articles_by_url, pipeline)
+            articles_by_url, waiting = {}, 0
+    if articles_by_url:
+        yield from _extract_batch(articles_by_url, pipeline)
+
+
+def _extract_batch(articles_by_url, pipeline):
+    for url, extracted_text in pipeline.extractor.extract_many(articles_by_url):
+        for article_id, article in articles_by_url[url]:
+            article['Contenu'] = extracted_text
+            if pipeline.archive is not None:
+                pipeline.archive.link(article_id, url)
+            yield article_id, article
+
+
+def classify(articles, pipeline):
+    """
+    Prédit la catégorie des articles par lots (vectorisation et classement par les modèles de CategoryClassifier).
+
+    Args:
+        articles (iterable): Les couples (identifiant, article).
+        pipeline (Pipeline): La chaîne de collecte.
+
+    Yields:
+        tuple: (identifiant, article) avec ses champs 'Catégorie prédite' et 'Probabilités'.
+    """
+    batch = {}
+    for article_id, article in articles:
+        batch[article_id] = article
+        if len(batch) >= pipeline.config.classify_batch_size:
+            yield from _classify_batch(batch, pipeline)
+            batch = {}
+    if batch:
+        yield from _classify_batch(batch, pipeline)
+
+
+def _classify_batch(batch, pipeline):
+    with pipeline.metrics.timer('rssi_stage_seconds', stage='classify'):
+        for language, classifier in pipeline.classifiers.items():
+            articles = {article_id: article for article_id, article in batch.items()
+                        if article.get('Langue', '').lower() == language}
+            for article_id, (category, probabilities) in classifier.predict(articles).items():
+                batch[article_id]['Catégorie prédite'] = category
+                batch[article_id]['Probabilités'] = probabilities
+    yield from batch.items()
+
+
+def store(articles, pipeline):
+    """
+    Stocke les articles dans la base.
+
+    Args:
+        articles (iterable): Les couples (identifiant, article).
+        pipeline (Pipeline): La chaîne de collecte.
+
+    Yields:
+        str: L'identifiant de chaque article stocké.
+    """
+    for article_id, article in articles:
+        pipeline.store_article(article_id, article)
+        pipeline.in_flight.discard(article_id)
+        yield article_id
+
+
+# Ordre des étapes de la chaîne
+STAGES = (
+    ('fetch', fetch),
+    ('dedupe', dedupe),
+    ('detect', detect),
+    ('extract', extract),
+    ('classify', classify),
+    ('store', store)
+)
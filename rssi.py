@@ -0,0 +1,209 @@
+"""
+Point d'entrée unique des traitements : collecte, dictionnaires, indexation, recherche, statistiques et classement.
+
+Seuls argparse, importlib, os, sys et time sont importés au démarrage : chaque sous-commande n'importe que les modules
+dont elle a besoin (scikit-learn pour build-dict et classify, elasticsearch pour --engine elastic, langdetect pour
+crawl...), pour que les commandes appelées très souvent (search, stats) démarrent vite.
+
+Usage :
+    python rssi.py crawl [--daemon] [--defi]
+    python rssi.py build-dict [--incremental]
+    python rssi.py index [--engine local|elastic]
+    python rssi.py search "élections européennes" [--size 5]
+    python rssi.py stats
+    python rssi.py classify [--db ./items/defi_db] [--reclassify]
+
+L'option --import-times affiche sur la sortie d'erreur la durée de l'import de chaque module chargé par la sous-commande
+et la durée totale depuis le démarrage. Pour le détail de tous les modules, y compris les dépendances :
+    python -X importtime rssi.py stats
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+START = time.perf_counter()
+
+# Durée de l'import de chaque module chargé à la demande, dans l'ordre des imports
+IMPORT_TIMES = []
+
+
+def lazy_import(module_name):
+    """
+    Importe un module au moment où une sous-commande en a besoin, et note la durée de l'import.
+
+    Args:
+        module_name (str): Le nom du module.
+
+    Returns:
+        module: Le module importé.
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES.append((module_name, time.perf_counter() - start))
+    return module
+
+
+def print_import_times():
+    # Durées écrites sur la sortie d'erreur pour ne pas se mêler aux résultats lus par un autre programme
+    for module_name, duration in IMPORT_TIMES:
+        print(f"import {module_name:<24} {duration * 1000:8.1f} ms", file=sys.stderr)
+    print(f"{'total depuis le démarrage':<31} {(time.perf_counter() - START) * 1000:8.1f} ms", file=sys.stderr)
+
+
+def make_indexer_searcher(args):
+    # Client Elasticsearch construit à partir des options communes à index et search
+    if not args.es_password:
+        sys.exit("Mot de passe Elasticsearch manquant : utilisez --es-password ou la variable ELASTIC_PASSWORD")
+    IndexerSearcher = lazy_import('IndexerSearcher').IndexerSearcher
+    return IndexerSearcher(args.db, args.es_host, args.es_port, args.es_password, args.es_ca_certs)
+
+
+def run_crawl(args):
+    if args.workers:
+        ShardedCrawler = lazy_import('ShardedCrawler')
+        worker_names = [f'worker-{number}' for number in range(args.workers)]
+        try:
+            supervisor = ShardedCrawler.CrawlSupervisor(lazy_import('ArticleScraper').RSS_FEEDS, worker_names, args.db,
+                                                        daemon=args.daemon)
+        except ValueError as error:
+            sys.exit(str(error))
+        supervisor.run()
+    elif args.defi:
+        lazy_import('ArticleScraperDefi').crawl(metrics_path=args.metrics or './items/metrics_defi')
+    else:
+        lazy_import('ArticleScraper').crawl(db_path=args.db, daemon=args.daemon,
+                                            metrics_path=args.metrics or './items/metrics')
+
+
+def run_build_dict(args):
+    dictionaryCreator = lazy_import('dictionaryCreator')
+    dictionaryCreator.create_dictionaries(args.db, args.dico, args.incremental, args.token_cache)
+
+
+def run_index(args):
+    if args.engine == 'elastic':
+        searcher = make_indexer_searcher(args)
+    else:
+        searcher = lazy_import('LocalSearcher').LocalSearcher(args.db, args.index_dir,
+                                                              token_cache_path=args.token_cache)
+    searcher.index_articles(index_name=args.index)
+    searcher.close()
+
+
+def run_search(args):
+    if args.engine == 'elastic':
+        searcher = make_indexer_searcher(args)
+        searcher.print_results(searcher.search(index_name=args.index, query=args.query, size=args.size))
+    else:
+        # Le cache des racines ne sert qu'à l'indexation : la recherche ne l'ouvre pas
+        searcher = lazy_import('LocalSearcher').LocalSearcher(args.db, args.index_dir, token_cache_path=None)
+        searcher.search(index_name=args.index, query=args.query, size=args.size)
+    searcher.close()
+
+
+def run_stats(args):
+    shelve_open = lazy_import('shelve_open')
+    article_db = lazy_import('ArticleStore').open_article_store(args.db, 'r')
+    for categorie, langues in shelve_open.count_articles_by_category(article_db).items():
+        for langue, nombre_articles in langues.items():
+            print(f"{categorie} ({langue}): {nombre_articles} articles")
+    print(f"Nombre total d'articles : {shelve_open.total_article_count(article_db)}")
+    article_db.close()
+
+
+def run_classify(args):
+    CategoryClassifier = lazy_import('CategoryClassifier')
+    classifiers = {}
+    for language in CategoryClassifier.PIPELINES:
+        path = os.path.join(args.models, f'category_{language}.joblib')
+        if os.path.exists(path):
+            classifiers[language] = CategoryClassifier.CategoryClassifier.load(path)
+    if not classifiers:
+        print(f"Aucun modèle dans {args.models} : entraînez-les avec python CategoryClassifier.py train")
+        return
+    token_cache = lazy_import('TokenCache').TokenCache(args.token_cache)
+    start = time.perf_counter()
+    try:
+        count = CategoryClassifier.classify_database(args.db, classifiers, token_cache, args.reclassify)
+    finally:
+        token_cache.close()
+    print(f"{count} articles classés en {time.perf_counter() - start:.3f}s")
+
+
+def add_engine_arguments(parser):
+    parser.add_argument('--engine', choices=['local', 'elastic'], default='local',
+                        help="Moteur de recherche : index local (LocalSearcher) ou Elasticsearch (IndexerSearcher)")
+    parser.add_argument('--db', default='./items/article_db', help="Base d'articles")
+    parser.add_argument('--index', default='rssi', help="Nom de l'index")
+    parser.add_argument('--index-dir', default='./index', help="Répertoire des index locaux")
+    parser.add_argument('--es-host', default='localhost', help="Hôte Elasticsearch")
+    parser.add_argument('--es-port', type=int, default=9200, help="Port Elasticsearch")
+    parser.add_argument('--es-password', default=os.environ.get('ELASTIC_PASSWORD'),
+                        help="Mot de passe Elasticsearch (par défaut, la variable d'environnement ELASTIC_PASSWORD)")
+    parser.add_argument('--es-ca-certs', default='../elasticsearch-8.10.3/config/certs/http_ca.crt',
+                        help="Certificat CA d'Elasticsearch")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--import-times', action='store_true',
+                        help="Affiche la durée de l'import de chaque module et la durée totale sur la sortie d'erreur")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    crawl = subparsers.add_parser('crawl', help="Collecte les articles des flux RSS")
+    crawl.add_argument('--daemon', action='store_true',
+                       help="Tourne en continu et interroge chaque flux à un rythme adapté à son activité")
+    crawl.add_argument('--defi', action='store_true', help="Collecte les flux du défi dans ./items/defi_db")
+    crawl.add_argument('--workers', type=int,
+                       help="Répartit les flux entre plusieurs collecteurs partageant une base SQLite (--db *.sqlite)")
+    crawl.add_argument('--db', default='./items/article_db', help="Base d'articles (hors --defi)")
+    crawl.add_argument('--metrics', help="Préfixe des fichiers de mesures écrits en fin de collecte (.prom et .json)")
+    crawl.set_defaults(function=run_crawl)
+
+    build_dict = subparsers.add_parser('build-dict', help="Construit le dictionnaire et la matrice de chaque langue")
+    build_dict.add_argument('--incremental', action='store_true',
+                            help="Ne vectorise que les articles absents du dictionnaire")
+    build_dict.add_argument('--db', default='./items/defi_db', help="Base d'articles")
+    build_dict.add_argument('--dico', default='dico', help="Répertoire des dictionnaires")
+    build_dict.add_argument('--token-cache', default='./items/token_cache', help="Cache des racines des articles")
+    build_dict.set_defaults(function=run_build_dict)
+
+    index = subparsers.add_parser('index', help="Indexe les articles de la base")
+    add_engine_arguments(index)
+    index.add_argument('--token-cache', default='./items/token_cache',
+                       help="Cache des racines des articles (index local seulement)")
+    index.set_defaults(function=run_index)
+
+    search = subparsers.add_parser('search', help="Recherche des articles")
+    search.add_argument('query', help="Terme de recherche")
+    add_engine_arguments(search)
+    search.add_argument('--size', type=int, default=10, help="Nombre maximal de résultats")
+    search.set_defaults(function=run_search)
+
+    stats = subparsers.add_parser('stats', help="Compte les articles par catégorie et par langue")
+    stats.add_argument('--db', default='./items/article_db', help="Base d'articles")
+    stats.set_defaults(function=run_stats)
+
+    classify = subparsers.add_parser('classify', help="Classe les articles d'une base avec les modèles entraînés")
+    classify.add_argument('--db', default='./items/defi_db', help="Base d'articles")
+    classify.add_argument('--models', default='./models', help="Répertoire des modèles")
+    classify.add_argument('--token-cache', default='./items/token_cache', help="Cache des racines des articles")
+    classify.add_argument('--reclassify', action='store_true',
+                          help="Classe à nouveau les articles qui ont déjà une catégorie prédite")
+    classify.set_defaults(function=run_classify)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.function(args)
+    finally:
+        if args.import_times:
+            print_import_times()
+
+
+if __name__ == "__main__":
+    main()
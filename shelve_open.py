@@ -1,8 +1,8 @@
-import shelve
+from ArticleStore import open_article_store
 
-# Fonction pour ouvrir la base de données shelve en lecture
+# Fonction pour ouvrir la base de données d'articles (shelve, ou SQLite si le chemin se termine par .sqlite)
 def open_article_database(file_path):
-    return shelve.open(file_path, 'c')
+    return open_article_store(file_path, 'c')
 
 
 
@@ -19,6 +19,10 @@ def read_article(article_db, article_id):
 
 # Fonction pour indiquer le nombre d'articles par catégorie
 def count_articles_by_category(article_db):
+    # Les bases indexées (SQLite) comptent directement via leurs index
+    if hasattr(article_db, 'count_by_category_language'):
+        return article_db.count_by_category_language()
+
     articles_par_categorie_langue = {}
 
     for article_id, article_data in article_db.items():
@@ -54,32 +58,32 @@ def delete_articles_by_language(article_db):
 def total_article_count(article_db):
     return len(article_db)
 
-# Fonction pour fermer la base de données shelve
+# Fonction pour fermer la base de données
 def close_article_database(article_db):
     article_db.close()
 
-article_db = open_article_database('./items/article_db')
+if __name__ == "__main__":
+    article_db = open_article_database('./items/article_db')
 
-# Lecture d'un article en particulier
-article_id = 'eaa631984fa0e5b023b5888c21c5c435'
-read_article(article_db, article_id)
+    # Lecture d'un article en particulier
+    article_id = 'eaa631984fa0e5b023b5888c21c5c435'
+    read_article(article_db, article_id)
 
-# Supprimer les articles qui ne sont pas en langue fr ou en
-#delete_articles_by_language(article_db)
+    # Supprimer les articles qui ne sont pas en langue fr ou en
+    #delete_articles_by_language(article_db)
 
-# Indication du nombre d'articles par catégorie
-articles_by_category = count_articles_by_category(article_db)
+    # Indication du nombre d'articles par catégorie
+    articles_by_category = count_articles_by_category(article_db)
 
-# Afficher le nombre d'articles par catégorie et par langue
-for categorie, langues in articles_by_category.items():
-    for langue, nombre_articles in langues.items():
-        print(f"{categorie} ({langue}): {nombre_articles} articles")
+    # Afficher le nombre d'articles par catégorie et par langue
+    for categorie, langues in articles_by_category.items():
+        for langue, nombre_articles in langues.items():
+            print(f"{categorie} ({langue}): {nombre_articles} articles")
 
-# Afficher le nombre total d'articles
-total_count = total_article_count(article_db)
-print(f"Nombre total d'articles : {total_count}")
+    # Afficher le nombre total d'articles
+    total_count = total_article_count(article_db)
+    print(f"Nombre total d'articles : {total_count}")
 
-        
-# Fermeture de la base de données shelve
-close_article_database(article_db)
 
+    # Fermeture de la base de données shelve
+    close_article_database(article_db)
@@ -0,0 +1,111 @@
+import pytest
+
+from ArticleStore import ArticleStore, ShelveArticleStore, SQLiteArticleStore, open_article_store
+
+
+def article(title, langue='fr', categorie='SPORT'):
+    return {'Titre': title, 'Langue': langue, 'Catégorie': categorie, 'URL du flux source': 'http://example.com/feed',
+            'Date': 'Mon, 02 Oct 2023 10:00:00 GMT'}
+
+
+@pytest.fixture(params=['shelve', 'sqlite'])
+def article_db(request, tmp_path):
+    path = str(tmp_path / ('articles.sqlite' if request.param == 'sqlite' else 'articles'))
+    db = open_article_store(path)
+    yield db
+    db.close()
+
+
+def test_article_store_is_abstract():
+    with pytest.raises(TypeError):
+        ArticleStore()
+
+    class PartialStore(ArticleStore):
+        def __contains__(self, article_id):
+            return False
+
+    with pytest.raises(TypeError):
+        PartialStore()
+
+
+def test_open_article_store_picks_backend(tmp_path):
+    for name, cls in (('a.sqlite', SQLiteArticleStore), ('a', ShelveArticleStore)):
+        db = open_article_store(str(tmp_path / name))
+        assert isinstance(db, cls)
+        db.close()
+
+
+def test_mapping_interface(article_db):
+    article_db['a'] = article('un')
+    article_db.add_many({'b': article('two', 'en'), 'c': article('trois')})
+    assert 'a' in article_db and 'z' not in article_db
+    assert len(article_db) == 3
+    assert article_db['b']['Titre'] == 'two'
+    assert article_db.get('z') is None
+    assert sorted(article_id for article_id, a in article_db.items_by_language('fr')) == ['a', 'c']
+    assert article_db.count_by_category_language() == {'SPORT': {'fr': 2, 'en': 1}}
+    del article_db['a']
+    assert 'a' not in article_db
+    with pytest.raises(KeyError):
+        del article_db['a']
+
+
+def test_new_items_reads_each_article_once(article_db):
+    state = {'seq': 0, 'ids': set()}
+    article_db['a'] = article('un')
+    article_db['b'] = article('deux')
+    assert [article_id for article_id, a in article_db.new_items(state)] == ['a', 'b']
+    assert list(article_db.new_items(state)) == []
+
+    # Une mise à jour (catégorie prédite...) n'est pas un nouvel article
+    updated = dict(article_db['a'], **{'Catégorie prédite': 'SPORT'})
+    article_db['a'] = updated
+    article_db['c'] = article('trois')
+    assert [article_id for article_id, a in article_db.new_items(state)] == ['c']
+    assert article_db['a']['Catégorie prédite'] == 'SPORT'
+
+
+def test_claims_without_shared_store(article_db):
+    article_db['a'] = article('un')
+    assert article_db.claim_many(['a', 'b'], 'worker-0') == {'b'}
+    article_db.release('b')
+
+
+def test_sqlite_flush_batches_and_keeps_seq(tmp_path):
+    path = str(tmp_path / 'articles.sqlite')
+    db = SQLiteArticleStore(path, batch_size=2)
+    db['a'] = article('un')
+    reader = SQLiteArticleStore(path, 'r')
+    assert 'a' not in reader
+    db['b'] = article('deux')
+    assert 'a' in reader and 'b' in reader
+    seqs = dict(reader.connection.execute('SELECT article_id, seq FROM articles'))
+
+    db['a'] = article('un modifié', categorie='CULTURE')
+    db.flush()
+    assert dict(reader.connection.execute('SELECT article_id, seq FROM articles')) == seqs
+    assert reader['a']['Titre'] == 'un modifié'
+    assert reader.count_by_category_language() == {'CULTURE': {'fr': 1}, 'SPORT': {'fr': 1}}
+    reader.close()
+    db.close()
+
+
+def test_sqlite_claims(tmp_path):
+    path = str(tmp_path / 'articles.sqlite')
+    first = SQLiteArticleStore(path)
+    second = SQLiteArticleStore(path)
+    assert first.claim_many(['a', 'b', 'c'], 'worker-0') == {'a', 'b', 'c'}
+    assert second.claim_many(['a', 'b', 'c', 'd'], 'worker-1') == {'d'}
+
+    # Un article libéré redevient disponible, un article stocké ne l'est plus et sa réservation disparaît
+    first.release('b')
+    first['a'] = article('un')
+    first.flush()
+    assert second.claim_many(['a', 'b'], 'worker-1') == {'b'}
+    assert first.connection.execute("SELECT COUNT(*) FROM claims WHERE article_id = 'a'").fetchone()[0] == 0
+
+    # Les articles en attente d'écriture ne sont pas réservés une seconde fois
+    first['e'] = article('cinq')
+    assert first.claim_many(['e'], 'worker-0') == set()
+    first.close()
+    second.close()
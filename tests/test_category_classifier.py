@@ -0,0 +1,43 @@
+from ArticleStore import open_article_store
+from CategoryClassifier import CategoryClassifier, classify_database
+from TokenCache import TokenCache
+
+TEXTS = {
+    'SPORT': "Le club de football remporte le match de championnat grâce à un but en fin de rencontre",
+    'ECONOMIE': "La banque centrale relève ses taux pour freiner l'inflation et soutenir la monnaie"
+}
+
+
+def make_article(categorie, **fields):
+    return dict({'Titre': TEXTS[categorie], 'Description / Résumé': '', 'Contenu': TEXTS[categorie], 'Langue': 'fr',
+                 'Catégorie': categorie}, **fields)
+
+
+def test_classify_database_only_predicts_unclassified_articles(tmp_path):
+    training = {f'train{number}': make_article('SPORT' if number % 2 else 'ECONOMIE') for number in range(6)}
+    classifier = CategoryClassifier.train(training, 'fr')
+
+    db_path = str(tmp_path / 'defi_db')
+    article_db = open_article_store(db_path)
+    article_db['sport'] = make_article('SPORT')
+    article_db['eco'] = make_article('ECONOMIE', **{'Catégorie prédite': 'SPORT', 'Probabilités': [['SPORT', 1.0]]})
+    article_db['copie_sport'] = make_article('SPORT', **{'Doublon de': 'sport'})
+    article_db['copie_eco'] = make_article('ECONOMIE', **{'Doublon de': 'eco'})
+    article_db.close()
+    token_cache = TokenCache(str(tmp_path / 'token_cache'))
+
+    # L'article déjà classé garde sa prédiction, sa copie la reprend
+    assert classify_database(db_path, {'fr': classifier}, token_cache) == 3
+    assert token_cache.misses == 1
+    article_db = open_article_store(db_path, 'r')
+    assert {article_id: article['Catégorie prédite'] for article_id, article in article_db.items()} == {
+        'sport': 'SPORT', 'eco': 'SPORT', 'copie_sport': 'SPORT', 'copie_eco': 'SPORT'}
+    article_db.close()
+
+    assert classify_database(db_path, {'fr': classifier}, token_cache) == 0
+    assert classify_database(db_path, {'fr': classifier}, token_cache, reclassify=True) == 4
+    assert token_cache.hits == 1 and token_cache.misses == 2
+    article_db = open_article_store(db_path, 'r')
+    assert article_db['copie_eco']['Catégorie prédite'] == 'ECONOMIE'
+    article_db.close()
+    token_cache.close()
@@ -0,0 +1,47 @@
+import numpy as np
+
+import classifier_benchmark
+from ArticleStore import open_article_store
+
+
+def make_datasets():
+    texts = [f"football match championnat but{number}" if number % 2 else f"banque taux inflation monnaie{number}"
+             for number in range(8)]
+    labels = ['SPORT' if number % 2 else 'ECONOMIE' for number in range(8)]
+    return {'fr': (np.asarray(texts, dtype=object), np.asarray(labels))}
+
+
+def test_run_job_fits_the_vectorizer_on_the_training_fold_only(monkeypatch):
+    pipelines = []
+    original = classifier_benchmark.build_pipeline
+
+    def build_pipeline(*args):
+        pipelines.append(original(*args))
+        return pipelines[-1]
+
+    monkeypatch.setattr(classifier_benchmark, '_datasets', make_datasets())
+    monkeypatch.setattr(classifier_benchmark, 'build_pipeline', build_pipeline)
+    train_index, test_index = np.array([0, 1, 2, 3, 4, 5]), np.array([6, 7])
+    result = classifier_benchmark.run_job('fr', 'LogReg', 'tfidf', 0, train_index, test_index)
+
+    assert result['accuracy'] == 1.0
+    assert result['fit_seconds'] > 0 and result['peak_memory_mb'] > 0
+    # Une passe chronométrée et une passe sous tracemalloc, chacune avec son propre vectoriseur
+    assert len(pipelines) == 2
+    vocabulary = pipelines[0].named_steps['features'].vocabulary_
+    assert 'but5' in vocabulary and 'monnaie6' not in vocabulary and 'but7' not in vocabulary
+
+
+def test_load_datasets_keeps_the_processed_texts(tmp_path):
+    db_path = str(tmp_path / 'article_db')
+    article_db = open_article_store(db_path)
+    for number in range(4):
+        article_db[f'article{number}'] = {'Titre': 'Le club remporte le match', 'Description / Résumé': '',
+                                          'Contenu': '', 'Langue': 'fr', 'Catégorie': 'SPORT'}
+    article_db.close()
+
+    datasets = classifier_benchmark.load_datasets(db_path)
+    texts, labels = datasets['fr']
+    assert list(datasets) == ['fr']
+    assert len(texts) == 4 and all(isinstance(text, str) for text in texts)
+    assert list(labels) == ['SPORT'] * 4
@@ -0,0 +1,103 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import ContentExtractor as extractor_module
+from ContentExtractor import ContentExtractor
+from PageArchive import PageArchive, read_record
+
+ARTICLE = "<html><body><article><p>Le cœur de l'article.</p><p>Il coûte 5 €.</p></article>"
+TAIL = '<div>' + 'commentaires ' * 50000 + '</div></body></html>'
+
+
+@pytest.fixture
+def page_url(monkeypatch):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = (ARTICLE + TAIL).encode('iso-8859-15')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=iso-8859-15')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    monkeypatch.setitem(extractor_module.SITE_RULES, '127.0.0.1', ('article', None, None))
+    yield f'http://127.0.0.1:{httpd.server_address[1]}/page'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_archived_page_is_read_whole(page_url, tmp_path):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    extractor = ContentExtractor(archive=archive, chunk_size=1024)
+    assert extractor.extract(page_url) == "Le cœur de l'article. Il coûte 5 €."
+    # L'analyse s'arrête à la fin de l'article, mais la page entière est archivée, avec son type d'origine
+    content_type, content = read_record(archive.archive_dir, archive.location(page_url))
+    assert content_type == 'text/html; charset=iso-8859-15'
+    assert content == (ARTICLE + TAIL).encode('iso-8859-15')
+    extractor.close()
+    archive.close()
+
+
+def test_archived_page_is_capped_at_max_bytes(page_url, tmp_path):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    extractor = ContentExtractor(archive=archive, chunk_size=1024, max_bytes=10000)
+    assert extractor.extract(page_url) == "Le cœur de l'article. Il coûte 5 €."
+    content_type, content = read_record(archive.archive_dir, archive.location(page_url))
+    assert content == (ARTICLE + TAIL).encode('iso-8859-15')[:10000]
+    extractor.close()
+    archive.close()
+
+
+def test_parse_stops_at_max_bytes_inside_a_chunk():
+    extractor = ContentExtractor(max_bytes=len('<p>un</p>'))
+    assert extractor.parse([b'<p>un</p><p>deux</p>'], 'http://example.org/') == 'un'
+    extractor.close()
+
+
+@pytest.fixture
+def slow_site(monkeypatch):
+    # Chaque page répond après 0,2 s ; /absente renvoie une erreur 404
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(0.2)
+            if self.path == '/absente':
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = f"<html><body><article><p>Article {self.path[1:]}</p></article></body></html>".encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    monkeypatch.setitem(extractor_module.SITE_RULES, '127.0.0.1', ('article', None, None))
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_extract_many_downloads_pages_in_parallel(slow_site):
+    urls = [f'{slow_site}/{i}' for i in range(8)] + [slow_site + '/absente']
+    extractor = ContentExtractor(max_workers=9)
+    start = time.perf_counter()
+    results = dict(extractor.extract_many(urls))
+    elapsed = time.perf_counter() - start
+    # Une page en échec donne un texte vide sans interrompre le lot
+    assert results == {**{f'{slow_site}/{i}': f'Article {i}' for i in range(8)}, slow_site + '/absente': ''}
+    # Les neuf pages de 0,2 s sont téléchargées ensemble, pas les unes après les autres
+    assert elapsed < 1.0
+    extractor.close()
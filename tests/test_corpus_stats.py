@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import CountVectorizer
+
+from corpus_stats import document_frequencies, document_lengths, term_frequencies, top_k_terms, word_occurrences
+
+DOCUMENTS = ["match club match finale", "banque taux inflation", "club finale finale finale", "taux banque"]
+
+
+@pytest.fixture
+def corpus():
+    vectorizer = CountVectorizer()
+    matrix = vectorizer.fit_transform(DOCUMENTS)
+    return vectorizer.get_feature_names_out(), matrix
+
+
+def test_statistics_match_the_dense_matrix(corpus):
+    feature_names, matrix = corpus
+    dense = matrix.toarray()
+    assert term_frequencies(matrix).tolist() == dense.sum(axis=0).tolist()
+    assert term_frequencies(matrix).dtype == np.int64
+    assert document_frequencies(matrix).tolist() == (dense > 0).sum(axis=0).tolist()
+    assert document_lengths(matrix).tolist() == (dense > 0).sum(axis=1).tolist()
+    # Les matrices CSC ou non canoniques sont converties en CSR
+    assert term_frequencies(matrix.tocsc()).tolist() == dense.sum(axis=0).tolist()
+
+
+def test_explicit_zeros_are_not_counted():
+    matrix = csr_matrix((np.array([2, 0, 1]), np.array([0, 1, 1]), np.array([0, 2, 3])), shape=(2, 3))
+    assert document_frequencies(matrix).tolist() == [1, 1, 0]
+    assert word_occurrences(['a', 'b', 'c'], matrix) == {'a': 2, 'b': 1}
+
+
+def test_word_occurrences_and_top_k_terms(corpus):
+    feature_names, matrix = corpus
+    occurrences = word_occurrences(feature_names, matrix)
+    assert occurrences == {'match': 2, 'club': 2, 'finale': 4, 'banque': 2, 'taux': 2, 'inflation': 1}
+    assert all(type(word) is str and type(count) is int for word, count in occurrences.items())
+
+    top = top_k_terms(feature_names, term_frequencies(matrix), 2)
+    assert top[0] == ('finale', 4) and top[1][1] == 2
+    assert len(top_k_terms(feature_names, term_frequencies(matrix), 100)) == len(feature_names)
+    assert top_k_terms(feature_names, term_frequencies(matrix), 0) == []
+
+
+def test_float_weights_are_kept():
+    matrix = csr_matrix(np.array([[0.5, 0.0], [0.25, 1.0]]))
+    assert term_frequencies(matrix).tolist() == [0.75, 1.0]
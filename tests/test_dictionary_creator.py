@@ -0,0 +1,86 @@
+import pytest
+
+from ArticleStore import open_article_store
+from FeatureStore import FeatureStore
+from TokenCache import TokenCache
+from dictionaryCreator import (build_dictionary, separate_articles_by_language, stemmer_french, stopwords_french,
+                               update_dictionary)
+
+TEXTS = [
+    "Le club de football remporte le match de championnat",
+    "La banque centrale relève ses taux pour freiner l'inflation",
+    "Les joueurs du club préparent la finale du championnat",
+    "L'inflation ralentit, la banque centrale maintient ses taux",
+    "Un nouveau télescope observe l'atmosphère d'une planète lointaine"
+]
+
+
+def articles(numbers):
+    return {f'id{number}': {'Titre': TEXTS[number], 'Description / Résumé': '', 'Contenu': TEXTS[number]}
+            for number in numbers}
+
+
+def term_counts(store_dir):
+    # {identifiant: {terme: nombre}}, indépendamment de l'ordre des colonnes et des lignes
+    store = FeatureStore(store_dir)
+    feature_names = list(store.feature_names)
+    matrix = store.matrix.tocsr()
+    return {article_id: {feature_names[column]: count for column, count in
+                         zip(matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]],
+                             matrix.data[matrix.indptr[row]:matrix.indptr[row + 1]])}
+            for row, article_id in enumerate(store.article_ids)}
+
+
+@pytest.mark.parametrize('use_token_cache', [False, True])
+def test_update_dictionary_matches_build_dictionary(tmp_path, use_token_cache):
+    token_cache = TokenCache(str(tmp_path / 'token_cache')) if use_token_cache else None
+    incremental_dir, full_dir = str(tmp_path / 'incremental'), str(tmp_path / 'full')
+
+    # Sans dictionnaire existant, la mise à jour est une construction complète
+    update_dictionary(articles([0, 1]), stopwords_french, stemmer_french, incremental_dir, token_cache)
+    update_dictionary(articles([0, 1, 2]), stopwords_french, stemmer_french, incremental_dir, token_cache)
+    feature_names, matrix = update_dictionary(articles(range(5)), stopwords_french, stemmer_french, incremental_dir,
+                                              token_cache)
+    full_names, full_matrix = build_dictionary(articles(range(5)), stopwords_french, stemmer_french, full_dir)
+
+    assert sorted(feature_names) == sorted(full_names)
+    assert matrix.shape == full_matrix.shape
+    assert term_counts(incremental_dir) == term_counts(full_dir)
+    assert term_counts(full_dir)['id0']['championnat'] == 2
+    if token_cache is not None:
+        assert token_cache.misses == 5
+        token_cache.close()
+
+
+def test_update_without_new_articles_keeps_the_dictionary(tmp_path):
+    store_dir = str(tmp_path / 'dico')
+    build_dictionary(articles(range(3)), stopwords_french, stemmer_french, store_dir)
+    before = term_counts(store_dir)
+    update_dictionary(articles(range(3)), stopwords_french, stemmer_french, store_dir)
+    assert term_counts(store_dir) == before
+
+
+@pytest.mark.parametrize('db_name', ['article_db', 'articles.sqlite'])
+def test_separate_articles_by_language_reads_the_base_once(tmp_path, monkeypatch, db_name):
+    article_db = open_article_store(str(tmp_path / db_name))
+    article_db['fr1'] = {'Titre': TEXTS[0], 'Langue': 'fr'}
+    article_db['en1'] = {'Titre': 'The club wins the match', 'Langue': 'en'}
+    article_db['fr2'] = {'Titre': TEXTS[0], 'Langue': 'fr', 'Doublon de': 'fr1'}
+    article_db['de1'] = {'Titre': 'Der Verein gewinnt', 'Langue': 'de'}
+    article_db.flush()
+    scans = []
+
+    def counted(method, original):
+        def read(*args):
+            scans.append(method)
+            return original(*args)
+        return read
+
+    for method in ('items', 'items_by_language'):
+        monkeypatch.setattr(article_db, method, counted(method, getattr(article_db, method)))
+
+    french, english = separate_articles_by_language(article_db)
+    assert list(french) == ['fr1'] and list(english) == ['en1']
+    # Un seul parcours d'un shelve ; une requête indexée par langue pour SQLite
+    assert scans == (['items_by_language'] * 2 if db_name.endswith('.sqlite') else ['items'])
+    article_db.close()
@@ -0,0 +1,71 @@
+import pytest
+
+from DuplicateDetector import DuplicateDetector, SQLiteLSHIndex, ShelveLSHIndex, index_path_for, is_duplicate
+
+STORY = ("Le gouvernement a présenté mercredi en conseil des ministres un projet de loi sur la transition "
+         "énergétique qui prévoit de fermer les dernières centrales à charbon d'ici à la fin de la décennie, "
+         "de doubler la production d'électricité solaire et de renforcer les aides à la rénovation des logements")
+
+
+def article(title, content):
+    return {'Titre': title, 'Description / Résumé': '', 'Contenu': content}
+
+
+@pytest.fixture(params=['shelve', 'sqlite'])
+def index_path(request, tmp_path):
+    path = index_path_for(str(tmp_path / 'articles'))
+    return path + '.sqlite' if request.param == 'sqlite' else path
+
+
+@pytest.fixture
+def detector(index_path):
+    duplicate_detector = DuplicateDetector(index_path)
+    yield duplicate_detector
+    duplicate_detector.close()
+
+
+def test_backend_follows_the_extension(detector, index_path):
+    assert isinstance(detector.index, SQLiteLSHIndex if index_path.endswith('.sqlite') else ShelveLSHIndex)
+
+
+def test_near_duplicate_is_linked_to_the_original(detector):
+    assert detector.check('original', article("Transition énergétique", STORY)) is None
+    # Même dépêche reprise par un autre flux, avec une fin retouchée
+    retouched = article("Transition énergétique", STORY + " selon l'AFP")
+    assert detector.check('reprise', retouched) == 'original'
+    unrelated = article("Football", "Le club a remporté la finale du championnat au terme d'un match très serré "
+                                    "devant quarante mille spectateurs réunis au stade")
+    assert detector.check('autre', unrelated) is None
+
+
+def test_duplicate_of_a_duplicate_points_to_the_original(detector):
+    detector.check('original', article("Transition énergétique", STORY))
+    assert detector.check('reprise', article("Transition énergétique", STORY + " selon l'AFP")) == 'original'
+    # La reprise n'est pas indexée : sa propre copie est rattachée à l'article d'origine
+    assert 'reprise' not in detector.index
+    assert detector.check('copie', article("Transition énergétique", STORY + " selon l'AFP")) == 'original'
+
+
+def test_indexed_article_is_not_its_own_duplicate(detector):
+    assert detector.check('original', article("Transition énergétique", STORY)) is None
+    assert detector.check('original', article("Transition énergétique", STORY)) is None
+    assert detector.check('vide', article('', '')) is None
+
+
+def test_index_survives_a_restart(index_path):
+    detector = DuplicateDetector(index_path)
+    detector.check('original', article("Transition énergétique", STORY))
+    detector.close()
+    detector = DuplicateDetector(index_path)
+    assert detector.check('reprise', article("Transition énergétique", STORY)) == 'original'
+    detector.close()
+
+
+def test_bands_must_divide_the_permutations(tmp_path):
+    with pytest.raises(ValueError):
+        DuplicateDetector(str(tmp_path / 'index'), num_perm=100, bands=32)
+
+
+def test_is_duplicate():
+    assert is_duplicate({'Doublon de': 'original'})
+    assert not is_duplicate({'Titre': 'original'})
@@ -0,0 +1,90 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from FeatureStore import FeatureStore, StringTable, convert_joblib, write_strings
+
+FEATURE_NAMES = ['zèbre', 'arbre', 'éléphant', 'maison', 'a']
+ARTICLE_IDS = ['id3', 'id1', 'id2']
+
+
+def backed_by_file(array):
+    # Un tableau ouvert en mémoire partagée est une vue (sans copie) d'un numpy.memmap
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+@pytest.fixture
+def matrix():
+    return sp.csr_matrix(np.array([[1, 0, 2, 0, 0], [0, 3, 0, 0, 1], [0, 0, 0, 4, 5]], dtype=np.int64))
+
+
+def test_save_and_open(tmp_path, matrix):
+    directory = str(tmp_path / 'dico_fr')
+    FeatureStore.save(directory, FEATURE_NAMES, matrix, ARTICLE_IDS)
+    store = FeatureStore(directory)
+    assert store.shape == (3, 5)
+    assert (store.matrix != matrix).nnz == 0
+    # Les tableaux restent adossés aux fichiers
+    assert all(backed_by_file(array) for array in (store.matrix.data, store.matrix.indices, store.matrix.indptr))
+    assert list(store.feature_names) == FEATURE_NAMES
+    assert list(store.article_ids) == ARTICLE_IDS
+    assert store.rows(['id2', 'id3']).toarray().tolist() == [[0, 0, 0, 4, 5], [1, 0, 2, 0, 0]]
+    assert store.row_of('absent') is None
+    with pytest.raises(KeyError):
+        store.rows(['absent'])
+
+
+def test_save_replaces_an_open_store(tmp_path, matrix):
+    directory = str(tmp_path / 'dico_fr')
+    old = FeatureStore.save(directory, FEATURE_NAMES, matrix)
+    assert old.article_ids is None and old.row_of('id1') is None
+    new = FeatureStore.save(directory, FEATURE_NAMES[:2], matrix[:, :2], ARTICLE_IDS)
+    assert new.shape == (3, 2)
+    # L'ancien dictionnaire ouvert reste lisible
+    assert old.matrix.toarray().sum() == matrix.sum()
+    assert sorted(os.listdir(tmp_path)) == ['dico_fr']
+
+
+def test_save_checks_the_article_ids(tmp_path, matrix):
+    with pytest.raises(ValueError):
+        FeatureStore.save(str(tmp_path / 'dico_fr'), FEATURE_NAMES, matrix, ARTICLE_IDS[:2])
+
+
+def test_other_format_version_is_refused(tmp_path, matrix):
+    directory = str(tmp_path / 'dico_fr')
+    FeatureStore.save(directory, FEATURE_NAMES, matrix)
+    with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'format_version': 0, 'shape': [3, 5], 'has_article_ids': False}, f)
+    with pytest.raises(ValueError):
+        FeatureStore(directory)
+
+
+def test_string_table(tmp_path):
+    write_strings(str(tmp_path), 'vocabulary', FEATURE_NAMES)
+    table = StringTable(str(tmp_path), 'vocabulary')
+    assert len(table) == 5
+    assert table[0] == 'zèbre' and table[-1] == 'a'
+    assert table[1:3].tolist() == ['arbre', 'éléphant']
+    assert table[np.array([4, 2])].tolist() == ['a', 'éléphant']
+    assert np.asarray(table).tolist() == FEATURE_NAMES
+    assert [table.index(name) for name in FEATURE_NAMES] == list(range(5))
+    assert table.index('absent') is None and table.index('') is None
+    with pytest.raises(IndexError):
+        table[5]
+
+
+def test_convert_joblib(tmp_path, matrix):
+    joblib.dump(FEATURE_NAMES, tmp_path / 'feature_names_fr.joblib')
+    joblib.dump(matrix, tmp_path / 'sparse_matrix_fr.joblib')
+    joblib.dump({'id1': 1, 'id2': 2, 'id3': 0}, tmp_path / 'manifest_fr.joblib')
+    joblib.dump(FEATURE_NAMES, tmp_path / 'feature_names_en.joblib')
+    assert convert_joblib(str(tmp_path)) == [str(tmp_path / 'fr')]
+    store = FeatureStore(str(tmp_path / 'fr'))
+    assert list(store.article_ids) == ARTICLE_IDS
+    assert (store.matrix != matrix).nnz == 0
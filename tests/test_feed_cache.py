@@ -0,0 +1,104 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from FeedCache import FeedCache
+from FeedFetcher import FeedFetcher
+from pipeline import Pipeline, PipelineConfig
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><title>Flux de test</title>
+<item><title>Scientists report new findings about the climate of distant planets</title>
+<link>http://example.com/page/1</link><description>The research team published the results</description>
+<content:encoded>The research team published the results.</content:encoded></item>
+</channel></rss>"""
+
+
+@pytest.fixture
+def server():
+    # Serveur de flux : /etag répond 304 si l'ETag envoyé correspond, /plain renvoie toujours le même contenu
+    requests_headers = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_headers.append(dict(self.headers))
+            if self.path == '/etag' and self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            if self.path == '/etag':
+                self.send_header('ETag', '"v1"')
+            self.send_header('Content-Length', str(len(FEED)))
+            self.end_headers()
+            self.wfile.write(FEED)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}', requests_headers
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    feed_cache = FeedCache(str(tmp_path / 'feed_cache'))
+    yield feed_cache
+    feed_cache.close()
+
+
+def test_conditional_get_with_etag(server, cache):
+    base_url, requests_headers = server
+    fetcher = FeedFetcher(cache=cache)
+    status, d, validators = fetcher.fetch(base_url + '/etag')
+    assert status == 'ok' and len(d.entries) == 1
+    assert validators['etag'] == '"v1"'
+    # Le cache n'est mis à jour que par l'appelant
+    assert cache.conditional_headers(base_url + '/etag') == {}
+
+    cache.update(base_url + '/etag', validators)
+    assert fetcher.fetch(base_url + '/etag') == ('unchanged', None, None)
+    assert requests_headers[-1]['If-None-Match'] == '"v1"'
+    fetcher.close()
+
+
+def test_identical_content_without_validators(server, cache):
+    base_url, requests_headers = server
+    fetcher = FeedFetcher(cache=cache)
+    status, d, validators = fetcher.fetch(base_url + '/plain')
+    cache.update(base_url + '/plain', validators)
+    assert fetcher.fetch(base_url + '/plain') == ('unchanged', None, None)
+    assert 'If-None-Match' not in requests_headers[-1]
+    fetcher.close()
+
+
+def test_validators_saved_only_after_articles_are_stored(server, tmp_path):
+    base_url, requests_headers = server
+    config = PipelineConfig(db_path=str(tmp_path / 'articles.sqlite'), archive_dir=None,
+                            feed_cache_path=str(tmp_path / 'feed_cache'),
+                            language_state_path=str(tmp_path / 'language_state'), detect_near_duplicates=False,
+                            concurrent=False)
+    rss_feeds = {'test': {'url': base_url + '/etag', 'categorie': 'TEST'}}
+
+    def failing_store(articles, pipeline):
+        for article_id in articles:
+            raise RuntimeError("arrêt avant le stockage")
+        yield from ()
+
+    pipeline = Pipeline(rss_feeds, config, stages={'store': failing_store})
+    with pytest.raises(RuntimeError):
+        pipeline.scrape_articles()
+    assert pipeline.feed_cache.conditional_headers(base_url + '/etag') == {}
+    pipeline.close_database()
+
+    # La collecte suivante réanalyse le flux, stocke l'article, puis marque le flux inchangé
+    pipeline = Pipeline(rss_feeds, config)
+    assert pipeline.scrape_articles() == 1
+    assert pipeline.feed_cache.conditional_headers(base_url + '/etag') == {'If-None-Match': '"v1"'}
+    assert pipeline.scrape_articles() == 0
+    assert requests_headers[-1]['If-None-Match'] == '"v1"'
+    pipeline.close_database()
@@ -0,0 +1,74 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from FeedFetcher import FeedFetcher
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Flux de test</title>
+<item><title>Le climat des planètes lointaines</title><link>http://example.com/page/1</link></item>
+</channel></rss>""".encode('utf-8')
+
+
+@pytest.fixture
+def slow_server():
+    # Chaque requête dure 0,2 s ; /missing répond 404. Le nombre maximal de requêtes simultanées est mesuré
+    active = {'now': 0, 'max': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                active['now'] += 1
+                active['max'] = max(active['max'], active['now'])
+            time.sleep(0.2)
+            with lock:
+                active['now'] -= 1
+            if self.path == '/missing':
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(FEED)))
+            self.end_headers()
+            self.wfile.write(FEED)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}', active
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_all_downloads_in_parallel_within_the_host_limit(slow_server):
+    base_url, active = slow_server
+    rss_feeds = {f'flux{number}': {'url': f'{base_url}/feed{number}', 'categorie': 'TEST'} for number in range(8)}
+    rss_feeds['absent'] = {'url': base_url + '/missing', 'categorie': 'TEST'}
+    fetcher = FeedFetcher(max_workers=8, max_per_host=4)
+
+    start = time.perf_counter()
+    fetched = {feed_name: parsed_feed for feed_name, feed_info, parsed_feed, validators in fetcher.fetch_all(rss_feeds)}
+    elapsed = time.perf_counter() - start
+    fetcher.close()
+
+    # Le flux en erreur est ignoré ; les autres arrivent en 3 vagues de 4 au plus, pas en 9 requêtes successives
+    assert sorted(fetched) == sorted(f'flux{number}' for number in range(8))
+    assert all(len(parsed_feed.entries) == 1 for parsed_feed in fetched.values())
+    assert active['max'] == 4
+    assert elapsed < 9 * 0.2
+
+
+def test_fetch_reads_local_feeds(tmp_path):
+    path = tmp_path / 'feed.xml'
+    path.write_bytes(FEED)
+    fetcher = FeedFetcher()
+    status, parsed_feed, validators = fetcher.fetch(str(path))
+    assert status == 'ok' and parsed_feed.entries[0].title == 'Le climat des planètes lointaines'
+    assert validators is None
+    assert fetcher.fetch(str(tmp_path / 'absent.xml')) == ('error', None, None)
+    fetcher.close()
@@ -0,0 +1,84 @@
+import pytest
+
+from FeedScheduler import FeedScheduler
+
+
+class FakeScraper:
+    # Scraper minimal : chaque passage renvoie le résultat suivant de la liste du flux
+    def __init__(self, results):
+        self.rss_feeds = {name: {'url': name} for name in results}
+        self.results = {name: list(feed_results) for name, feed_results in results.items()}
+
+    def scrape_feed(self, feed_info, fetcher):
+        return self.results[feed_info['url']].pop(0)
+
+    def make_fetcher(self):
+        return FakeFetcher()
+
+
+class FakeFetcher:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / 'feed_schedule')
+
+
+def test_errors_double_the_interval_up_to_max_backoff(state_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr('FeedScheduler.time.time', lambda: clock[0])
+    scraper = FakeScraper({'flux': [('error', 0, [])] * 5 + [('ok', 0, [0, 3600])]})
+    scheduler = FeedScheduler(scraper, state_path=state_path, min_interval=300, default_interval=1800,
+                              max_backoff=10000)
+    intervals = [scheduler.poll('flux', None) - clock[0] for _ in range(6)]
+    assert intervals[:5] == [3600, 7200, 10000, 10000, 10000]
+    # Le premier succès remet le compteur d'erreurs à zéro et estime le rythme à partir des dates des entrées
+    assert scheduler.state_db['flux']['errors'] == 0
+    assert scheduler.state_db['flux']['rate'] == pytest.approx(1 / 3600)
+    assert intervals[5] == pytest.approx(7200)
+    scheduler.close()
+
+
+def test_interval_follows_the_publication_rate(state_path):
+    scheduler = FeedScheduler(FakeScraper({'flux': []}), state_path=state_path, min_interval=300,
+                              max_interval=6 * 3600, default_interval=1800, target_new_articles=2)
+    assert scheduler.next_interval({'rate': None, 'errors': 0}) == 1800
+    assert scheduler.next_interval({'rate': 0, 'errors': 0}) == 6 * 3600
+    assert scheduler.next_interval({'rate': 2 / 1000, 'errors': 0}) == 1000
+    assert scheduler.next_interval({'rate': 1, 'errors': 0}) == 300
+    assert scheduler.next_interval({'rate': 1e-6, 'errors': 0}) == 6 * 3600
+    scheduler.close()
+
+
+def test_rate_is_smoothed_from_new_articles(state_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr('FeedScheduler.time.time', lambda: clock[0])
+    scraper = FakeScraper({'flux': [('ok', 0, [0, 100]), ('ok', 5, []), ('unchanged', 0, [])]})
+    scheduler = FeedScheduler(scraper, state_path=state_path, smoothing=0.5)
+    scheduler.poll('flux', None)
+    assert scheduler.state_db['flux']['rate'] == pytest.approx(1 / 100)
+    clock[0] += 100
+    scheduler.poll('flux', None)
+    # Moyenne entre le rythme précédent et les 5 nouveaux articles en 100 s
+    assert scheduler.state_db['flux']['rate'] == pytest.approx(0.5 * 5 / 100 + 0.5 / 100)
+    clock[0] += 100
+    scheduler.poll('flux', None)
+    assert scheduler.state_db['flux']['rate'] == pytest.approx(0.5 * 0 + 0.5 * 0.03)
+    scheduler.close()
+
+
+def test_state_and_queue_survive_a_restart(state_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr('FeedScheduler.time.time', lambda: clock[0])
+    scraper = FakeScraper({'calme': [('ok', 0, [0, 7200])], 'actif': [('error', 0, [])]})
+    scheduler = FeedScheduler(scraper, state_path=state_path, default_interval=1800)
+    scheduler.run(max_polls=2)
+    next_polls = {name: scheduler.state_db[name]['next_poll'] for name in scraper.rss_feeds}
+    scheduler.close()
+
+    scheduler = FeedScheduler(FakeScraper({'calme': [], 'actif': []}), state_path=state_path)
+    assert scheduler.state_db['actif']['errors'] == 1
+    assert sorted(scheduler.queue) == sorted((next_poll, name) for name, next_poll in next_polls.items())
+    scheduler.close()
@@ -0,0 +1,180 @@
+import shelve
+
+import pytest
+
+import IndexerSearcher as indexer_module
+from ArticleStore import SeenIds, ShelveArticleStore, SQLiteArticleStore
+from IndexerSearcher import IndexerSearcher, QueryCache
+
+
+class FakeIndices:
+    def __init__(self):
+        self.created = {}
+        self.mappings = {}
+
+    def exists(self, index):
+        return index in self.created
+
+    def create(self, index, mappings=None):
+        self.created[index] = mappings
+        self.mappings[index] = mappings
+
+    def get_mapping(self, index):
+        return {index: {'mappings': self.mappings[index]}}
+
+    def put_mapping(self, index, properties, meta=None):
+        mappings = self.mappings.setdefault(index, {})
+        mappings.setdefault('properties', {}).update(properties)
+        if meta is not None:
+            mappings['_meta'] = meta
+
+    def put_settings(self, index, settings):
+        pass
+
+    def refresh(self, index):
+        pass
+
+
+class FakeElasticsearch:
+    """
+    Client simulé : chaque document a un score fixe, les résultats sont triés selon `sort` et paginés par
+    `search_after` comme le ferait Elasticsearch.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.indices = FakeIndices()
+        self.searches = []
+
+    def search(self, index, body):
+        self.searches.append(body)
+        field = next(iter(body['sort'][1]))
+        hits = sorted(({'_id': doc_id, '_score': score, '_source': source, 'sort': [score, source[field]]}
+                       for doc_id, (score, source) in self.documents.items()),
+                      key=lambda hit: (-hit['sort'][0], hit['sort'][1]))
+        if 'search_after' in body:
+            after = body['search_after']
+            hits = [hit for hit in hits if (-hit['sort'][0], hit['sort'][1]) > (-after[0], after[1])]
+        return {'hits': {'total': {'value': len(self.documents)}, 'hits': hits[:body['size']]}}
+
+    def update_by_query(self, index, query, script, conflicts, refresh):
+        # Seule la requête de IndexerSearcher.upgrade_mapping est simulée : recopie de _id dans le champ manquant
+        field = query['bool']['must_not']['exists']['field']
+        missing = [(doc_id, source) for doc_id, (score, source) in self.documents.items() if field not in source]
+        for doc_id, source in missing:
+            source[field] = doc_id
+        return {'updated': len(missing)}
+
+
+@pytest.fixture
+def make_searcher(tmp_path):
+    searchers = []
+
+    def make(es, articles=None):
+        db_path = str(tmp_path / 'articles.sqlite')
+        article_db = SQLiteArticleStore(db_path)
+        article_db.add_many(articles or {})
+        article_db.close()
+        searcher = IndexerSearcher(db_path, 'localhost', 9200, None, None, es=es,
+                                   sync_state_path=str(tmp_path / 'es_sync'), query_cache=QueryCache(ttl=0))
+        searchers.append(searcher)
+        return searcher
+
+    yield make
+    for searcher in searchers:
+        searcher.close()
+
+
+def test_search_after_pages_through_ties(make_searcher):
+    # Scores égaux et URL partagées : seul l'identifiant départage les articles
+    documents = {f'id{i:02d}': (1.0 if i % 3 else 2.0, {'Identifiant': f'id{i:02d}', 'URL de la page source': 'u'})
+                 for i in range(25)}
+    searcher = make_searcher(FakeElasticsearch(documents))
+    seen, search_after = [], None
+    while True:
+        page = searcher.search('rssi', 'climat', size=4, search_after=search_after)
+        seen.extend(hit['_id'] for hit in page['hits'])
+        search_after = page['search_after']
+        if search_after is None:
+            break
+    assert sorted(seen) == sorted(documents)
+    assert len(seen) == len(set(seen))
+    assert page['total'] == 25
+
+
+def test_last_full_page_then_empty_page(make_searcher):
+    documents = {f'id{i}': (1.0, {'Identifiant': f'id{i}'}) for i in range(4)}
+    searcher = make_searcher(FakeElasticsearch(documents))
+    page = searcher.search('rssi', 'climat', size=4)
+    assert len(page['hits']) == 4 and page['search_after'] == [1.0, 'id3']
+    page = searcher.search('rssi', 'climat', size=4, search_after=page['search_after'])
+    assert page['hits'] == [] and page['search_after'] is None
+
+
+def test_index_articles_adds_id_field(make_searcher, monkeypatch):
+    sent = []
+
+    def streaming_bulk(es, actions, chunk_size, raise_on_error):
+        for action in actions:
+            sent.append(action)
+            yield True, {}
+
+    monkeypatch.setattr(indexer_module.helpers, 'streaming_bulk', streaming_bulk)
+    es = FakeElasticsearch({})
+    searcher = make_searcher(es, {'a': {'Titre': 'un'}, 'b': {'Titre': 'deux', 'Doublon de': 'a'}})
+    assert searcher.index_articles('rssi') == 1
+    assert es.indices.created['rssi'] == IndexerSearcher.MAPPINGS
+    assert sent == [{'_index': 'rssi', '_id': 'a', '_source': {'Titre': 'un', 'Identifiant': 'a'}}]
+    assert searcher.index_articles('rssi') == 0
+
+
+def test_query_covers_every_article_field(make_searcher):
+    es = FakeElasticsearch({})
+    searcher = make_searcher(es)
+    searcher.search('rssi', 'https://www.lemonde.fr/rss/une.xml')
+    should = es.searches[-1]['query']['bool']['should']
+    boosts = {field: clause['boost'] for match in should for field, clause in match['match'].items()}
+    assert boosts == {'URL du flux source': 1.0, 'URL de la page source': 1.0, 'Date': 1.0, 'Titre': 3.0,
+                      'Description / Résumé': 2.0, 'Langue': 1.0, 'Contenu': 1.0}
+
+
+def test_sync_state_keeps_ids_out_of_the_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(indexer_module.helpers, 'streaming_bulk',
+                        lambda es, actions, chunk_size, raise_on_error: ((True, {}) for action in actions))
+    db_path = str(tmp_path / 'article_db')
+    article_db = ShelveArticleStore(db_path)
+    article_db['a'] = {'Titre': 'un'}
+    article_db['b'] = {'Titre': 'deux'}
+    article_db.close()
+    sync_state_path = str(tmp_path / 'es_sync')
+    # État enregistré par une version précédente, avec l'ensemble des identifiants
+    with shelve.open(sync_state_path) as sync_state:
+        sync_state['rssi'] = {'seq': 0, 'ids': {'a'}}
+
+    searcher = IndexerSearcher(db_path, 'localhost', 9200, None, None, es=FakeElasticsearch({}),
+                               sync_state_path=sync_state_path, query_cache=QueryCache(ttl=0))
+    assert searcher.index_articles('rssi') == 1
+    assert searcher.index_articles('rssi') == 0
+    assert dict(searcher.sync_state) == {'rssi': {'seq': 0}}
+    searcher.close()
+    seen = SeenIds(searcher.ids_path('rssi'))
+    assert 'a' in seen and 'b' in seen
+    seen.close()
+
+
+def test_index_articles_backfills_the_id_field_of_an_older_index(make_searcher, monkeypatch):
+    monkeypatch.setattr(indexer_module.helpers, 'streaming_bulk',
+                        lambda es, actions, chunk_size, raise_on_error: ((True, {}) for action in actions))
+    # Index créé avant le champ Identifiant : correspondance sans version, documents sans le champ
+    es = FakeElasticsearch({'old1': (1.0, {'Titre': 'un'}), 'old2': (1.0, {'Titre': 'deux'})})
+    es.indices.created['rssi'] = es.indices.mappings['rssi'] = {'properties': {'Titre': {'type': 'text'}}}
+    searcher = make_searcher(es, {'new': {'Titre': 'trois'}})
+
+    assert searcher.index_articles('rssi') == 1
+    assert {doc_id: source['Identifiant'] for doc_id, (score, source) in es.documents.items()} == {
+        'old1': 'old1', 'old2': 'old2'}
+    assert es.indices.mappings['rssi']['_meta'] == {'version': IndexerSearcher.MAPPING_VERSION}
+    assert es.indices.mappings['rssi']['properties']['Identifiant'] == {'type': 'keyword'}
+    # Index à jour : aucune nouvelle requête de mise à niveau
+    monkeypatch.setattr(es, 'update_by_query', None)
+    assert searcher.upgrade_mapping('rssi') == 0
@@ -0,0 +1,59 @@
+import LanguageIdentifier as identifier_module
+from LanguageIdentifier import LanguageIdentifier
+
+FRENCH = "le gouvernement annonce une nouvelle réforme des retraites pour l'année prochaine"
+ENGLISH = "the government announces a new pension reform for next year"
+
+
+def count_detections(monkeypatch):
+    calls = []
+
+    def detect(text):
+        calls.append(text)
+        return 'en' if text.startswith('the ') else 'fr'
+
+    monkeypatch.setattr(identifier_module, 'detect', detect)
+    return calls
+
+
+def test_cache_is_keyed_on_article_id_and_persisted(tmp_path, monkeypatch):
+    calls = count_detections(monkeypatch)
+    state_path = str(tmp_path / 'language_state')
+    identifier = LanguageIdentifier(state_path)
+    assert identifier.identify_many([FRENCH, FRENCH], article_ids=['a', 'b']) == ['fr', 'fr']
+    identifier.close()
+
+    # Même identifiant après redémarrage : la langue est lue dans le cache, même si le titre a été corrigé
+    identifier = LanguageIdentifier(state_path)
+    assert identifier.identify_many([ENGLISH, ENGLISH], article_ids=['a', 'c']) == ['fr', 'en']
+    assert len(calls) == 3
+    identifier.close()
+
+
+def test_trusted_feed_skips_detection_except_for_the_sample(tmp_path, monkeypatch):
+    calls = count_detections(monkeypatch)
+    identifier = LanguageIdentifier(str(tmp_path / 'language_state'), min_observations=10, recheck_rate=0.2)
+    feed_url = 'https://www.lemonde.fr/rss/une.xml'
+    identifier.identify_many([FRENCH] * 10, feed_url, [f'fr{number}' for number in range(10)])
+    assert identifier.feed_prior(feed_url) == 'fr' and len(calls) == 10
+
+    languages = identifier.identify_many([FRENCH] * 100, feed_url, [f'new{number}' for number in range(100)])
+    assert languages == ['fr'] * 100
+    assert 5 <= len(calls) - 10 <= 40
+    identifier.close()
+
+
+def test_sample_contradicting_the_prior_resets_the_feed(tmp_path, monkeypatch):
+    calls = count_detections(monkeypatch)
+    identifier = LanguageIdentifier(str(tmp_path / 'language_state'), min_observations=10, recheck_rate=0.5)
+    feed_url = 'https://example.com/feed'
+    identifier.identify_many([FRENCH] * 10, feed_url, [f'fr{number}' for number in range(10)])
+    assert identifier.feed_prior(feed_url) == 'fr'
+
+    # Le flux est passé à l'anglais : les articles revérifiés le révèlent et le flux n'est plus sûr
+    languages = identifier.identify_many([ENGLISH] * 20, feed_url, [f'en{number}' for number in range(20)])
+    rechecked = len(calls) - 10
+    assert languages.count('en') == rechecked > 0
+    assert identifier.feed_prior(feed_url) is None
+    assert identifier.identify_many([ENGLISH], feed_url, ['en20']) == ['en']
+    identifier.close()
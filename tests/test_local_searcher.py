@@ -0,0 +1,63 @@
+import pytest
+
+from ArticleStore import open_article_store
+from LocalSearcher import LocalSearcher
+
+
+def article(title, description, content, langue):
+    return {'Titre': title, 'Description / Résumé': description, 'Contenu': content, 'Langue': langue,
+            'URL du flux source': 'http://example.com/feed', 'URL de la page source': 'http://example.com/page',
+            'Date': 'Mon, 02 Oct 2023 10:00:00 GMT'}
+
+
+ARTICLES = {
+    'titre': article("Élections municipales à Lyon", "Le scrutin a lieu dimanche", "Les bureaux ouvrent tôt.", 'fr'),
+    'contenu': article("Météo du week-end", "Pluie sur la région",
+                       "Le temps pourrait perturber les élections de dimanche.", 'fr'),
+    'anglais': article("Elections in Canada", "Voters head to the polls", "Turnout was high.", 'en'),
+    'autre': article("Football : victoire de Lyon", "Le club gagne", "Un match serré.", 'fr'),
+}
+
+
+@pytest.fixture(params=[False, True], ids=['sans_cache', 'avec_cache'])
+def searcher(request, tmp_path):
+    db_path = str(tmp_path / 'articles.sqlite')
+    article_db = open_article_store(db_path)
+    article_db.add_many(ARTICLES)
+    article_db['doublon'] = dict(ARTICLES['titre'], **{'Doublon de': 'titre'})
+    article_db.close()
+    local_searcher = LocalSearcher(db_path, index_dir=str(tmp_path / 'index'),
+                                   token_cache_path=str(tmp_path / 'token_cache') if request.param else None)
+    assert local_searcher.index_articles('rssi') == len(ARTICLES)
+    yield local_searcher
+    local_searcher.close()
+
+
+def test_title_matches_rank_first(searcher):
+    hits = searcher.search('rssi', 'élections')
+    # Les doublons ne sont pas indexés, et le titre pèse plus lourd que le contenu
+    assert [hit['_id'] for hit in hits] == ['titre', 'contenu']
+    assert hits[0]['_source']['Titre'] == ARTICLES['titre']['Titre']
+    assert all(a['_score'] >= b['_score'] > 0 for a, b in zip(hits, hits[1:]))
+
+
+def test_search_size_and_missing_terms(searcher):
+    assert [hit['_id'] for hit in searcher.search('rssi', 'élections', size=1)] == ['titre']
+    assert searcher.search('rssi', 'introuvable') == []
+
+
+def test_query_is_analyzed_in_both_languages(searcher):
+    assert [hit['_id'] for hit in searcher.search('rssi', 'voters')] == ['anglais']
+    assert [hit['_id'] for hit in searcher.search('rssi', 'Lyon victoire')] == ['autre', 'titre']
+
+
+def test_index_is_reloaded_after_reindexing(searcher, tmp_path):
+    assert {hit['_id'] for hit in searcher.search('rssi', 'lyon')} == {'titre', 'autre'}
+    # L'index ouvert en mémoire partagée est remplacé par le nouvel index
+    searcher.shelve_db.close()
+    article_db = open_article_store(str(tmp_path / 'articles.sqlite'))
+    del article_db['autre']
+    article_db.close()
+    searcher.shelve_db = open_article_store(str(tmp_path / 'articles.sqlite'), 'r')
+    assert searcher.index_articles('rssi') == len(ARTICLES) - 1
+    assert [hit['_id'] for hit in searcher.search('rssi', 'lyon')] == ['titre']
@@ -0,0 +1,93 @@
+import json
+import math
+import threading
+
+import feedparser
+
+from Metrics import Metrics
+from pipeline import Pipeline, PipelineConfig
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Flux de test</title>
+<item><title>Scientists report new findings about the climate of distant planets</title>
+<link>http://example.com/page/1</link><description>The research team published the results</description></item>
+</channel></rss>"""
+
+
+def test_prometheus_export():
+    metrics = Metrics(buckets=(0.1, 1.0, math.inf))
+    metrics.increment('rssi_entries_total', 3, feed='http://a/"flux"', status='seen')
+    metrics.increment('rssi_entries_total', feed='http://a/"flux"', status='new')
+    for value in (0.05, 0.5, 5.0):
+        metrics.observe('rssi_stage_seconds', value, stage='extract')
+    assert metrics.to_prometheus().splitlines() == [
+        '# TYPE rssi_entries_total counter',
+        'rssi_entries_total{feed="http://a/\\"flux\\"",status="new"} 1',
+        'rssi_entries_total{feed="http://a/\\"flux\\"",status="seen"} 3',
+        '# TYPE rssi_stage_seconds histogram',
+        'rssi_stage_seconds_bucket{stage="extract",le="0.1"} 1',
+        'rssi_stage_seconds_bucket{stage="extract",le="1.0"} 2',
+        'rssi_stage_seconds_bucket{stage="extract",le="+Inf"} 3',
+        'rssi_stage_seconds_sum{stage="extract"} 5.55',
+        'rssi_stage_seconds_count{stage="extract"} 3',
+    ]
+
+
+def test_summary_totals_stages_and_slowest_feeds():
+    metrics = Metrics(buckets=(0.1, 1.0, math.inf))
+    for feed, seconds in (('lent', 2.0), ('rapide', 0.05), ('moyen', 0.5)):
+        metrics.observe('rssi_feed_fetch_seconds', seconds, feed=feed)
+        metrics.increment('rssi_entries_total', 2, feed=feed, status='new')
+    metrics.observe('rssi_stage_seconds', 0.05, stage='store')
+    metrics.observe('rssi_stage_seconds', 20.0, stage='store')
+
+    summary = metrics.summary(slowest=2)
+    assert summary['totals'] == {'rssi_entries_total[new]': 6}
+    assert summary['feeds']['lent']['rssi_entries_total[new]'] == 2
+    assert summary['feeds']['lent']['rssi_feed_fetch_seconds']['count'] == 1
+    assert [feed['feed'] for feed in summary['slowest_feeds']] == ['lent', 'moyen']
+    store = summary['stages']['rssi_stage_seconds[store]']
+    assert store['count'] == 2 and store['mean_seconds'] == 10.025
+    # Le quantile est la borne du seau atteint, inconnu au-delà de la dernière borne finie
+    assert store['p50_seconds'] == 0.1 and store['p95_seconds'] is None
+
+
+def test_concurrent_increments_are_not_lost():
+    metrics = Metrics()
+
+    def work():
+        for _ in range(10000):
+            metrics.increment('rssi_entries_total', status='seen')
+            metrics.observe('rssi_stage_seconds', 0.002, stage='hash')
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    summary = metrics.summary()
+    assert summary['totals']['rssi_entries_total[seen]'] == 40000
+    assert summary['stages']['rssi_stage_seconds[hash]']['count'] == 40000
+
+
+def test_pipeline_run_is_written_to_both_files(tmp_path):
+    config = PipelineConfig(db_path=str(tmp_path / 'articles.sqlite'), archive_dir=None, feed_cache_path=None,
+                            language_state_path=str(tmp_path / 'language_state'), detect_near_duplicates=False,
+                            concurrent=False)
+    pipeline = Pipeline({}, config)
+    feed_info = {'url': 'http://example.com/feed', 'categorie': 'TEST'}
+    for _ in range(2):
+        list(pipeline.run([(feed_info, feedparser.parse(FEED))], first_stage='dedupe'))
+    pipeline.close_database()
+
+    prefix = str(tmp_path / 'metrics')
+    pipeline.metrics.write(prefix)
+    with open(prefix + '.json', encoding='utf-8') as f:
+        summary = json.load(f)
+    feed = summary['feeds']['http://example.com/feed']
+    assert feed['rssi_entries_total[seen]'] == 2
+    assert feed['rssi_entries_total[new]'] == 1
+    assert feed['rssi_entries_total[duplicate]'] == 1
+    assert summary['stages']['rssi_stage_seconds[store]']['count'] == 1
+    with open(prefix + '.prom', encoding='utf-8') as f:
+        assert f.read() == pipeline.metrics.to_prometheus()
@@ -0,0 +1,59 @@
+import joblib
+
+from ArticleStore import open_article_store
+from OnlineClassifier import OnlineClassifier
+from TokenCache import TokenCache
+
+TEXTS = {
+    'SPORT': "Le club de football remporte le match de championnat grâce à un but en fin de rencontre",
+    'ECONOMIE': "La banque centrale relève ses taux pour freiner l'inflation et soutenir la monnaie"
+}
+
+
+def add_articles(article_db, first, count):
+    for number in range(first, first + count):
+        categorie = 'SPORT' if number % 2 else 'ECONOMIE'
+        article_db[f'id{number}'] = {'Titre': f'{TEXTS[categorie]} {number}', 'Description / Résumé': '',
+                                     'Contenu': TEXTS[categorie], 'Langue': 'fr', 'Catégorie': categorie}
+
+
+def test_learns_each_article_once_with_ids_outside_the_checkpoint(tmp_path):
+    db_path = str(tmp_path / 'articles')
+    checkpoint_path = str(tmp_path / 'models' / 'online_fr.joblib')
+    article_db = open_article_store(db_path)
+    add_articles(article_db, 0, 10)
+    token_cache = TokenCache(str(tmp_path / 'token_cache'))
+
+    classifier = OnlineClassifier('fr', checkpoint_path=checkpoint_path, batch_size=4, token_cache=token_cache)
+    assert classifier.learn(article_db) == 10
+    assert token_cache.misses == 10
+    classifier.close()
+    checkpoint = joblib.load(checkpoint_path)
+    assert 'state' not in checkpoint and checkpoint['trained'] == 10
+
+    # Reprise : seuls les nouveaux articles sont appris, une mise à jour n'est pas un nouvel article
+    article_db['id0'] = dict(article_db['id0'], **{'Catégorie prédite': 'ECONOMIE'})
+    add_articles(article_db, 10, 3)
+    classifier = OnlineClassifier('fr', checkpoint_path=checkpoint_path, batch_size=4, token_cache=token_cache)
+    assert classifier.learn(article_db) == 3
+    assert classifier.trained == 13
+    assert classifier.predict({'x': {'Titre': TEXTS['SPORT'], 'Contenu': TEXTS['SPORT']}})['x'][0] == 'SPORT'
+    classifier.close()
+    token_cache.close()
+    article_db.close()
+
+
+def test_incompatible_checkpoint_forgets_learned_ids(tmp_path):
+    db_path = str(tmp_path / 'articles')
+    checkpoint_path = str(tmp_path / 'online_fr.joblib')
+    article_db = open_article_store(db_path)
+    add_articles(article_db, 0, 4)
+    classifier = OnlineClassifier('fr', checkpoint_path=checkpoint_path)
+    assert classifier.learn(article_db) == 4
+    classifier.close()
+
+    joblib.dump({'format_version': 1}, checkpoint_path)
+    classifier = OnlineClassifier('fr', checkpoint_path=checkpoint_path)
+    assert classifier.learn(article_db) == 4
+    classifier.close()
+    article_db.close()
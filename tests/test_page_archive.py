@@ -0,0 +1,44 @@
+from ArticleStore import open_article_store
+from ContentExtractor import content_charset
+from PageArchive import PageArchive, read_record, reextract
+
+PAGE = '<html><body><article><p>Élections : les résultats définitifs sont publiés.</p></article></body></html>'
+
+
+def test_content_charset():
+    assert content_charset('text/html; charset=ISO-8859-1') == 'iso8859-1'
+    assert content_charset('text/html; charset="utf-8"') == 'utf-8'
+    assert content_charset('text/html') == 'utf-8'
+    assert content_charset('text/html; charset=inconnu') == 'utf-8'
+
+
+def test_record_keeps_content_type(tmp_path):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    archive.add('http://example.com/a', b'<p>a</p>', 'text/html; charset=windows-1252')
+    assert read_record(archive.archive_dir, archive.location('http://example.com/a')) == (
+        'text/html; charset=windows-1252', b'<p>a</p>')
+    assert archive.read('http://example.com/a') == b'<p>a</p>'
+    archive.close()
+
+
+def test_reextract_decodes_with_archived_charset(tmp_path):
+    archive_dir = str(tmp_path / 'archive')
+    db_path = str(tmp_path / 'articles.sqlite')
+    archive = PageArchive(archive_dir)
+    pages = {
+        'latin': ('http://example.com/latin', PAGE.encode('iso-8859-1'), 'text/html; charset=ISO-8859-1'),
+        'utf8': ('http://example.com/utf8', PAGE.encode('utf-8'), 'text/html')
+    }
+    article_db = open_article_store(db_path)
+    for article_id, (url, content, content_type) in pages.items():
+        archive.add(url, content, content_type)
+        archive.link(article_id, url)
+        article_db[article_id] = {'Titre': article_id, 'Contenu': ''}
+    archive.close()
+    article_db.close()
+
+    assert reextract(db_path, archive_dir, processes=1) == 2
+    article_db = open_article_store(db_path, 'r')
+    for article_id in pages:
+        assert article_db[article_id]['Contenu'] == 'Élections : les résultats définitifs sont publiés.'
+    article_db.close()
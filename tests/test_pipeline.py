@@ -0,0 +1,102 @@
+import feedparser
+import pytest
+
+from pipeline import Pipeline, PipelineConfig
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Flux de test</title>
+{items}
+</channel></rss>"""
+
+ITEM = """<item><title>Scientists report new findings about the climate of distant planets, study {i}</title>
+<link>http://example.com/page/{i}</link>
+<description>The research team published the results of study {i}</description></item>"""
+
+FEED_INFO = {'url': 'http://example.com/feed', 'categorie': 'TEST'}
+
+
+def parsed_feed(numbers):
+    return feedparser.parse(FEED.format(items="\n".join(ITEM.format(i=i) for i in numbers)))
+
+
+class FakeExtractor:
+    # Extracteur sans réseau qui enregistre la taille de chaque lot
+    def __init__(self):
+        self.batches = []
+
+    def extract_many(self, urls):
+        self.batches.append(len(urls))
+        for url in list(urls):
+            yield url, f"Contenu de {url}"
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def make_pipeline(tmp_path):
+    pipelines = []
+
+    def make(**options):
+        config = PipelineConfig(db_path=str(tmp_path / 'articles.sqlite'), archive_dir=None, feed_cache_path=None,
+                                language_state_path=str(tmp_path / 'language_state'), detect_near_duplicates=False,
+                                concurrent=False, **options)
+        pipeline = Pipeline({}, config)
+        pipeline.extractor.close()
+        pipeline.extractor = FakeExtractor()
+        pipelines.append(pipeline)
+        return pipeline
+
+    yield make
+    for pipeline in pipelines:
+        pipeline.close_database()
+
+
+def test_articles_are_stored_as_they_are_extracted(make_pipeline):
+    pipeline = make_pipeline(extract_batch_size=2)
+    stored = pipeline.run([(FEED_INFO, parsed_feed(range(5)))], first_stage='dedupe')
+    # Le premier article est stocké dès l'extraction du premier lot, avant celle des suivants
+    first = next(stored)
+    assert first in pipeline.article_db and pipeline.extractor.batches == [2]
+    assert len(list(stored)) == 4
+    assert pipeline.extractor.batches == [2, 2, 1]
+    assert pipeline.in_flight == set()
+    assert pipeline.article_db[first]['Contenu'].startswith("Contenu de http://example.com/page/")
+
+
+def test_entries_are_stored_once_across_feeds_and_runs(make_pipeline):
+    pipeline = make_pipeline()
+    other_feed = {'url': 'http://example.org/feed', 'categorie': 'AUTRE'}
+    stored = list(pipeline.run([(FEED_INFO, parsed_feed([0, 1])), (other_feed, parsed_feed([1, 2]))],
+                               first_stage='dedupe'))
+    assert len(stored) == len(set(stored)) == 3
+    assert list(pipeline.run([(FEED_INFO, parsed_feed([0, 1, 2]))], first_stage='dedupe')) == []
+    pipeline.article_db.flush()
+    assert len(pipeline.article_db) == 3
+    assert pipeline.article_db[stored[0]]['Catégorie'] == 'TEST'
+
+
+def test_replaced_stage_and_extra_fields(make_pipeline):
+    seen = []
+
+    def recording_extract(articles, pipeline):
+        for article_id, article, link_to_extract in articles:
+            seen.append(link_to_extract)
+            yield article_id, article
+
+    pipeline = make_pipeline(extra_fields={'Probabilités': []})
+    pipeline.stages['extract'] = recording_extract
+    stored = list(pipeline.run([(FEED_INFO, parsed_feed([0, 1]))], first_stage='dedupe'))
+    assert seen == ['http://example.com/page/0', 'http://example.com/page/1']
+    assert pipeline.extractor.batches == []
+    # Les champs supplémentaires sont copiés pour chaque article
+    pipeline.article_db.flush()
+    articles = [pipeline.article_db[article_id] for article_id in stored]
+    articles[0]['Probabilités'].append(1.0)
+    assert articles[1]['Probabilités'] == []
+    assert pipeline.config.extra_fields == {'Probabilités': []}
+
+
+def test_stage_names_skip_classification_without_models(make_pipeline):
+    assert make_pipeline().stage_names() == ['fetch', 'dedupe', 'detect', 'extract', 'store']
+
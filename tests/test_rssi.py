@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import rssi
+from ArticleStore import open_article_store
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def article(title, langue, categorie):
+    return {'Titre': title, 'Description / Résumé': '', 'Contenu': title, 'Langue': langue, 'Catégorie': categorie,
+            'URL du flux source': 'http://example.com/feed', 'URL de la page source': 'http://example.com/page',
+            'Date': 'Mon, 02 Oct 2023 10:00:00 GMT'}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'articles.sqlite')
+    article_db = open_article_store(path)
+    article_db.add_many({
+        'a': article("Élections municipales à Lyon", 'fr', 'POLITIQUE'),
+        'b': article("Victoire du club en finale", 'fr', 'SPORT'),
+        'c': article("Elections in Canada", 'en', 'POLITIQUE')
+    })
+    article_db.close()
+    return path
+
+
+def run_in_subprocess(code):
+    # Nouvel interpréteur : seuls les modules importés par la sous-commande sont chargés
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+
+def test_stats_does_not_import_heavy_modules(db_path):
+    stdout, stderr = run_in_subprocess(
+        "import json, sys, rssi\n"
+        f"rssi.main(['--import-times', 'stats', '--db', {db_path!r}])\n"
+        "print(json.dumps([name for name in ('sklearn', 'langdetect', 'elasticsearch', 'feedparser', 'requests')\n"
+        "                  if name in sys.modules]))")
+    lines = stdout.splitlines()
+    assert "POLITIQUE (fr): 1 articles" in lines and "POLITIQUE (en): 1 articles" in lines
+    assert "Nombre total d'articles : 3" in lines
+    assert json.loads(lines[-1]) == []
+    # Les durées d'import sont écrites sur la sortie d'erreur
+    assert 'import ArticleStore' in stderr and 'total depuis le démarrage' in stderr
+
+
+def test_help_lists_every_subcommand():
+    stdout, stderr = run_in_subprocess("import rssi\ntry:\n    rssi.main(['--help'])\nexcept SystemExit:\n    pass")
+    for command in ('crawl', 'build-dict', 'index', 'search', 'stats', 'classify'):
+        assert command in stdout
+
+
+def test_local_index_and_search(db_path, tmp_path, capsys):
+    index_dir = str(tmp_path / 'index')
+    rssi.main(['index', '--db', db_path, '--index-dir', index_dir, '--token-cache', str(tmp_path / 'token_cache')])
+    capsys.readouterr()
+    rssi.main(['search', 'Lyon', '--db', db_path, '--index-dir', index_dir, '--size', '1'])
+    assert capsys.readouterr().out.splitlines()[0] == 'ID: a'
+
+
+def test_missing_elasticsearch_password(db_path):
+    with pytest.raises(SystemExit, match="Mot de passe Elasticsearch manquant"):
+        rssi.main(['index', '--engine', 'elastic', '--db', db_path, '--es-password', ''])
+
+
+def test_classify_without_models(tmp_path, capsys):
+    rssi.main(['classify', '--db', str(tmp_path / 'defi_db'), '--models', str(tmp_path / 'models')])
+    assert capsys.readouterr().out.startswith("Aucun modèle dans")
+
+
+def test_subcommand_is_required():
+    with pytest.raises(SystemExit):
+        rssi.main([])
@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+
+import feedparser
+import pytest
+
+from ArticleStore import SQLiteArticleStore
+from DuplicateDetector import index_path_for
+from pipeline import Pipeline, PipelineConfig
+from pipeline.stages import store
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><title>Flux de test</title>
+{items}
+</channel></rss>"""
+
+ITEM = """<item><title>Scientists report new findings about the climate of distant planets, study {i}</title>
+<link>http://example.com/page/{i}</link>
+<description>The research team published the results of study {i}</description>
+<content:encoded>The research team published the results of study {i}.</content:encoded></item>"""
+
+FEED_INFO = {'url': 'http://example.com/feed', 'categorie': 'TEST'}
+
+
+def make_config(directory, worker_name):
+    return PipelineConfig(db_path=os.path.join(directory, 'articles.sqlite'), archive_dir=None, feed_cache_path=None,
+                          language_state_path=os.path.join(directory, 'language_state'),
+                          detect_near_duplicates=False, concurrent=False, worker_name=worker_name)
+
+
+def crawl(directory, worker_name, entries, crash_after=None):
+    # Collecte d'un flux analysé ; avec crash_after, le processus s'arrête brutalement après ce nombre d'articles
+    def crashing_store(articles, pipeline):
+        for count, article_id in enumerate(store(articles, pipeline), 1):
+            if count == crash_after:
+                pipeline.article_db.flush()
+                os._exit(1)
+            yield article_id
+
+    d = feedparser.parse(FEED.format(items="\n".join(ITEM.format(i=i) for i in range(entries))))
+    pipeline = Pipeline({}, make_config(directory, worker_name),
+                        stages={'store': crashing_store} if crash_after else None)
+    try:
+        return sum(1 for article_id in pipeline.run([(FEED_INFO, d)], first_stage='dedupe'))
+    finally:
+        pipeline.close_database()
+
+
+def count_rows(directory, table):
+    store_ = SQLiteArticleStore(os.path.join(directory, 'articles.sqlite'))
+    try:
+        return store_.connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    finally:
+        store_.close()
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="fork indisponible")
+def test_restarted_worker_takes_back_its_claims(tmp_path):
+    directory = str(tmp_path)
+    process = multiprocessing.get_context('fork').Process(target=crawl, args=(directory, 'worker-0', 5, 2))
+    process.start()
+    process.join()
+    assert process.exitcode == 1
+    assert count_rows(directory, 'articles') == 2
+    assert count_rows(directory, 'claims') == 3
+
+    # Relancé sous le même nom, le collecteur reprend aussitôt ses réservations
+    assert crawl(directory, 'worker-0', 5) == 3
+    assert count_rows(directory, 'articles') == 5
+    assert count_rows(directory, 'claims') == 0
+
+
+def test_other_worker_waits_for_the_lease(tmp_path):
+    directory = str(tmp_path)
+    article_db = SQLiteArticleStore(os.path.join(directory, 'articles.sqlite'))
+    assert article_db.claim_many(['a', 'b'], 'worker-0') == {'a', 'b'}
+    assert article_db.claim_many(['a', 'b', 'c'], 'worker-1') == {'c'}
+    assert article_db.claim_many(['a'], 'worker-0') == {'a'}
+    # Une réservation expirée peut être prise par un autre collecteur
+    assert article_db.claim_many(['d'], 'worker-0', lease=-1) == {'d'}
+    assert article_db.claim_many(['d'], 'worker-1') == {'d'}
+    article_db.close()
+
+
+def test_close_releases_unstored_claims(tmp_path):
+    directory = str(tmp_path)
+
+    def failing_store(articles, pipeline):
+        for count, article_id in enumerate(store(articles, pipeline), 1):
+            if count == 2:
+                raise RuntimeError("arrêt pendant le stockage")
+            yield article_id
+
+    d = feedparser.parse(FEED.format(items="\n".join(ITEM.format(i=i) for i in range(5))))
+    pipeline = Pipeline({}, make_config(directory, 'worker-0'), stages={'store': failing_store})
+    with pytest.raises(RuntimeError):
+        try:
+            list(pipeline.run([(FEED_INFO, d)], first_stage='dedupe'))
+        finally:
+            pipeline.close_database()
+    assert count_rows(directory, 'articles') == 2
+    assert count_rows(directory, 'claims') == 0
+    # Un autre collecteur reprend aussitôt les articles non stockés
+    assert crawl(directory, 'worker-1', 5) == 3
+
+
+def test_single_process_crawl_does_not_claim(tmp_path):
+    directory = str(tmp_path)
+
+    def failing_store(articles, pipeline):
+        for article_id in articles:
+            raise RuntimeError("arrêt avant le stockage")
+        yield from ()
+
+    d = feedparser.parse(FEED.format(items="\n".join(ITEM.format(i=i) for i in range(5))))
+    pipeline = Pipeline({}, make_config(directory, None), stages={'store': failing_store})
+    with pytest.raises(RuntimeError):
+        list(pipeline.run([(FEED_INFO, d)], first_stage='dedupe'))
+    # Arrêt sans fermeture : aucune réservation ne retient les entrées pour la collecte suivante
+    pipeline.article_db.connection.close()
+    assert count_rows(directory, 'claims') == 0
+    assert crawl(directory, None, 5) == 5
+
+
+def test_workers_share_the_near_duplicate_index(tmp_path):
+    directory = str(tmp_path)
+    pipelines = []
+    for worker_name in ('worker-0', 'worker-1'):
+        config = make_config(directory, worker_name)
+        config.detect_near_duplicates = True
+        config.duplicates_index_path = index_path_for(config.db_path) + '.sqlite'
+        pipelines.append(Pipeline({}, config))
+
+    # La même dépêche reprise par deux flux attribués à des collecteurs différents
+    for pipeline, host in zip(pipelines, ('example.com', 'example.org')):
+        d = feedparser.parse(FEED.format(items=ITEM.format(i=1).replace('example.com', host)))
+        assert sum(1 for article_id in pipeline.run([({'url': f'http://{host}/feed', 'categorie': 'TEST'}, d)],
+                                                    first_stage='dedupe')) == 1
+    for pipeline in pipelines:
+        pipeline.close_database()
+
+    article_db = SQLiteArticleStore(os.path.join(directory, 'articles.sqlite'), 'r')
+    articles = {article['URL de la page source']: (article_id, article.get('Doublon de'))
+                for article_id, article in article_db.items()}
+    article_db.close()
+    original_id = articles['http://example.com/page/1'][0]
+    assert articles['http://example.com/page/1'][1] is None
+    assert articles['http://example.org/page/1'][1] == original_id
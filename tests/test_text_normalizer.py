@@ -0,0 +1,55 @@
+import re
+
+import pytest
+import snowballstemmer
+from stop_words import get_stop_words
+
+from TextNormalizer import TextNormalizer
+
+TEXTS = {
+    'french': ["Les élections municipales de 2020 ont eu lieu, malgré la pandémie !",
+               "LE Conseil constitutionnel valide les élections ; les électeurs votent à nouveau.",
+               "L'économie française : croissance de 1,5 % au 3e trimestre"],
+    'english': ["The elections were held in 2020, despite the pandemic!",
+                "THE Supreme Court's ruling: voters are voting again and again.",
+                "Running runners ran; the economy grew by 1.5% in Q3"]
+}
+
+
+def legacy_process(text, stopwords, stemmer):
+    # Pipeline d'origine de dictionaryCreator.process_articles, mot par mot
+    text = re.sub(r'\d+', '', re.sub(r'[^\w\s]', '', text).lower())
+    return [stemmer.stemWord(word) for word in text.split() if word.lower() not in stopwords]
+
+
+@pytest.mark.parametrize('language', sorted(TEXTS))
+def test_same_stems_as_the_legacy_pipeline(language):
+    stopwords, stemmer = get_stop_words(language), snowballstemmer.stemmer(language)
+    normalizer = TextNormalizer.for_language(language)
+    for text in TEXTS[language] * 2:
+        assert normalizer.normalize(text) == legacy_process(text, stopwords, stemmer)
+
+
+def test_cache_is_bounded_and_keeps_recent_words():
+    normalizer = TextNormalizer(['le'], snowballstemmer.stemmer('french'), cache_size=3)
+    assert normalizer.normalize("le chat mange la souris") == ['chat', 'mang', 'la', 'sour']
+    assert len(normalizer.cache) == 3
+    # Un mot relu passe en fin de cache et survit aux ajouts suivants ; les stop words n'y entrent jamais
+    recent = next(reversed(normalizer.cache))
+    normalizer.normalize(recent)
+    normalizer.normalize("chien")
+    assert recent in normalizer.cache and 'chien' in normalizer.cache and 'le' not in normalizer.cache
+    assert len(normalizer.cache) == 3
+
+
+def test_normalize_many_with_processes_keeps_the_order():
+    normalizer = TextNormalizer.for_language('french')
+    texts = TEXTS['french'] * 10
+    assert normalizer.normalize_many(texts, processes=2, chunksize=4) == normalizer.normalize_many(texts)
+
+
+def test_pipeline_version_depends_on_stopwords_and_stemmer():
+    french = TextNormalizer.for_language('french')
+    assert french.version == TextNormalizer.for_language('french').version
+    assert french.version != TextNormalizer.for_language('english').version
+    assert french.version != TextNormalizer(list(french.stopwords)[1:], french.stemmer).version
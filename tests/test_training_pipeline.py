@@ -0,0 +1,48 @@
+from sklearn.feature_extraction.text import CountVectorizer
+
+from CategoryClassifier import CategoryClassifier
+from FeatureStore import FeatureStore
+from dictionaryCreator import process_articles, stemmer_french, stopwords_french
+from training_pipeline import build_pipeline, create_dataset
+
+TEXTS = {
+    'SPORT': "Le club de football remporte le match de championnat grâce à un but en fin de rencontre",
+    'ECONOMIE': "La banque centrale relève ses taux pour freiner l'inflation et soutenir la monnaie"
+}
+
+
+def make_articles():
+    return {f'id{number}': {'Titre': TEXTS[categorie], 'Description / Résumé': '', 'Contenu': TEXTS[categorie],
+                            'Langue': 'fr', 'Catégorie': categorie}
+            for number, categorie in enumerate(['SPORT', 'ECONOMIE'] * 3)}
+
+
+def make_dataset(store_dir):
+    articles = make_articles()
+    texts = process_articles(articles, stopwords_french, stemmer_french)
+    vectorizer = CountVectorizer(stop_words=stopwords_french).fit(texts)
+    return articles, texts, vectorizer, create_dataset(articles, stopwords_french, stemmer_french, vectorizer,
+                                                       store_dir, 'fr')
+
+
+def test_create_dataset_keeps_texts_and_saves_the_matrix(tmp_path):
+    store_dir = str(tmp_path / 'features_french')
+    articles, texts, vectorizer, dataset = make_dataset(store_dir)
+    assert list(dataset.columns) == ['document', 'texte', 'catégorie']
+    assert list(dataset['document']) == list(articles) and list(dataset['texte']) == texts
+    assert list(dataset['catégorie']) == ['SPORT', 'ECONOMIE'] * 3
+    store = FeatureStore(store_dir)
+    assert list(store.article_ids) == list(articles)
+    assert (store.matrix != vectorizer.transform(texts)).nnz == 0
+
+
+def test_notebook_pipeline_uses_the_category_classifier_features(tmp_path):
+    articles, texts, vectorizer, dataset = make_dataset(str(tmp_path / 'features_french'))
+    pipeline = build_pipeline('RF', 'count', stopwords_french).fit(dataset['texte'], dataset['catégorie'])
+    classifier = CategoryClassifier.train(articles, 'fr')
+
+    # Même vocabulaire et même matrice CSR que dictionaryCreator et CategoryClassifier
+    features = pipeline.named_steps['features']
+    assert features.vocabulary_ == classifier.vectorizer.vocabulary_ == vectorizer.vocabulary_
+    assert (features.transform(texts) != classifier.vectorizer.transform(texts)).nnz == 0
+    assert list(pipeline.predict(texts)) == list(classifier.estimator.predict(classifier.vectorizer.transform(texts)))
@@ -0,0 +1,168 @@
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer
+from sklearn.svm import SVC
+
+from dictionaryCreator import process_articles, save_and_load_data
+
+
+# Pipeline d'entraînement des classifieurs qui conserve les caractéristiques en matrice creuse (CSR) de bout en bout :
+# des textes traités par dictionaryCreator (ou de la matrice d'un dictionnaire de dico/) jusqu'aux estimateurs. Seuls
+# les estimateurs qui n'acceptent pas de matrice creuse reçoivent une matrice dense, convertie au dernier moment.
+
+FEATURE_MODES = ('count', 'tfidf', 'hashing')
+
+# Classifieurs comparés dans les notebooks
+CLASSIFIERS = {
+    'KNN': lambda: KNeighborsClassifier(n_neighbors=3),
+    'LogReg': lambda: LogisticRegression(random_state=42, max_iter=1000),
+    'Bayes': lambda: GaussianNB(),
+    'SVM': lambda: SVC(probability=True, random_state=42),
+    'Neural': lambda: MLPClassifier(hidden_layer_sizes=(100,), max_iter=500, random_state=42),
+    'RF': lambda: RandomForestClassifier(n_estimators=100, random_state=42)
+}
+
+# Classifieurs qui exigent une matrice dense
+DENSE_ONLY = {'Bayes'}
+
+
+def to_dense(features):
+    # Convertit une matrice creuse en tableau dense
+    return features.toarray() if hasattr(features, 'toarray') else features
+
+
+def dense_only(estimator):
+    """
+    Enveloppe un estimateur qui n'accepte que des matrices denses, pour qu'il puisse recevoir une matrice creuse.
+
+    Args:
+        estimator (sklearn estimator): L'estimateur à envelopper (par exemple GaussianNB).
+
+    Returns:
+        sklearn.pipeline.Pipeline: Un pipeline qui densifie les caractéristiques juste avant l'estimateur.
+    """
+    return Pipeline([('dense', FunctionTransformer(to_dense, accept_sparse=True)), ('classifier', estimator)])
+
+
+def make_classifier(name):
+    """
+    Crée un classifieur, densifié uniquement s'il l'exige.
+
+    Args:
+        name (str): Le nom du classifieur dans CLASSIFIERS.
+
+    Returns:
+        sklearn estimator: Le classifieur prêt à recevoir une matrice creuse.
+    """
+    classifier = CLASSIFIERS[name]()
+    return dense_only(classifier) if name in DENSE_ONLY else classifier
+
+
+def make_vectorizer(mode, stopwords, n_features=2 ** 18):
+    """
+    Crée le vectoriseur des textes traités par dictionaryCreator.
+
+    Args:
+        mode (str): 'count' (occurrences, comme dictionaryCreator), 'tfidf' ou 'hashing' (sans vocabulaire en mémoire).
+        stopwords (list): Les stop words de la langue.
+        n_features (int): Nombre de colonnes en mode 'hashing'.
+
+    Returns:
+        sklearn transformer: Le vectoriseur, qui produit une matrice creuse.
+    """
+    if mode == 'count':
+        return CountVectorizer(stop_words=stopwords)
+    if mode == 'tfidf':
+        return TfidfVectorizer(stop_words=stopwords)
+    if mode == 'hashing':
+        return HashingVectorizer(stop_words=stopwords, n_features=n_features, alternate_sign=False, norm=None)
+    raise ValueError(f"Mode de caractéristiques inconnu : {mode} (attendu : {', '.join(FEATURE_MODES)})")
+
+
+def build_pipeline(classifier_name, mode, stopwords):
+    """
+    Crée le pipeline complet texte traité -> matrice creuse -> classifieur.
+
+    Args:
+        classifier_name (str): Le nom du classifieur dans CLASSIFIERS.
+        mode (str): Le mode de caractéristiques ('count', 'tfidf' ou 'hashing').
+        stopwords (list): Les stop words de la langue.
+
+    Returns:
+        sklearn.pipeline.Pipeline: Le pipeline à entraîner sur les textes traités.
+    """
+    return Pipeline([('features', make_vectorizer(mode, stopwords)), ('classifier', make_classifier(classifier_name))])
+
+
+def weight_matrix(sparse_matrix, mode):
+    """
+    Pondère une matrice d'occurrences existante (par exemple la matrice d'un FeatureStore de dico/) sans la densifier.
+
+    Args:
+        sparse_matrix (scipy.sparse matrix): La matrice documents x termes produite par CountVectorizer.
+        mode (str): 'count' pour la garder telle quelle, 'tfidf' pour appliquer la pondération TF-IDF.
+
+    Returns:
+        scipy.sparse.csr_matrix: La matrice pondérée.
+    """
+    if mode == 'count':
+        return sparse_matrix.tocsr()
+    if mode == 'tfidf':
+        return TfidfTransformer().fit_transform(sparse_matrix)
+    raise ValueError(f"Mode de pondération inconnu pour une matrice existante : {mode}")
+
+
+def load_dataset(article_db, stopwords, stemmer, token_cache=None):
+    """
+    Prépare les textes traités et les catégories des articles étiquetés.
+
+    Args:
+        article_db (dict): Les articles d'une langue, indexés par identifiant.
+        stopwords (list): Les stop words de la langue.
+        stemmer (snowballstemmer.Stemmer): Le stemmer de la langue.
+        token_cache (TokenCache): Cache des racines des articles déjà normalisés, ou None.
+
+    Returns:
+        tuple: (textes traités, catégories), dans l'ordre des articles.
+    """
+    texts = process_articles(article_db, stopwords, stemmer, token_cache=token_cache)
+    labels = [article.get('Catégorie', '') for article in article_db.values()]
+    return texts, labels
+
+
+def create_dataset(article_db, stopwords, stemmer, vectorizer, store_dir, language, processed_texts=None,
+                   token_cache=None):
+    """
+    Construit le jeu de données des notebooks : pour chaque article, son texte traité par dictionaryCreator et sa
+    catégorie. La matrice CSR des occurrences, les noms de caractéristiques et les identifiants des articles sont
+    sauvegardés dans un dictionnaire FeatureStore. Les notebooks entraînent leurs classifieurs sur les textes avec
+    build_pipeline, qui reconstruit cette matrice sur les seuls articles d'entraînement : les caractéristiques sont
+    celles de CategoryClassifier.
+
+    Args:
+        article_db (dict): Les articles d'une langue, indexés par identifiant.
+        stopwords (list): Les stop words de la langue.
+        stemmer (snowballstemmer.Stemmer): Le stemmer de la langue.
+        vectorizer (CountVectorizer): Le vectoriseur déjà ajusté.
+        store_dir (str): Répertoire du dictionnaire (voir FeatureStore).
+        language (str): La langue des articles.
+        processed_texts (list): Les textes déjà traités par process_articles, dans l'ordre des articles, pour ne pas
+            les normaliser une deuxième fois.
+        token_cache (TokenCache): Cache des racines des articles déjà normalisés, utilisé si `processed_texts` n'est
+            pas fourni.
+
+    Returns:
+        pandas.DataFrame: Une ligne par article (document, texte, catégorie).
+    """
+    import pandas as pd
+
+    if processed_texts is None:
+        processed_texts = process_articles(article_db, stopwords, stemmer, token_cache=token_cache)
+    save_and_load_data(vectorizer, vectorizer.transform(processed_texts), store_dir, list(article_db))
+    return pd.DataFrame({'document': list(article_db), 'texte': processed_texts,
+                         'catégorie': [article.get('Catégorie', '') for article in article_db.values()]})